@@ -0,0 +1,27 @@
+"""add_users_created_at_id_index
+
+Revision ID: a3f1c9d27b40
+Revises: 84dd0011bf4f
+Create Date: 2026-10-17 09:12:41.208114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f1c9d27b40'
+down_revision: Union[str, None] = '84dd0011bf4f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination for GET /users orders by (created_at, id)
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_created_at_id', table_name='users')
@@ -0,0 +1,45 @@
+"""add_users_search_index
+
+Revision ID: c7e2b5a91d03
+Revises: a3f1c9d27b40
+Create Date: 2026-10-17 11:03:27.514902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.infrastructure.models.user_search import (
+    POSTGRES_SEARCH_DDL,
+    POSTGRES_SEARCH_DROP_DDL,
+    SQLITE_SEARCH_DDL,
+    SQLITE_SEARCH_DROP_DDL,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2b5a91d03'
+down_revision: Union[str, None] = 'a3f1c9d27b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _statements(postgres, sqlite):
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        return postgres
+    if dialect == 'sqlite':
+        return sqlite
+    return []
+
+
+def upgrade() -> None:
+    # User search: pg_trgm GIN index on PostgreSQL, FTS5 trigram table on SQLite
+    for statement in _statements(POSTGRES_SEARCH_DDL, SQLITE_SEARCH_DDL):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for statement in _statements(POSTGRES_SEARCH_DROP_DDL, SQLITE_SEARCH_DROP_DDL):
+        op.execute(statement)
@@ -0,0 +1,53 @@
+"""add_refresh_token_families
+
+Revision ID: d4b8f2c6a915
+Revises: c7e2b5a91d03
+Create Date: 2026-10-17 15:20:08.337161
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4b8f2c6a915'
+down_revision: Union[str, None] = 'c7e2b5a91d03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Refresh tokens rotated from one login share a family so that reuse of a
+    # rotated token can revoke all of them at once
+    if not sa.inspect(op.get_bind()).has_table('refresh_tokens'):
+        # The table was only ever created by create_all; create it here
+        op.create_table('refresh_tokens',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('token', sa.String(length=128), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('family_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('device_info', sa.String(length=512), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_refresh_tokens_token'), 'refresh_tokens', ['token'], unique=True)
+    else:
+        op.add_column('refresh_tokens', sa.Column('family_id', postgresql.UUID(as_uuid=True), nullable=True))
+        # Existing tokens each start their own family
+        op.execute('UPDATE refresh_tokens SET family_id = id')
+        with op.batch_alter_table('refresh_tokens') as batch_op:
+            batch_op.alter_column('family_id', nullable=False)
+    op.create_index(op.f('ix_refresh_tokens_family_id'), 'refresh_tokens', ['family_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_refresh_tokens_family_id'), table_name='refresh_tokens')
+    with op.batch_alter_table('refresh_tokens') as batch_op:
+        batch_op.drop_column('family_id')
@@ -0,0 +1,28 @@
+"""add_users_token_version
+
+Revision ID: e6f3a8d2b417
+Revises: d4b8f2c6a915
+Create Date: 2026-10-17 17:41:26.904315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6f3a8d2b417'
+down_revision: Union[str, None] = 'd4b8f2c6a915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Claims-only authorization rejects access tokens whose token_version
+    # claim is older than this watermark
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,48 @@
+"""add_bulk_upload_jobs
+
+Revision ID: f2c8d1e7a394
+Revises: e6f3a8d2b417
+Create Date: 2026-10-17 21:05:43.118520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c8d1e7a394'
+down_revision: Union[str, None] = 'e6f3a8d2b417'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Background bulk uploads persist their progress per committed chunk so
+    # an interrupted job can resume where it stopped
+    op.create_table('bulk_upload_jobs',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('created_by', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', name='bulkuploadjobstatus'), nullable=False),
+    sa.Column('rows_processed', sa.Integer(), nullable=False),
+    sa.Column('successful', sa.Integer(), nullable=False),
+    sa.Column('failed', sa.Integer(), nullable=False),
+    sa.Column('errors', sa.JSON(), nullable=False),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('owner', sa.String(length=255), nullable=True),
+    sa.Column('lease_until', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_bulk_upload_jobs_status'), 'bulk_upload_jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_bulk_upload_jobs_status'), table_name='bulk_upload_jobs')
+    op.drop_table('bulk_upload_jobs')
+    sa.Enum(name='bulkuploadjobstatus').drop(op.get_bind(), checkfirst=True)
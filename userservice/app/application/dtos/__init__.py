@@ -16,6 +16,8 @@ from .user_dtos import (
     UserDetailDTO,
     BulkUploadUserDTO,
     BulkUploadResultDTO,
+    BulkUploadProgressDTO,
+    BulkUploadJobDTO,
     DeleteUserResultDTO,
     # PASO 5: Auth Critical DTOs
     ForgotPasswordDTO,
@@ -39,6 +41,8 @@ __all__ = [
     "UserDetailDTO",
     "BulkUploadUserDTO",
     "BulkUploadResultDTO",
+    "BulkUploadProgressDTO",
+    "BulkUploadJobDTO",
     "DeleteUserResultDTO",
     # PASO 5: Auth Critical DTOs
     "ForgotPasswordDTO",
@@ -1,6 +1,6 @@
 """User DTOs for application layer."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
@@ -101,10 +101,12 @@ class UserListDTO:
     """DTO for paginated user list."""
     
     users: list[UserResponseDTO]
-    total: int
+    total: Optional[int]  # None when the count was skipped
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int]
+    next_cursor: Optional[str] = None  # Opaque keyset cursor for the next page
+    count_mode: str = "exact"  # exact, estimate or none
 
 
 @dataclass(frozen=True)
@@ -206,13 +208,49 @@ class BulkUploadResultDTO:
     failed: int
     errors: list[dict]
     created_users: list[dict]
+    updated_users: list[dict] = field(default_factory=list)
+    updated: int = 0
+    truncated: bool = False  # The lists hold only the first rows of each kind; the counts cover all
+    stream_error: Optional[str] = None  # Why the file could not be read to the end, if it could not
     
     @property
     def message(self) -> str:
         """Generate summary message."""
+        if self.updated:
+            return (
+                f"Bulk upload completed: {self.successful - self.updated}/{self.total_processed} users created "
+                f"and {self.updated} updated successfully"
+            )
         return f"Bulk upload completed: {self.successful}/{self.total_processed} users created successfully"
 
 
+@dataclass(frozen=True)
+class BulkUploadProgressDTO:
+    """DTO for the progress of a bulk upload, reported after each chunk."""
+    
+    processed: int
+    successful: int
+    failed: int
+    errors: list[dict] = field(default_factory=list)  # Row errors since the previous report
+
+
+@dataclass(frozen=True)
+class BulkUploadJobDTO:
+    """DTO for the status of a background bulk upload job."""
+    
+    id: UUID
+    filename: str
+    status: str
+    rows_processed: int
+    successful: int
+    failed: int
+    errors: list[dict]
+    error_message: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime]
+
+
 @dataclass(frozen=True)
 class DeleteUserResultDTO:
     """DTO for user deletion result."""
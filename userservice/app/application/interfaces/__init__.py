@@ -1,11 +1,22 @@
 """Application interfaces module."""
 
-from .password_service_interface import PasswordServiceInterface
+from .password_service_interface import PasswordServiceInterface, HashPriority
 from .token_service_interface import TokenServiceInterface
 from .email_service_interface import EmailServiceInterface
+from .login_recorder_interface import LoginRecorderInterface
+from .principal_cache_interface import PrincipalCacheInterface
+from .revocation_store_interface import RevocationStoreInterface
+from .user_list_cache_interface import UserListCacheInterface
+from .bulk_upload_job_queue_interface import BulkUploadJobQueueInterface
 
 __all__ = [
     "PasswordServiceInterface",
+    "HashPriority",
     "TokenServiceInterface",
     "EmailServiceInterface",
+    "LoginRecorderInterface",
+    "PrincipalCacheInterface",
+    "RevocationStoreInterface",
+    "UserListCacheInterface",
+    "BulkUploadJobQueueInterface",
 ]
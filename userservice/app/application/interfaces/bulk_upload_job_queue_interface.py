@@ -0,0 +1,16 @@
+"""Bulk upload job queue interface for application layer."""
+
+from abc import ABC, abstractmethod
+from typing import AsyncIterable
+from uuid import UUID
+
+from ...domain import BulkUploadJob
+
+
+class BulkUploadJobQueueInterface(ABC):
+    """Interface for running bulk uploads in the background."""
+    
+    @abstractmethod
+    async def submit(self, chunks: AsyncIterable[bytes], filename: str, created_by: UUID) -> BulkUploadJob:
+        """Store a UTF-8 CSV upload and queue it, returning the pending job."""
+        pass
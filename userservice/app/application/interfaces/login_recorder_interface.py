@@ -0,0 +1,19 @@
+"""Login recorder interface for application layer."""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from uuid import UUID
+
+
+class LoginRecorderInterface(ABC):
+    """Interface for persisting login timestamps outside the login request."""
+    
+    @abstractmethod
+    async def record_login(self, user_id: UUID, logged_in_at: datetime) -> None:
+        """Queue the last login timestamp of a user to be persisted."""
+        pass
+    
+    @abstractmethod
+    async def flush(self) -> int:
+        """Persist queued timestamps now, returning how many users were written."""
+        pass
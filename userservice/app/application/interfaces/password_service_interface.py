@@ -1,6 +1,14 @@
 """Password service interface for application layer."""
 
 from abc import ABC, abstractmethod
+from enum import IntEnum
+
+
+class HashPriority(IntEnum):
+    """Scheduling priority of a hashing job; lower values run first."""
+    
+    INTERACTIVE = 0  # A user is waiting on the response (login, password change)
+    BATCH = 1  # Bulk work that can yield to interactive requests
 
 
 class PasswordServiceInterface(ABC):
@@ -16,6 +24,26 @@ class PasswordServiceInterface(ABC):
         """Verify a password against its hash."""
         pass
     
+    @abstractmethod
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Whether a stored hash should be replaced by one made with the current settings."""
+        pass
+    
+    @abstractmethod
+    async def hash_password_async(self, password: str, priority: HashPriority = HashPriority.INTERACTIVE) -> str:
+        """Hash a plain text password without blocking the event loop."""
+        pass
+    
+    @abstractmethod
+    async def verify_password_async(
+        self,
+        password: str,
+        hashed_password: str,
+        priority: HashPriority = HashPriority.INTERACTIVE,
+    ) -> bool:
+        """Verify a password against its hash without blocking the event loop."""
+        pass
+    
     @abstractmethod
     def generate_temporary_password(self) -> str:
         """Generate a temporary password."""
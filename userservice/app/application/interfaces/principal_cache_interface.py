@@ -0,0 +1,39 @@
+"""Principal cache interface for application layer."""
+
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Optional
+from uuid import UUID
+
+from ...domain.entities.user_entity import User
+
+
+class PrincipalCacheInterface(ABC):
+    """Interface for caching the user behind an access token between requests."""
+    
+    @abstractmethod
+    async def get_or_load(
+        self,
+        user_id: UUID,
+        loader: Callable[[UUID], Awaitable[Optional[User]]],
+    ) -> Optional[User]:
+        """Return the cached user, or load it once (concurrent misses share the load) and cache it."""
+        pass
+    
+    @abstractmethod
+    async def get_token_version(
+        self,
+        user_id: UUID,
+        loader: Callable[[UUID], Awaitable[Optional[int]]],
+    ) -> Optional[int]:
+        """Return the cached token version watermark of a user, loading it once on a miss."""
+        pass
+    
+    @abstractmethod
+    async def invalidate(self, user_id: UUID) -> None:
+        """Drop the cached user and watermark so the next request reads them again."""
+        pass
+    
+    @abstractmethod
+    def stats(self) -> dict:
+        """Hit/miss counters of the cache."""
+        pass
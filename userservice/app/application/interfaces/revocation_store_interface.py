@@ -0,0 +1,28 @@
+"""Token revocation store interface for application layer."""
+
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class RevocationStoreInterface(ABC):
+    """Interface for revocation entries that expire with the tokens they cover."""
+    
+    @abstractmethod
+    async def revoke(self, key: str, value: float, ttl_seconds: float) -> None:
+        """Store a revocation entry (e.g. the revocation timestamp) for ``ttl_seconds``."""
+        pass
+    
+    @abstractmethod
+    async def get(self, key: str) -> Optional[float]:
+        """Value of a live revocation entry, or None if the key is not revoked."""
+        pass
+    
+    @abstractmethod
+    async def start(self) -> None:
+        """Start background maintenance of the store."""
+        pass
+    
+    @abstractmethod
+    async def stop(self) -> None:
+        """Stop background maintenance of the store."""
+        pass
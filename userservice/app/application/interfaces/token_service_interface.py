@@ -10,8 +10,16 @@ class TokenServiceInterface(ABC):
     """Interface for JWT token management."""
     
     @abstractmethod
-    def create_access_token(self, user_id: UUID, role: str, expires_delta: int = None) -> str:
-        """Create an access token for a user."""
+    def create_access_token(
+        self,
+        user_id: UUID,
+        role: str,
+        expires_delta: int = None,
+        is_active: bool = True,
+        must_change_password: bool = False,
+        token_version: Optional[int] = None,
+    ) -> str:
+        """Create an access token for a user, with the claims authorization needs."""
         pass
     
     @abstractmethod
@@ -35,20 +43,25 @@ class TokenServiceInterface(ABC):
         pass
     
     @abstractmethod
-    def revoke_token(self, token: str) -> None:
+    async def revoke_token(self, token: str) -> None:
         """Revoke a token (add to blacklist)."""
         pass
     
     @abstractmethod
-    def is_token_revoked(self, token: str) -> bool:
+    async def is_token_revoked(self, token: str) -> bool:
         """Check if a token has been revoked."""
         pass
     
     # PASO 5: Métodos adicionales para gestión de tokens
     
     @abstractmethod
-    def revoke_all_user_tokens(self, user_id: UUID, exclude_current: bool = False) -> None:
-        """Revoke all tokens for a user."""
+    async def revoke_all_user_tokens(self, user_id: UUID) -> None:
+        """Revoke all tokens issued to a user up to now."""
+        pass
+    
+    @abstractmethod
+    async def is_user_token_revoked(self, user_id: UUID, token_issued_at: datetime) -> bool:
+        """Check if a user's token was issued before all of the user's tokens were revoked."""
         pass
     
     # PASO 6: Métodos específicos para refresh tokens
@@ -0,0 +1,30 @@
+"""User list cache interface for application layer."""
+
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Sequence
+
+from ..dtos.user_dtos import UserListDTO
+
+
+class UserListCacheInterface(ABC):
+    """Interface for caching pages of the user list, invalidated by generation counters."""
+    
+    @abstractmethod
+    async def get_or_load(
+        self,
+        scopes: Sequence[str],
+        key: str,
+        loader: Callable[[], Awaitable[UserListDTO]],
+    ) -> UserListDTO:
+        """Return the page cached under ``key`` for the current generation of ``scopes``, loading it on a miss."""
+        pass
+    
+    @abstractmethod
+    async def bump(self, *scopes: str) -> None:
+        """Move ``scopes`` to a new generation so every page cached under them is stale."""
+        pass
+    
+    @abstractmethod
+    def stats(self) -> dict:
+        """Hit/miss counters of the cache."""
+        pass
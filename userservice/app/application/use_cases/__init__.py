@@ -23,6 +23,8 @@ from .user_use_cases import (
     AdminUpdateUserUseCase,
     DeleteUserUseCase,
     BulkUploadUsersUseCase,
+    StartBulkUploadJobUseCase,
+    GetBulkUploadJobUseCase,
 )
 
 __all__ = [
@@ -47,4 +49,6 @@ __all__ = [
     "AdminUpdateUserUseCase",
     "DeleteUserUseCase",
     "BulkUploadUsersUseCase",
+    "StartBulkUploadJobUseCase",
+    "GetBulkUploadJobUseCase",
 ]
@@ -2,11 +2,13 @@
 
 import secrets
 from datetime import datetime, timedelta
+from typing import Optional
 from uuid import UUID
 
 from ...domain import (
     UserRepositoryInterface, 
     RefreshTokenRepositoryInterface,  # PASO 6: Added
+    UnitOfWorkInterface,
     User, 
     RefreshToken,  # PASO 6: Added
     Email,
@@ -16,8 +18,15 @@ from ...domain import (
     InvalidPasswordError,
     WeakPasswordError,
     InvalidTokenError,
+    PasswordHashingOverloadedError,
+)
+from ..interfaces import (
+    PasswordServiceInterface,
+    TokenServiceInterface,
+    EmailServiceInterface,
+    LoginRecorderInterface,
+    PrincipalCacheInterface,
 )
-from ..interfaces import PasswordServiceInterface, TokenServiceInterface, EmailServiceInterface
 from ..dtos import (
     LoginDTO, 
     TokenResponseDTO, 
@@ -28,6 +37,7 @@ from ..dtos import (
     ResetPasswordDTO,
     ForceChangePasswordDTO,
 )
+from .user_use_cases import invalidate_principal, verify_user_password
 
 
 class LoginUseCase:
@@ -39,11 +49,15 @@ class LoginUseCase:
         refresh_token_repository: RefreshTokenRepositoryInterface,  # PASO 6: Added
         password_service: PasswordServiceInterface,
         token_service: TokenServiceInterface,
+        login_recorder: Optional[LoginRecorderInterface] = None,
+        unit_of_work: Optional[UnitOfWorkInterface] = None,
     ):
         self._user_repository = user_repository
         self._refresh_token_repository = refresh_token_repository  # PASO 6: Added
         self._password_service = password_service
         self._token_service = token_service
+        self._login_recorder = login_recorder
+        self._unit_of_work = unit_of_work
     
     async def execute(self, login_data: LoginDTO) -> TokenResponseDTO:
         """Execute user login."""
@@ -63,23 +77,43 @@ class LoginUseCase:
             raise UserInactiveError(str(user.id))
         
         # Verify password
-        if not self._password_service.verify_password(login_data.password, user.hashed_password):
+        if not await verify_user_password(self._password_service, user, login_data.password):
             raise AuthenticationError("Invalid credentials")
         
-        # Record login
+        # Hash a deferred initial password, or upgrade a hash made with another
+        # bcrypt cost, while the password is at hand
+        rehashed = False
+        if user.has_deferred_password or self._password_service.needs_rehash(user.hashed_password):
+            try:
+                user.hashed_password = await self._password_service.hash_password_async(login_data.password)
+                rehashed = True
+            except PasswordHashingOverloadedError:
+                pass  # Try again on a later login rather than failing this one
+        
+        # Record login (write-behind when a recorder is configured)
         user.record_login()
-        await self._user_repository.update(user)
+        if self._login_recorder is not None:
+            await self._login_recorder.record_login(user.id, user.last_login_at)
+        if self._login_recorder is None or rehashed:
+            await self._user_repository.update(user)
         
         # Create tokens
         access_token = self._token_service.create_access_token(
             user_id=user.id,
-            role=user.role.value
+            role=user.role.value,
+            is_active=user.is_active,
+            must_change_password=user.must_change_password,
+            token_version=user.token_version,
         )
         
         # PASO 6: Create and save refresh token
         refresh_token = RefreshToken.create_for_user(user.id)
         await self._refresh_token_repository.save(refresh_token)
         
+        # Login update and refresh token go out in a single commit
+        if self._unit_of_work is not None:
+            await self._unit_of_work.commit()
+        
         # Create user response DTO
         user_response = UserResponseDTO(
             id=user.id,
@@ -113,7 +147,7 @@ class LogoutUseCase:
     
     async def execute(self, token: str) -> None:
         """Execute user logout by revoking token."""
-        self._token_service.revoke_token(token)
+        await self._token_service.revoke_token(token)
 
 
 class ValidateTokenUseCase:
@@ -130,7 +164,7 @@ class ValidateTokenUseCase:
     async def execute(self, token: str) -> UserResponseDTO:
         """Validate token and return user information."""
         # Check if token is valid and not revoked
-        if not self._token_service.is_token_valid(token) or self._token_service.is_token_revoked(token):
+        if not self._token_service.is_token_valid(token) or await self._token_service.is_token_revoked(token):
             raise AuthenticationError("Invalid or expired token")
         
         # Decode token to get user information
@@ -172,9 +206,11 @@ class ForgotPasswordUseCase:
         self,
         user_repository: UserRepositoryInterface,
         email_service: EmailServiceInterface,
+        unit_of_work: Optional[UnitOfWorkInterface] = None,
     ):
         self._user_repository = user_repository
         self._email_service = email_service
+        self._unit_of_work = unit_of_work
     
     async def execute(self, request_data: ForgotPasswordDTO) -> None:
         """Generate reset token and send email."""
@@ -196,6 +232,8 @@ class ForgotPasswordUseCase:
         # Set reset token in user
         user.set_password_reset_token(reset_token)
         await self._user_repository.update(user)
+        if self._unit_of_work is not None:
+            await self._unit_of_work.commit()
         
         # Send email with reset link
         await self._email_service.send_password_reset_email(
@@ -213,10 +251,14 @@ class ResetPasswordUseCase:
         user_repository: UserRepositoryInterface,
         password_service: PasswordServiceInterface,
         token_service: TokenServiceInterface,
+        principal_cache: Optional[PrincipalCacheInterface] = None,
+        unit_of_work: Optional[UnitOfWorkInterface] = None,
     ):
         self._user_repository = user_repository
         self._password_service = password_service
         self._token_service = token_service
+        self._principal_cache = principal_cache
+        self._unit_of_work = unit_of_work
     
     async def execute(self, reset_data: ResetPasswordDTO) -> None:
         """Reset password using valid token."""
@@ -234,19 +276,20 @@ class ResetPasswordUseCase:
             raise WeakPasswordError("Password does not meet security requirements")
         
         # Check if new password is different from current
-        if self._password_service.verify_password(reset_data.new_password, user.hashed_password):
+        if await verify_user_password(self._password_service, user, reset_data.new_password):
             raise InvalidPasswordError("New password must be different from current password")
         
         # Hash new password
-        new_hashed_password = self._password_service.hash_password(reset_data.new_password)
+        new_hashed_password = await self._password_service.hash_password_async(reset_data.new_password)
         
         # Update password and clear reset token
         user.change_password(new_hashed_password)
         user.clear_password_reset_token()
         await self._user_repository.update(user)
+        await invalidate_principal(user.id, self._principal_cache, self._unit_of_work)
         
         # Invalidate all existing refresh tokens for this user
-        self._token_service.revoke_all_user_tokens(user.id)
+        await self._token_service.revoke_all_user_tokens(user.id)
 
 
 class ForceChangePasswordUseCase:
@@ -257,10 +300,14 @@ class ForceChangePasswordUseCase:
         user_repository: UserRepositoryInterface,
         password_service: PasswordServiceInterface,
         token_service: TokenServiceInterface,
+        principal_cache: Optional[PrincipalCacheInterface] = None,
+        unit_of_work: Optional[UnitOfWorkInterface] = None,
     ):
         self._user_repository = user_repository
         self._password_service = password_service
         self._token_service = token_service
+        self._principal_cache = principal_cache
+        self._unit_of_work = unit_of_work
     
     async def execute(self, change_data: ForceChangePasswordDTO) -> None:
         """Force password change for users with must_change_password flag."""
@@ -282,20 +329,21 @@ class ForceChangePasswordUseCase:
             raise WeakPasswordError("Password does not meet security requirements")
         
         # Check if new password is different from current
-        if self._password_service.verify_password(change_data.new_password, user.hashed_password):
+        if await verify_user_password(self._password_service, user, change_data.new_password):
             raise InvalidPasswordError("New password must be different from current password")
         
         # Hash new password
-        new_hashed_password = self._password_service.hash_password(change_data.new_password)
+        new_hashed_password = await self._password_service.hash_password_async(change_data.new_password)
         
         # Update password and clear must_change_password flag
         user.change_password(new_hashed_password)
         user.clear_must_change_password()
         await self._user_repository.update(user)
+        await invalidate_principal(user.id, self._principal_cache, self._unit_of_work)
         
-        # Invalidate all existing refresh tokens except current one
-        # (The user should remain logged in after forced change)
-        self._token_service.revoke_all_user_tokens(user.id, exclude_current=True)
+        # Revoke every access token issued so far, the caller's included; the
+        # session goes on with a new access token from its refresh token
+        await self._token_service.revoke_all_user_tokens(user.id)
 
 
 # PASO 6: Refresh Token Use Case for HU-BE-003
@@ -308,53 +356,70 @@ class RefreshTokenUseCase:
         user_repository: UserRepositoryInterface,
         refresh_token_repository: RefreshTokenRepositoryInterface,
         token_service: TokenServiceInterface,
+        unit_of_work: Optional[UnitOfWorkInterface] = None,
     ):
         self._user_repository = user_repository
         self._refresh_token_repository = refresh_token_repository
         self._token_service = token_service
+        self._unit_of_work = unit_of_work
     
-    async def execute(self, refresh_data: RefreshTokenDTO) -> RefreshTokenResponseDTO:
-        """Refresh access token using valid refresh token."""
-        # Get refresh token from repository
-        refresh_token = await self._refresh_token_repository.get_by_token(refresh_data.refresh_token)
+    async def _commit(self) -> None:
+        if self._unit_of_work is not None:
+            await self._unit_of_work.commit()
+    
+    async def _reject(self, token: str) -> None:
+        """Explain why a token could not be rotated, cleaning up as needed."""
+        refresh_token = await self._refresh_token_repository.get_by_token(token)
         if not refresh_token:
             raise InvalidTokenError("Invalid refresh token")
         
-        # Validate refresh token
-        try:
-            refresh_token.validate_for_refresh()
-        except InvalidTokenError:
-            # Clean up invalid token
+        if refresh_token.is_expired():
+            # Clean up expired token
             await self._refresh_token_repository.delete(refresh_token.id)
-            raise
+            await self._commit()
+            raise InvalidTokenError("Refresh token has expired")
+        
+        # An unexpired token that is no longer active was already rotated (or
+        # revoked): someone is replaying it, so the whole family is revoked
+        await self._refresh_token_repository.revoke_family(refresh_token.family_id)
+        await self._commit()
+        raise InvalidTokenError("Refresh token has been revoked")
+    
+    async def execute(self, refresh_data: RefreshTokenDTO) -> RefreshTokenResponseDTO:
+        """Refresh access token using valid refresh token."""
+        # Rotate refresh token: revoke the old one and issue the new one atomically
+        new_refresh_token = await self._refresh_token_repository.rotate(
+            refresh_data.refresh_token,
+            RefreshToken.generate_token(),
+            RefreshToken.default_expires_at(),
+        )
+        if not new_refresh_token:
+            await self._reject(refresh_data.refresh_token)
         
         # Get user
-        user = await self._user_repository.get_by_id(refresh_token.user_id)
+        user = await self._user_repository.get_by_id(new_refresh_token.user_id)
         if not user:
-            raise UserNotFoundError(f"User not found: {refresh_token.user_id}")
+            raise UserNotFoundError(f"User not found: {new_refresh_token.user_id}")
         
         # Check if user is still active
         if not user.is_active:
             # Revoke all tokens for inactive user
             await self._refresh_token_repository.revoke_all_user_tokens(user.id)
+            await self._commit()
             raise UserInactiveError(f"User account is inactive: {user.id}")
         
-        # Mark token as used
-        refresh_token.mark_as_used()
-        
         # Create new access token
         access_token = self._token_service.create_access_token(
             user_id=user.id,
             role=user.role.value,
-            expires_delta=3600  # 1 hour
+            expires_delta=3600,  # 1 hour
+            is_active=user.is_active,
+            must_change_password=user.must_change_password,
+            token_version=user.token_version,
         )
         
-        # Rotate refresh token (create new one and revoke old one)
-        new_refresh_token = refresh_token.rotate()
-        await self._refresh_token_repository.save(new_refresh_token)
-        
-        # Update the used token in repository
-        await self._refresh_token_repository.update(refresh_token)
+        # Rotation goes out in a single commit
+        await self._commit()
         
         return RefreshTokenResponseDTO(
             access_token=access_token,
@@ -0,0 +1,177 @@
+"""Incremental decoding and parsing of CSV uploads."""
+
+import base64
+import binascii
+import codecs
+import csv
+import re
+from typing import AsyncIterable, AsyncIterator, Dict, Iterator, List, Optional, Union
+
+# Characters of base64 text, including the line breaks of wrapped encodings
+_BASE64_TEXT = re.compile(r"[A-Za-z0-9+/=\s]*")
+_WHITESPACE = re.compile(r"\s+")
+_SNIFF_CHARS = 4096
+_TEXT_CHUNK_CHARS = 64 * 1024
+# Longest record kept for parsing; a longer one is yielded as CsvRecordTooLong
+MAX_RECORD_CHARS = 64 * 1024
+
+# Where a scan of CSV text stands, as in the csv module's reader
+_START_FIELD, _IN_FIELD, _IN_QUOTED, _QUOTE_IN_QUOTED = range(4)
+
+
+class CsvRecordTooLong(ValueError):
+    """Yielded by ``iter_csv_records`` in place of a record over ``MAX_RECORD_CHARS``."""
+
+
+async def decode_utf8_stream(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Decode UTF-8 bytes chunk by chunk; a character split across chunks is joined."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    async for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+def _iter_base64_bytes(content: str) -> Iterator[bytes]:
+    carry = ""
+    for start in range(0, len(content), _TEXT_CHUNK_CHARS):
+        piece = carry + _WHITESPACE.sub("", content[start:start + _TEXT_CHUNK_CHARS])
+        usable = len(piece) - len(piece) % 4
+        carry = piece[usable:]
+        if usable:
+            yield base64.b64decode(piece[:usable], validate=True)
+    if carry:
+        raise binascii.Error("Incorrect base64 padding")
+
+
+async def iter_csv_text(content: str) -> AsyncIterator[str]:
+    """
+    Text of an uploaded CSV given either as base64 or as plain text.
+
+    Base64 is recognized by its alphabet (a CSV header has commas, which
+    base64 never does) and decoded a slice at a time rather than copied
+    whole into bytes and then into a second string.
+    """
+    if _BASE64_TEXT.fullmatch(content, 0, _SNIFF_CHARS):
+
+        async def decoded_chunks() -> AsyncIterator[bytes]:
+            for chunk in _iter_base64_bytes(content):
+                yield chunk
+
+        async for text in decode_utf8_stream(decoded_chunks()):
+            yield text
+        return
+
+    for start in range(0, len(content), _TEXT_CHUNK_CHARS):
+        yield content[start:start + _TEXT_CHUNK_CHARS]
+
+
+def _scan_quotes(text: str, state: int) -> int:
+    """
+    State after ``text`` given the state before it.
+
+    Follows the reader of the default dialect: a quote opens a field only at
+    its start, ``""`` inside a quoted field is an escaped quote, and a quote
+    anywhere else is kept as it is. Only a quoted field can carry a newline.
+    """
+    i = 0
+    while i < len(text):
+        if state == _IN_QUOTED:
+            i = text.find('"', i)
+            if i < 0:
+                return _IN_QUOTED
+            state, i = _QUOTE_IN_QUOTED, i + 1
+        elif state == _QUOTE_IN_QUOTED:
+            state = _IN_QUOTED if text[i] == '"' else _START_FIELD if text[i] == "," else _IN_FIELD
+            i += 1
+        elif state == _START_FIELD and text[i] == '"':
+            state, i = _IN_QUOTED, i + 1
+        else:
+            # Unquoted field: the next quote that counts opens a later field
+            i = text.find(',"', i)
+            if i < 0:
+                return _START_FIELD if text[-1] == "," else _IN_FIELD
+            state, i = _IN_QUOTED, i + 2
+    return state
+
+
+async def iter_csv_records(
+    text_chunks: AsyncIterable[str],
+) -> AsyncIterator[Union[Dict[Optional[str], object], CsvRecordTooLong]]:
+    """
+    Rows of a CSV stream as ``csv.DictReader`` would produce them.
+
+    Whether a quoted field is open is tracked as the text arrives, so each
+    record is parsed once, as soon as it is complete. A record longer than
+    ``MAX_RECORD_CHARS`` (an unterminated quote runs to the end of the file)
+    is dropped as it is read and a ``CsvRecordTooLong`` is yielded in its
+    place, so memory stays bounded whatever the file holds.
+    """
+    fieldnames: Optional[List[str]] = None
+    record: List[str] = []
+    record_chars = 0
+    state = _START_FIELD
+    pending = ""
+
+    def parse(lines: List[str]):
+        nonlocal fieldnames
+        values = next(csv.reader(lines), [])
+        if not values:
+            return None  # Blank line
+        if fieldnames is None:
+            fieldnames = values
+            return None
+        row: Dict[Optional[str], object] = dict(zip(fieldnames, values))
+        if len(values) > len(fieldnames):
+            row[None] = values[len(fieldnames):]
+        for name in fieldnames[len(values):]:
+            row[name] = None
+        return row
+
+    def end_record():
+        nonlocal record, record_chars, state
+        if record_chars > MAX_RECORD_CHARS:
+            row = CsvRecordTooLong(f"Record longer than {MAX_RECORD_CHARS} characters (unterminated quote?)")
+        else:
+            row = parse(record)
+        record, record_chars, state = [], 0, _START_FIELD
+        return row
+
+    async for text in text_chunks:
+        lines = text.split("\n")
+        lines[0] = pending + lines[0]
+        pending = lines.pop()
+        for line in lines:
+            line += "\n"
+            if not record_chars and len(line) <= MAX_RECORD_CHARS and '"' not in line:
+                # Most records: one line without quotes
+                row = parse([line])
+                if row is not None:
+                    yield row
+                continue
+            state = _scan_quotes(line, state)
+            record_chars += len(line)
+            if record_chars <= MAX_RECORD_CHARS:
+                record.append(line)
+            if state == _IN_QUOTED:
+                continue  # The quoted field goes on on the next line
+            row = end_record()
+            if row is not None:
+                yield row
+        if len(pending) > MAX_RECORD_CHARS:
+            # A line this long is dropped as it arrives; only its quotes are followed
+            state = _scan_quotes(pending, state)
+            record_chars += len(pending)
+            record, pending = [], ""
+
+    if pending or record_chars:
+        state = _scan_quotes(pending, state)
+        record_chars += len(pending)
+        if record_chars <= MAX_RECORD_CHARS:
+            record.append(pending)
+        row = end_record()
+        if row is not None:
+            yield row
@@ -1,21 +1,41 @@
 """User management use cases."""
 
+import asyncio
+import base64
+import hashlib
+import json
+from datetime import datetime
 from uuid import UUID
-from typing import Optional
+from typing import AsyncIterable, Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
 
 from ...domain import (
     UserRepositoryInterface,
+    UnitOfWorkInterface,
+    CountMode,
+    UserImportOutcome,
     User,
     UserRole,
     Email,
     DocumentNumber,
     DocumentType,
+    DEFERRED_PASSWORD_HASH,
+    BulkUploadJob,
+    BulkUploadJobRepositoryInterface,
     UserNotFoundError,
     UserAlreadyExistsError,
     InvalidPasswordError,
     UserInactiveError,
+    InvalidCursorError,
+    BulkUploadJobNotFoundError,
+)
+from ..interfaces import (
+    PasswordServiceInterface,
+    HashPriority,
+    EmailServiceInterface,
+    PrincipalCacheInterface,
+    UserListCacheInterface,
+    BulkUploadJobQueueInterface,
 )
-from ..interfaces import PasswordServiceInterface, EmailServiceInterface
 from ..dtos import (
     CreateUserDTO,
     UpdateUserDTO,
@@ -28,8 +48,61 @@ from ..dtos import (
     UserDetailDTO,
     BulkUploadUserDTO,
     BulkUploadResultDTO,
+    BulkUploadProgressDTO,
+    BulkUploadJobDTO,
     DeleteUserResultDTO,
 )
+from .csv_stream import CsvRecordTooLong, decode_utf8_stream, iter_csv_records, iter_csv_text
+
+
+async def invalidate_principal(
+    user_id: UUID,
+    principal_cache: Optional[PrincipalCacheInterface],
+    unit_of_work: Optional[UnitOfWorkInterface],
+) -> None:
+    """Commit a change to a user, then drop it from the principal cache.
+    
+    Committing first keeps a concurrent request from caching the old row
+    again between the invalidation and the end of this request.
+    """
+    if principal_cache is None:
+        return
+    if unit_of_work is not None:
+        await unit_of_work.commit()
+    await principal_cache.invalidate(user_id)
+
+
+async def verify_user_password(
+    password_service: PasswordServiceInterface,
+    user: User,
+    password: str,
+) -> bool:
+    """Check a password against the user's hash, or their deferred initial password."""
+    if user.has_deferred_password:
+        return user.matches_deferred_password(password)
+    return await password_service.verify_password_async(password, user.hashed_password)
+
+
+def user_list_scopes(*roles: UserRole) -> Tuple[str, ...]:
+    """Generation scopes of the user list touched by a change to users with ``roles``.
+    
+    Unfiltered pages live under ``all``, which every change bumps; pages
+    filtered by role live under that role only.
+    """
+    return ("all",) + tuple(dict.fromkeys(f"role:{role.value}" for role in roles))
+
+
+async def invalidate_user_lists(
+    list_cache: Optional[UserListCacheInterface],
+    unit_of_work: Optional[UnitOfWorkInterface],
+    *roles: UserRole,
+) -> None:
+    """Commit a change to users with ``roles``, then bump the user list generations it touches."""
+    if list_cache is None:
+        return
+    if unit_of_work is not None:
+        await unit_of_work.commit()
+    await list_cache.bump(*user_list_scopes(*roles))
 
 
 class CreateUserUseCase:
@@ -40,10 +113,14 @@ class CreateUserUseCase:
         user_repository: UserRepositoryInterface,
         password_service: PasswordServiceInterface,
         email_service: EmailServiceInterface,
+        list_cache: Optional[UserListCacheInterface] = None,
+        unit_of_work: Optional[UnitOfWorkInterface] = None,
     ):
         self._user_repository = user_repository
         self._password_service = password_service
         self._email_service = email_service
+        self._list_cache = list_cache
+        self._unit_of_work = unit_of_work
     
     async def execute(self, user_data: CreateUserDTO) -> UserResponseDTO:
         """Create a new user."""
@@ -63,7 +140,7 @@ class CreateUserUseCase:
             raise UserAlreadyExistsError("document_number", document_number.value)
         
         # Hash password
-        hashed_password = self._password_service.hash_password(user_data.password)
+        hashed_password = await self._password_service.hash_password_async(user_data.password)
         
         # Create user entity
         user = User(
@@ -77,6 +154,7 @@ class CreateUserUseCase:
         
         # Save user
         created_user = await self._user_repository.create(user)
+        await invalidate_user_lists(self._list_cache, self._unit_of_work, created_user.role)
         
         # Send welcome email
         try:
@@ -111,6 +189,10 @@ class GetUserByIdUseCase:
     def __init__(self, user_repository: UserRepositoryInterface):
         self._user_repository = user_repository
     
+    async def get_updated_at(self, user_id: UUID) -> Optional[datetime]:
+        """Last modification time of the user, for conditional requests."""
+        return await self._user_repository.get_updated_at(user_id)
+    
     async def execute(self, user_id: UUID) -> UserResponseDTO:
         """Get user by ID."""
         user = await self._user_repository.get_by_id(user_id)
@@ -136,8 +218,17 @@ class GetUserByIdUseCase:
 class UpdateUserUseCase:
     """Use case for updating user information."""
     
-    def __init__(self, user_repository: UserRepositoryInterface):
+    def __init__(
+        self,
+        user_repository: UserRepositoryInterface,
+        principal_cache: Optional[PrincipalCacheInterface] = None,
+        unit_of_work: Optional[UnitOfWorkInterface] = None,
+        list_cache: Optional[UserListCacheInterface] = None,
+    ):
         self._user_repository = user_repository
+        self._principal_cache = principal_cache
+        self._unit_of_work = unit_of_work
+        self._list_cache = list_cache
     
     async def execute(self, user_id: UUID, update_data: UpdateUserDTO) -> UserResponseDTO:
         """Update user information."""
@@ -161,6 +252,8 @@ class UpdateUserUseCase:
         
         # Save changes
         updated_user = await self._user_repository.update(user)
+        await invalidate_principal(user_id, self._principal_cache, self._unit_of_work)
+        await invalidate_user_lists(self._list_cache, self._unit_of_work, user.role)
         
         return UserResponseDTO(
             id=updated_user.id,
@@ -186,10 +279,16 @@ class ChangePasswordUseCase:
         user_repository: UserRepositoryInterface,
         password_service: PasswordServiceInterface,
         email_service: EmailServiceInterface,
+        principal_cache: Optional[PrincipalCacheInterface] = None,
+        unit_of_work: Optional[UnitOfWorkInterface] = None,
+        list_cache: Optional[UserListCacheInterface] = None,
     ):
         self._user_repository = user_repository
         self._password_service = password_service
         self._email_service = email_service
+        self._principal_cache = principal_cache
+        self._unit_of_work = unit_of_work
+        self._list_cache = list_cache
     
     async def execute(self, user_id: UUID, password_data: ChangePasswordDTO) -> None:
         """Change user password."""
@@ -201,7 +300,7 @@ class ChangePasswordUseCase:
             raise UserInactiveError(str(user_id))
         
         # Verify current password
-        if not self._password_service.verify_password(password_data.current_password, user.hashed_password):
+        if not await verify_user_password(self._password_service, user, password_data.current_password):
             raise InvalidPasswordError("Current password is incorrect")
         
         # Validate new password strength
@@ -209,13 +308,15 @@ class ChangePasswordUseCase:
             raise InvalidPasswordError("New password does not meet security requirements")
         
         # Hash new password
-        new_hashed_password = self._password_service.hash_password(password_data.new_password)
+        new_hashed_password = await self._password_service.hash_password_async(password_data.new_password)
         
         # Change password
         user.change_password(new_hashed_password)
         
         # Save changes
         await self._user_repository.update(user)
+        await invalidate_principal(user_id, self._principal_cache, self._unit_of_work)
+        await invalidate_user_lists(self._list_cache, self._unit_of_work, user.role)
         
         # Send notification email
         try:
@@ -231,8 +332,17 @@ class ChangePasswordUseCase:
 class ActivateUserUseCase:
     """Use case for activating a user."""
     
-    def __init__(self, user_repository: UserRepositoryInterface):
+    def __init__(
+        self,
+        user_repository: UserRepositoryInterface,
+        principal_cache: Optional[PrincipalCacheInterface] = None,
+        unit_of_work: Optional[UnitOfWorkInterface] = None,
+        list_cache: Optional[UserListCacheInterface] = None,
+    ):
         self._user_repository = user_repository
+        self._principal_cache = principal_cache
+        self._unit_of_work = unit_of_work
+        self._list_cache = list_cache
     
     async def execute(self, user_id: UUID) -> UserResponseDTO:
         """Activate a user."""
@@ -242,6 +352,8 @@ class ActivateUserUseCase:
         
         user.activate()
         updated_user = await self._user_repository.update(user)
+        await invalidate_principal(user_id, self._principal_cache, self._unit_of_work)
+        await invalidate_user_lists(self._list_cache, self._unit_of_work, user.role)
         
         return UserResponseDTO(
             id=updated_user.id,
@@ -266,9 +378,15 @@ class DeactivateUserUseCase:
         self,
         user_repository: UserRepositoryInterface,
         email_service: EmailServiceInterface,
+        principal_cache: Optional[PrincipalCacheInterface] = None,
+        unit_of_work: Optional[UnitOfWorkInterface] = None,
+        list_cache: Optional[UserListCacheInterface] = None,
     ):
         self._user_repository = user_repository
         self._email_service = email_service
+        self._principal_cache = principal_cache
+        self._unit_of_work = unit_of_work
+        self._list_cache = list_cache
     
     async def execute(self, user_id: UUID) -> UserResponseDTO:
         """Deactivate a user."""
@@ -278,6 +396,8 @@ class DeactivateUserUseCase:
         
         user.deactivate()
         updated_user = await self._user_repository.update(user)
+        await invalidate_principal(user_id, self._principal_cache, self._unit_of_work)
+        await invalidate_user_lists(self._list_cache, self._unit_of_work, user.role)
         
         # Send notification email
         try:
@@ -305,19 +425,52 @@ class DeactivateUserUseCase:
         )
 
 
+def _encode_user_cursor(user: User) -> str:
+    """Encode the (created_at, id) keyset position of a user as an opaque cursor."""
+    payload = json.dumps({"c": user.created_at.isoformat(), "i": str(user.id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_user_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode an opaque cursor back into a (created_at, id) keyset position."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["c"]), UUID(payload["i"])
+    except Exception as e:
+        raise InvalidCursorError() from e
+
+
 class ListUsersUseCase:
     """Use case for listing users with pagination and filtering."""
     
-    def __init__(self, user_repository: UserRepositoryInterface):
+    def __init__(
+        self,
+        user_repository: UserRepositoryInterface,
+        list_cache: Optional[UserListCacheInterface] = None,
+    ):
         self._user_repository = user_repository
+        self._list_cache = list_cache
     
     async def execute(
         self,
         page: int = 1,
         page_size: int = 10,
         filters: Optional[UserFilterDTO] = None,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
     ) -> UserListDTO:
-        """List users with pagination and filtering."""
+        """
+        List users with pagination and filtering.
+        
+        When ``cursor`` is given, keyset pagination is used and ``page`` is
+        ignored; otherwise classic offset pagination is used. Both modes
+        return ``next_cursor`` so clients can continue with keyset pages.
+        ``count_mode`` chooses an exact, estimated or skipped total.
+        
+        With a list cache, pages are cached under the normalized request and
+        the generation of its role (or of ``all`` without a role filter).
+        """
         if page < 1:
             page = 1
         if page_size < 1:
@@ -330,20 +483,48 @@ class ListUsersUseCase:
         is_active = filters.is_active if filters else None
         search_term = filters.search_term if filters else None
         
-        # Get users and total count
-        users = await self._user_repository.list_users(
+        if self._list_cache is None:
+            return await self._load(page, page_size, role, is_active, search_term, cursor, count_mode)
+        
+        # Search is case-insensitive; roles outside the enum fall back to the
+        # scope every change bumps
+        role_value = role.value if isinstance(role, UserRole) else role
+        role_values = {user_role.value for user_role in UserRole}
+        scope = f"role:{role_value}" if role_value in role_values else "all"
+        key = json.dumps(
+            [page, page_size, role_value, is_active, search_term.lower() if search_term else None, cursor, count_mode.value]
+        )
+        return await self._list_cache.get_or_load(
+            (scope,),
+            key,
+            lambda: self._load(page, page_size, role, is_active, search_term, cursor, count_mode),
+        )
+    
+    async def _load(
+        self,
+        page: int,
+        page_size: int,
+        role: Optional[str],
+        is_active: Optional[bool],
+        search_term: Optional[str],
+        cursor: Optional[str],
+        count_mode: CountMode,
+    ) -> UserListDTO:
+        # Rows and total come back in one round trip; one extra row tells
+        # whether another page exists
+        users, total = await self._user_repository.list_users_with_total(
             offset=(page - 1) * page_size,
-            limit=page_size,
+            limit=page_size + 1,
+            after=_decode_user_cursor(cursor) if cursor else None,
             role=role,
             is_active=is_active,
             search_term=search_term,
+            count_mode=count_mode,
         )
         
-        total = await self._user_repository.count_users(
-            role=role,
-            is_active=is_active,
-            search_term=search_term,
-        )
+        has_more = len(users) > page_size
+        users = users[:page_size]
+        next_cursor = _encode_user_cursor(users[-1]) if has_more and users else None
         
         # Convert to DTOs
         user_dtos = [
@@ -364,7 +545,7 @@ class ListUsersUseCase:
             for user in users
         ]
         
-        total_pages = (total + page_size - 1) // page_size
+        total_pages = (total + page_size - 1) // page_size if total is not None else None
         
         return UserListDTO(
             users=user_dtos,
@@ -372,6 +553,8 @@ class ListUsersUseCase:
             page=page,
             page_size=page_size,
             total_pages=total_pages,
+            next_cursor=next_cursor,
+            count_mode=count_mode.value,
         )
 
 
@@ -383,6 +566,10 @@ class GetUserDetailUseCase:
     def __init__(self, user_repository: UserRepositoryInterface):
         self._user_repository = user_repository
     
+    async def get_updated_at(self, user_id: UUID) -> Optional[datetime]:
+        """Last modification time of the user, for conditional requests."""
+        return await self._user_repository.get_updated_at(user_id)
+    
     async def execute(self, user_id: UUID) -> "UserDetailDTO":
         """Get detailed user information."""
         from ..dtos import UserDetailDTO
@@ -417,10 +604,16 @@ class AdminUpdateUserUseCase:
         user_repository: UserRepositoryInterface,
         password_service: PasswordServiceInterface,
         email_service: EmailServiceInterface,
+        principal_cache: Optional[PrincipalCacheInterface] = None,
+        unit_of_work: Optional[UnitOfWorkInterface] = None,
+        list_cache: Optional[UserListCacheInterface] = None,
     ):
         self._user_repository = user_repository
         self._password_service = password_service
         self._email_service = email_service
+        self._principal_cache = principal_cache
+        self._unit_of_work = unit_of_work
+        self._list_cache = list_cache
     
     async def execute(self, user_id: UUID, update_data: "AdminUpdateUserDTO") -> "UserDetailDTO":
         """Update user with admin privileges."""
@@ -446,6 +639,8 @@ class AdminUpdateUserUseCase:
             if await self._user_repository.exists_by_document_number(document_number.value):
                 raise UserAlreadyExistsError("document_number", document_number.value)
         
+        previous_role = user.role
+        
         # Apply updates
         if update_data.first_name is not None:
             user.first_name = update_data.first_name
@@ -461,7 +656,7 @@ class AdminUpdateUserUseCase:
         if update_data.phone is not None:
             user.phone = update_data.phone
         if update_data.role is not None:
-            user.role = update_data.role
+            user.change_role(update_data.role)
         if update_data.is_active is not None:
             if update_data.is_active:
                 user.activate()
@@ -472,6 +667,8 @@ class AdminUpdateUserUseCase:
         
         # Save changes
         updated_user = await self._user_repository.update(user)
+        await invalidate_principal(user_id, self._principal_cache, self._unit_of_work)
+        await invalidate_user_lists(self._list_cache, self._unit_of_work, previous_role, user.role)
         
         # Send notification if user was deactivated
         if update_data.is_active is False:
@@ -508,9 +705,15 @@ class DeleteUserUseCase:
         self,
         user_repository: UserRepositoryInterface,
         email_service: EmailServiceInterface,
+        principal_cache: Optional[PrincipalCacheInterface] = None,
+        unit_of_work: Optional[UnitOfWorkInterface] = None,
+        list_cache: Optional[UserListCacheInterface] = None,
     ):
         self._user_repository = user_repository
         self._email_service = email_service
+        self._principal_cache = principal_cache
+        self._unit_of_work = unit_of_work
+        self._list_cache = list_cache
     
     async def execute(self, user_id: UUID, admin_user_id: UUID) -> "DeleteUserResultDTO":
         """Soft delete a user."""
@@ -530,6 +733,8 @@ class DeleteUserUseCase:
         
         # Save changes
         updated_user = await self._user_repository.update(user)
+        await invalidate_principal(user_id, self._principal_cache, self._unit_of_work)
+        await invalidate_user_lists(self._list_cache, self._unit_of_work, user.role)
         
         # Send notification email
         try:
@@ -547,132 +752,471 @@ class DeleteUserUseCase:
         )
 
 
+class _BulkUploadRow(NamedTuple):
+    """A CSV row that passed validation and waits for its password hash."""
+    
+    row_num: int
+    data: dict
+    user_dto: BulkUploadUserDTO
+    email: Email
+    document_number: DocumentNumber
+
+
+class _BulkUploadReport:
+    """Running totals of a bulk upload, listing at most ``max_rows`` entries of each kind (0 for all)."""
+    
+    def __init__(self, max_rows: int):
+        self.max_rows = max_rows
+        self.created = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors: list = []
+        self.created_users: list = []
+        self.updated_users: list = []
+        self.created_roles: set = set()
+        self.truncated = False
+    
+    @property
+    def successful(self) -> int:
+        return self.created + self.updated
+    
+    def _list(self, entries: list, entry: dict) -> None:
+        if not self.max_rows or len(entries) < self.max_rows:
+            entries.append(entry)
+        else:
+            self.truncated = True
+    
+    def add_error(self, entry: dict) -> None:
+        self.failed += 1
+        self._list(self.errors, entry)
+    
+    def add_created(self, entry: dict, role: UserRole) -> None:
+        self.created += 1
+        self.created_roles.add(role)
+        self._list(self.created_users, entry)
+    
+    def add_updated(self, entry: dict) -> None:
+        self.updated += 1
+        self._list(self.updated_users, entry)
+
+
+def _identity_digest(value: str) -> int:
+    """64-bit digest standing in for an email or document number in a bulk upload's seen rows."""
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "little")
+
+
+# Fields of existing users a bulk upload may overwrite; identity, role and
+# credentials keep going through the single-user admin endpoints
+BULK_UPLOAD_UPDATABLE_FIELDS = ("first_name", "last_name", "phone")
+
+
 class BulkUploadUsersUseCase:
-    """Use case for bulk user upload from CSV."""
+    """Use case for bulk user upload from CSV.
+    
+    The CSV is read as a stream and rows are validated as they arrive.
+    Every ``chunk_size`` valid rows, the ones that clash with existing
+    users are found in one query, the remaining passwords are hashed
+    concurrently, spreading them over every hashing worker, the users are
+    imported in one set-based step and ``progress`` is called with the
+    running totals. Memory use therefore depends on the chunk size and on
+    what the result lists, not on the rest of the file: rows repeating an
+    earlier row of the file are caught through 64-bit digests of the emails
+    and document numbers seen so far. The result lists every error, created
+    and updated user unless ``max_reported_rows`` caps each list (the counts
+    still cover every row).
+    
+    With ``defer_password_hash`` users are created without hashing their
+    initial password (the document number); it is hashed on each user's
+    first successful login instead of all at once in the upload request.
+    
+    Rows whose document number belongs to an existing user are errors,
+    unless ``update_existing_fields`` names fields (from
+    ``BULK_UPLOAD_UPDATABLE_FIELDS``) to overwrite on that user instead;
+    updated users are then dropped from the principal cache.
+    
+    ``skip_rows`` resumes an interrupted upload: the first data rows are
+    read but not processed, and row numbers in errors stay those of the file.
+    """
     
     def __init__(
         self,
         user_repository: UserRepositoryInterface,
         password_service: PasswordServiceInterface,
         email_service: EmailServiceInterface,
+        list_cache: Optional[UserListCacheInterface] = None,
+        unit_of_work: Optional[UnitOfWorkInterface] = None,
+        principal_cache: Optional[PrincipalCacheInterface] = None,
+        defer_password_hash: bool = False,
+        chunk_size: int = 500,
+        update_existing_fields: Sequence[str] = (),
+        max_reported_rows: int = 0,
     ):
+        invalid = set(update_existing_fields) - set(BULK_UPLOAD_UPDATABLE_FIELDS)
+        if invalid:
+            raise ValueError(f"Fields cannot be updated by a bulk upload: {', '.join(sorted(invalid))}")
         self._user_repository = user_repository
         self._password_service = password_service
         self._email_service = email_service
+        self._list_cache = list_cache
+        self._unit_of_work = unit_of_work
+        self._principal_cache = principal_cache
+        self._defer_password_hash = defer_password_hash
+        self._chunk_size = max(1, chunk_size)
+        self._update_existing_fields = tuple(update_existing_fields)
+        self._max_reported_rows = max(0, max_reported_rows)
     
-    async def execute(self, csv_content: str) -> BulkUploadResultDTO:
-        """Process bulk user upload from CSV content."""
-        import csv
-        import io
-        import base64
-        
+    async def execute(
+        self,
+        csv_content: str,
+        progress: Optional[Callable[[BulkUploadProgressDTO], Awaitable[None]]] = None,
+        skip_rows: int = 0,
+    ) -> BulkUploadResultDTO:
+        """Process bulk user upload from CSV content, plain or base64 encoded."""
+        return await self._run(iter_csv_text(csv_content), progress, skip_rows)
+    
+    async def execute_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        progress: Optional[Callable[[BulkUploadProgressDTO], Awaitable[None]]] = None,
+        skip_rows: int = 0,
+    ) -> BulkUploadResultDTO:
+        """Process bulk user upload from a stream of UTF-8 CSV bytes."""
+        return await self._run(decode_utf8_stream(chunks), progress, skip_rows)
+    
+    async def _run(
+        self,
+        text_chunks: AsyncIterable[str],
+        progress: Optional[Callable[[BulkUploadProgressDTO], Awaitable[None]]],
+        skip_rows: int = 0,
+    ) -> BulkUploadResultDTO:
+        """Validate and save rows as they are read, one chunk at a time."""
+        skipped = 0
         total_processed = 0
-        successful = 0
-        failed = 0
-        errors = []
-        created_users = []
+        report = _BulkUploadReport(self._max_reported_rows)
+        reported_errors = 0
         
-        try:
-            # Decode base64 content if needed
+        async def flush(chunk: list) -> None:
+            nonlocal reported_errors
+            saved, updated_ids = await self._process_chunk(chunk, report)
+            if progress is not None:
+                await progress(BulkUploadProgressDTO(
+                    processed=total_processed,
+                    successful=report.successful,
+                    failed=report.failed,
+                    errors=report.errors[reported_errors:],
+                ))
+            reported_errors = len(report.errors)
+            await self._invalidate_principals(updated_ids)
+            # Only after the progress report, which commits the chunk of a
+            # background job, so that a resumed job does not welcome them twice
+            await self._send_welcome_emails(saved)
+        
+        # Validate rows before spending CPU on password hashes. Emails and
+        # document numbers are remembered for the whole file (skipped
+        # rows included) as digests mapped to their first row
+        chunk = []
+        email_rows: Dict[int, int] = {}
+        document_rows: Dict[int, int] = {}
+        stream_error: Optional[Exception] = None
+        records = iter_csv_records(text_chunks)
+        while True:
             try:
-                decoded_content = base64.b64decode(csv_content).decode('utf-8')
-            except Exception:
-                # If not base64, use as-is
-                decoded_content = csv_content
-            
-            # Parse CSV
-            csv_reader = csv.DictReader(io.StringIO(decoded_content))
-            
-            for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 because row 1 is headers
-                total_processed += 1
-                
+                row = await anext(records)
+            except StopAsyncIteration:
+                break
+            except Exception as e:
+                # The rest of the file is unreadable; the rows read so far are still saved
+                stream_error = e
+                break
+            if skipped < skip_rows:
+                skipped += 1
                 try:
-                    # Validate required fields
-                    required_fields = ['first_name', 'last_name', 'email', 'document_number', 'document_type', 'role']
-                    missing_fields = [field for field in required_fields if not row.get(field)]
-                    if missing_fields:
-                        raise ValueError(f"Missing required fields: {', '.join(missing_fields)}")
-                    
-                    # Create DTO
-                    user_dto = BulkUploadUserDTO(
-                        first_name=row['first_name'].strip(),
-                        last_name=row['last_name'].strip(),
-                        email=row['email'].strip(),
-                        document_number=row['document_number'].strip(),
-                        document_type=DocumentType(row['document_type'].strip()),
-                        role=UserRole(row['role'].strip()),
-                        phone=row.get('phone', '').strip() or None,
+                    parsed = self._parse_row(skipped + 1, row)
+                except Exception:
+                    continue
+                email_rows.setdefault(_identity_digest(parsed.email.value), skipped + 1)
+                document_rows.setdefault(_identity_digest(parsed.document_number.value), skipped + 1)
+                continue
+            total_processed += 1
+            row_num = skipped + total_processed + 1  # Row 1 is headers
+            try:
+                parsed = self._parse_row(row_num, row)
+                
+                # Check duplicates within the file
+                email_key = _identity_digest(parsed.email.value)
+                document_key = _identity_digest(parsed.document_number.value)
+                if email_key in email_rows:
+                    raise ValueError(
+                        f"Email already exists in row {email_rows[email_key]}: {parsed.email.value}"
                     )
-                    
-                    # Create user (password = document number)
-                    email = Email(user_dto.email)
-                    document_number = DocumentNumber(user_dto.document_number, user_dto.document_type)
-                    
-                    # Check duplicates
-                    if await self._user_repository.exists_by_email(email.value):
-                        raise ValueError(f"Email already exists: {email.value}")
-                    
-                    if await self._user_repository.exists_by_document_number(document_number.value):
-                        raise ValueError(f"Document number already exists: {document_number.value}")
-                    
-                    # Use document number as initial password
-                    password = user_dto.document_number
-                    hashed_password = self._password_service.hash_password(password)
-                    
-                    # Create user entity
-                    user = User(
-                        first_name=user_dto.first_name,
-                        last_name=user_dto.last_name,
-                        email=email,
-                        document_number=document_number,
-                        hashed_password=hashed_password,
-                        role=user_dto.role,
-                        phone=user_dto.phone,
-                        must_change_password=True,  # Force password change on first login
+                if document_key in document_rows:
+                    raise ValueError(
+                        f"Document number already exists in row "
+                        f"{document_rows[document_key]}: {parsed.document_number.value}"
                     )
-                    
-                    # Save user
-                    created_user = await self._user_repository.create(user)
-                    successful += 1
-                    
-                    created_users.append({
-                        "id": str(created_user.id),
-                        "email": created_user.email.value,
-                        "document_number": created_user.document_number.value,
-                        "role": created_user.role.value,
-                    })
-                    
-                    # Send welcome email (async, don't fail if it fails)
-                    try:
-                        await self._email_service.send_welcome_email(
-                            to_email=created_user.email.value,
-                            user_name=created_user.full_name(),
-                            temporary_password=password,
-                        )
-                    except Exception:
-                        pass
-                    
-                except Exception as e:
-                    failed += 1
-                    errors.append({
-                        "row": row_num,
-                        "error": str(e),
-                        "data": dict(row),
-                    })
+                email_rows[email_key] = row_num
+                document_rows[document_key] = row_num
+                chunk.append(parsed)
+            except Exception as e:
+                report.add_error(self._row_error(row_num, row, e))
             
-        except Exception as e:
-            return BulkUploadResultDTO(
-                total_processed=0,
-                successful=0,
-                failed=1,
-                errors=[{"row": 1, "error": f"CSV parsing error: {str(e)}", "data": {}}],
-                created_users=[],
-            )
+            if len(chunk) >= self._chunk_size:
+                await flush(chunk)
+                chunk = []
+        
+        if chunk:
+            await flush(chunk)
         
+        await self._invalidate_lists(report)
+        report.errors.sort(key=lambda error: error["row"])
+        if stream_error is not None:
+            report.add_error({
+                "row": skipped + total_processed + 2 if skipped + total_processed else 1,
+                "error": f"CSV parsing error: {str(stream_error)}",
+                "data": {},
+            })
+        return self._result(total_processed, report, stream_error)
+    
+    @staticmethod
+    def _result(
+        total_processed: int, report: _BulkUploadReport, stream_error: Optional[Exception] = None
+    ) -> BulkUploadResultDTO:
         return BulkUploadResultDTO(
             total_processed=total_processed,
-            successful=successful,
-            failed=failed,
-            errors=errors,
-            created_users=created_users,
+            successful=report.successful,
+            failed=report.failed,
+            errors=report.errors,
+            created_users=report.created_users,
+            updated_users=report.updated_users,
+            updated=report.updated,
+            truncated=report.truncated,
+            stream_error=f"CSV parsing error: {stream_error}" if stream_error is not None else None,
+        )
+    
+    def _parse_row(self, row_num: int, row: dict) -> _BulkUploadRow:
+        """Parse and validate a CSV row."""
+        if isinstance(row, CsvRecordTooLong):
+            raise row
+        # Validate required fields
+        required_fields = ['first_name', 'last_name', 'email', 'document_number', 'document_type', 'role']
+        missing_fields = [field for field in required_fields if not row.get(field)]
+        if missing_fields:
+            raise ValueError(f"Missing required fields: {', '.join(missing_fields)}")
+        
+        # Create DTO
+        user_dto = BulkUploadUserDTO(
+            first_name=row['first_name'].strip(),
+            last_name=row['last_name'].strip(),
+            email=row['email'].strip(),
+            document_number=row['document_number'].strip(),
+            document_type=DocumentType(row['document_type'].strip()),
+            role=UserRole(row['role'].strip()),
+            phone=row.get('phone', '').strip() or None,
+        )
+        
+        email = Email(user_dto.email)
+        document_number = DocumentNumber(user_dto.document_number, user_dto.document_type)
+        return _BulkUploadRow(row_num, row, user_dto, email, document_number)
+    
+    @staticmethod
+    def _row_error(row_num: int, row: dict, error: Exception) -> dict:
+        """Per-row error entry of the result."""
+        return {
+            "row": row_num,
+            "error": str(error),
+            "data": dict(row) if isinstance(row, dict) else {},
+        }
+    
+    async def _hash_initial_password(self, row: _BulkUploadRow) -> str:
+        """Hash the initial password of a row (its document number)."""
+        if self._defer_password_hash:
+            return DEFERRED_PASSWORD_HASH
+        return await self._password_service.hash_password_async(
+            row.user_dto.document_number, priority=HashPriority.BATCH
+        )
+    
+    async def _process_chunk(
+        self, chunk: list, report: _BulkUploadReport
+    ) -> Tuple[List[Tuple[_BulkUploadRow, User]], List[UUID]]:
+        """
+        Check a chunk of rows against existing users, hash their passwords
+        concurrently and import them. Returns the (row, user) pairs created
+        and the IDs of the users updated.
+        """
+        # Check duplicates against the database, one query for the whole chunk
+        taken_emails, taken_documents = await self._user_repository.find_existing_identities(
+            [row.email.value for row in chunk], [row.document_number.value for row in chunk]
+        )
+        new_rows = []
+        existing_rows = []
+        for row in chunk:
+            if self._update_existing_fields and row.document_number.value in taken_documents:
+                # Updated in place; the import skips it if its email belongs to someone else
+                existing_rows.append(row)
+            elif row.email.value in taken_emails:
+                report.add_error(self._row_error(
+                    row.row_num, row.data, ValueError(f"Email already exists: {row.email.value}")
+                ))
+            elif row.document_number.value in taken_documents:
+                report.add_error(self._row_error(
+                    row.row_num, row.data, ValueError(f"Document number already exists: {row.document_number.value}")
+                ))
+            else:
+                new_rows.append(row)
+        
+        hashes = await asyncio.gather(
+            *(self._hash_initial_password(row) for row in new_rows), return_exceptions=True
         )
+        
+        # Existing users keep their password, so theirs is only hashed should
+        # one be gone by the import and created instead
+        hashes += [DEFERRED_PASSWORD_HASH] * len(existing_rows)
+        
+        pending = []
+        for row, hashed_password in zip(new_rows + existing_rows, hashes):
+            try:
+                if isinstance(hashed_password, BaseException):
+                    raise hashed_password
+                
+                # Create user entity (password = document number)
+                pending.append((row, User(
+                    first_name=row.user_dto.first_name,
+                    last_name=row.user_dto.last_name,
+                    email=row.email,
+                    document_number=row.document_number,
+                    hashed_password=hashed_password,
+                    role=row.user_dto.role,
+                    phone=row.user_dto.phone,
+                    must_change_password=True,  # Force password change on first login
+                )))
+            except Exception as e:
+                report.add_error(self._row_error(row.row_num, row.data, e))
+        
+        # Import the chunk in one set-based step; users created by someone
+        # else since the check come back as skipped
+        results = await self._user_repository.import_many(
+            [user for _, user in pending], self._update_existing_fields
+        )
+        saved = []
+        updated_ids = []
+        for (row, user), result in zip(pending, results):
+            if result.outcome == UserImportOutcome.CREATED:
+                saved.append((row, user))
+            elif result.outcome == UserImportOutcome.UPDATED:
+                updated_ids.append(result.user_id)
+                report.add_updated({
+                    "row": row.row_num,
+                    "email": user.email.value,
+                    "document_number": user.document_number.value,
+                })
+            else:
+                report.add_error(self._row_error(row.row_num, row.data, UserAlreadyExistsError(
+                    "email or document_number", f"{user.email.value} / {user.document_number.value}"
+                )))
+        
+        if not self._defer_password_hash:
+            await self._hash_created_in_place([
+                (row, user) for row, user in saved if user.has_deferred_password
+            ])
+        
+        for row, user in saved:
+            report.add_created({
+                "id": str(user.id),
+                "email": user.email.value,
+                "document_number": user.document_number.value,
+                "role": user.role.value,
+            }, user.role)
+        return saved, updated_ids
+    
+    async def _hash_created_in_place(self, created: List[Tuple[_BulkUploadRow, User]]) -> None:
+        """Hash the initial password of users created in place of an existing user that was gone."""
+        hashes = await asyncio.gather(
+            *(self._hash_initial_password(row) for row, _ in created), return_exceptions=True
+        )
+        for (_, user), hashed_password in zip(created, hashes):
+            # Failing that, the deferred password is hashed on the user's first login
+            if not isinstance(hashed_password, BaseException):
+                user.hashed_password = hashed_password
+                await self._user_repository.update(user)
+    
+    async def _invalidate_principals(self, user_ids: List[UUID]) -> None:
+        """Commit the users updated by a chunk, then drop them from the principal cache."""
+        if self._principal_cache is None or not user_ids:
+            return
+        if self._unit_of_work is not None:
+            await self._unit_of_work.commit()
+        for user_id in user_ids:
+            await self._principal_cache.invalidate(user_id)
+    
+    async def _send_welcome_emails(self, saved: List[Tuple[_BulkUploadRow, User]]) -> None:
+        """Welcome the users created from a chunk; their password is their document number."""
+        for row, user in saved:
+            # Send welcome email (async, don't fail if it fails)
+            try:
+                await self._email_service.send_welcome_email(
+                    to_email=user.email.value,
+                    user_name=user.full_name(),
+                    temporary_password=row.user_dto.document_number,
+                )
+            except Exception:
+                pass
+    
+    async def _invalidate_lists(self, report: _BulkUploadReport) -> None:
+        """Bump the user list generations of the roles that received or changed users."""
+        roles = set(report.created_roles)
+        if report.updated:
+            # An updated user keeps its stored role, which may not be the row's
+            roles = set(UserRole)
+        if roles:
+            await invalidate_user_lists(self._list_cache, self._unit_of_work, *roles)
+
+
+
+def _bulk_upload_job_dto(job: BulkUploadJob) -> BulkUploadJobDTO:
+    return BulkUploadJobDTO(
+        id=job.id,
+        filename=job.filename,
+        status=job.status.value,
+        rows_processed=job.rows_processed,
+        successful=job.successful,
+        failed=job.failed,
+        errors=job.errors,
+        error_message=job.error_message,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+        finished_at=job.finished_at,
+    )
+
+
+class StartBulkUploadJobUseCase:
+    """Use case for queueing a bulk user upload to run in the background."""
+    
+    def __init__(self, job_queue: BulkUploadJobQueueInterface):
+        self._job_queue = job_queue
+    
+    async def execute(self, csv_content: str, filename: str, created_by: UUID) -> BulkUploadJobDTO:
+        """Queue CSV content, plain or base64 encoded."""
+        async def encoded_chunks():
+            async for text in iter_csv_text(csv_content):
+                yield text.encode("utf-8")
+        
+        return await self.execute_stream(encoded_chunks(), filename, created_by)
+    
+    async def execute_stream(self, chunks: AsyncIterable[bytes], filename: str, created_by: UUID) -> BulkUploadJobDTO:
+        """Queue a stream of UTF-8 CSV bytes."""
+        job = await self._job_queue.submit(chunks, filename, created_by)
+        return _bulk_upload_job_dto(job)
+
+
+class GetBulkUploadJobUseCase:
+    """Use case for getting the status and errors of a background bulk upload."""
+    
+    def __init__(self, job_repository: BulkUploadJobRepositoryInterface):
+        self._job_repository = job_repository
+    
+    async def execute(self, job_id: UUID) -> BulkUploadJobDTO:
+        """Get a bulk upload job by ID."""
+        job = await self._job_repository.get_by_id(job_id)
+        if not job:
+            raise BulkUploadJobNotFoundError(str(job_id))
+        return _bulk_upload_job_dto(job)
@@ -1,7 +1,7 @@
 """Environment configuration for the application."""
 
 import os
-from typing import Optional
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 
 
@@ -12,15 +12,72 @@ class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite+aiosqlite:///./test.db"  # Updated for SQLite
     DATABASE_ECHO: bool = False
     
+    # Database connection pool settings (ignored for SQLite and NullPool)
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection
+    DATABASE_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statement cache
+    # PgBouncer in transaction pooling mode cannot keep server-side prepared statements
+    DATABASE_PGBOUNCER_MODE: bool = False
+    
+    # Read replica settings (reads use the primary when no replica is configured)
+    DATABASE_REPLICA_URL: Optional[str] = None
+    DATABASE_READ_YOUR_WRITES_SECONDS: float = 5.0  # Replica lag bound: writers stay on the primary, list cache bumps repeat
+    
+    # User search backend: auto (by dialect), trigram (PostgreSQL), fts5 (SQLite) or like
+    USER_SEARCH_BACKEND: str = "auto"
+    
+    # Write-behind login timestamps (batched instead of one UPDATE per login)
+    LOGIN_WRITE_BEHIND_ENABLED: bool = False
+    LOGIN_WRITE_BEHIND_FLUSH_MS: int = 500
+    LOGIN_WRITE_BEHIND_MAX_BATCH: int = 500
+    
+    # Principal cache for authenticated requests: none, memory (per process) or redis (shared)
+    PRINCIPAL_CACHE_BACKEND: str = "none"
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000  # Bound of the memory backend
+    
+    # Role-gated endpoints authorize from access token claims plus a cached token_version watermark
+    AUTH_CLAIMS_ONLY: bool = False
+    
+    # Cache of user list pages, invalidated by generation counters: none, memory (per process) or redis (shared)
+    USER_LIST_CACHE_BACKEND: str = "none"
+    USER_LIST_CACHE_TTL_SECONDS: float = 30.0
+    USER_LIST_CACHE_MAX_ENTRIES: int = 1000  # Bound of the memory backend
+    
+    # Token revocation store: memory (per process) or redis (shared, Bloom filter in front)
+    TOKEN_REVOCATION_BACKEND: str = "memory"
+    TOKEN_REVOCATION_BLOOM_CAPACITY: int = 100000
+    # When Redis is unreachable: accept tokens (fail open) or reject them (fail closed)
+    TOKEN_REVOCATION_FAIL_OPEN: bool = True
+    
+    # Redis settings (docker-compose provides redis://redis:6379)
+    REDIS_URL: Optional[str] = None
+    
     # JWT settings
     JWT_SECRET_KEY: str = "your-super-secret-jwt-key-change-in-production"
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    JWT_VERIFIED_CACHE_SIZE: int = 10000  # Verified tokens kept until exp (0 disables)
     
     # Password settings
     PASSWORD_MIN_LENGTH: int = 8
-    PASSWORD_HASH_ROUNDS: int = 12
+    PASSWORD_HASH_ROUNDS: int = 12  # Bcrypt cost of new hashes; stored hashes of another cost are rehashed on login
+    PASSWORD_HASH_CALIBRATE: bool = False  # Pick the cost at startup from PASSWORD_HASH_TARGET_MS instead
+    PASSWORD_HASH_TARGET_MS: int = 250  # Verify latency the calibrated cost must fit on this host
+    PASSWORD_HASH_WORKERS: Optional[int] = None  # Hashing processes per server process, cores // WEB_CONCURRENCY by default (0 hashes on threads instead)
+    PASSWORD_HASH_MAX_QUEUE: int = 64  # Hashing jobs allowed to wait for a worker
+    PASSWORD_BREACHED_FILTER_PATH: Optional[str] = None  # Bloom filter file of passwords to reject (scripts/build_breached_password_filter.py)
+    BULK_UPLOAD_CHUNK_SIZE: int = 500  # Rows hashed concurrently and saved between progress reports
+    BULK_UPLOAD_DEFER_PASSWORD_HASH: bool = False  # Hash bulk-uploaded users' initial password on first login
+    BULK_UPLOAD_MAX_REPORTED_ROWS: int = 0  # Cap on the errors, created and updated users listed in a result (0 lists all); the counts cover every row
+    BULK_UPLOAD_UPDATE_EXISTING_FIELDS: List[str] = []  # Overwrite these fields (first_name, last_name, phone) of users matched by document number instead of failing the row
+    BULK_UPLOAD_JOB_DIR: str = "data/bulk_upload_jobs"  # Spooled uploads of background jobs; must survive restarts for jobs to resume
+    BULK_UPLOAD_JOB_WORKERS: int = 1  # Background bulk upload jobs run at the same time
+    BULK_UPLOAD_JOB_LEASE_SECONDS: int = 300  # A job whose worker has not committed a chunk for this long can be claimed by another worker
     
     # Email settings
     SMTP_SERVER: str = "smtp.gmail.com"
@@ -35,6 +92,7 @@ class Settings(BaseSettings):
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = False
     LOG_LEVEL: str = "INFO"
+    WEB_CONCURRENCY: int = 1  # Server processes on this host (the variable uvicorn and gunicorn read); they share its cores
     
     # CORS settings
     CORS_ORIGINS: list[str] = ["*"]  # En producción, especificar dominios exactos
@@ -1,22 +1,43 @@
 """Dependency injection configuration for the application."""
 
+import logging
+import os
 from functools import lru_cache
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 from fastapi import Depends
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infrastructure.config.database import get_db_session
+from app.infrastructure.config.database import get_db_session, get_read_db_session
 from app.infrastructure.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
 from app.infrastructure.repositories.sqlalchemy_refresh_token_repository import SQLAlchemyRefreshTokenRepository  # PASO 6: Added
-from app.infrastructure.adapters.bcrypt_password_service import BcryptPasswordService
+from app.infrastructure.repositories.sqlalchemy_unit_of_work import SQLAlchemyUnitOfWork
+from app.infrastructure.repositories.sqlalchemy_bulk_upload_job_repository import SQLAlchemyBulkUploadJobRepository
+from app.infrastructure.adapters.bcrypt_password_service import BcryptPasswordService, calibrate_bcrypt_rounds
+from app.infrastructure.adapters.password_hash_pool import PasswordHashPool
+from app.infrastructure.adapters.breached_password_filter import BreachedPasswordFilter
 from app.infrastructure.adapters.jwt_token_service import JWTTokenService
 from app.infrastructure.adapters.smtp_email_service import SMTPEmailService
+from app.infrastructure.adapters.write_behind_login_recorder import WriteBehindLoginRecorder
+from app.infrastructure.adapters.principal_cache import InMemoryPrincipalCache, RedisPrincipalCache
+from app.infrastructure.adapters.revocation_store import InMemoryRevocationStore, RedisRevocationStore
+from app.infrastructure.adapters.user_list_cache import InMemoryUserListCache, RedisUserListCache
+from app.infrastructure.adapters.bulk_upload_job_worker import BulkUploadJobWorker
+from app.infrastructure.config.database import database_config
+from app.config import settings
 
 from app.application.interfaces.password_service_interface import PasswordServiceInterface
 from app.application.interfaces.token_service_interface import TokenServiceInterface
 from app.application.interfaces.email_service_interface import EmailServiceInterface
+from app.application.interfaces.login_recorder_interface import LoginRecorderInterface
+from app.application.interfaces.principal_cache_interface import PrincipalCacheInterface
+from app.application.interfaces.revocation_store_interface import RevocationStoreInterface
+from app.application.interfaces.user_list_cache_interface import UserListCacheInterface
+from app.application.interfaces.bulk_upload_job_queue_interface import BulkUploadJobQueueInterface
 from app.domain.repositories.user_repository_interface import UserRepositoryInterface
 from app.domain.repositories.refresh_token_repository_interface import RefreshTokenRepositoryInterface  # PASO 6: Added
+from app.domain.repositories.unit_of_work_interface import UnitOfWorkInterface
+from app.domain.repositories.bulk_upload_job_repository_interface import BulkUploadJobRepositoryInterface
 
 from app.application.use_cases.auth_use_cases import (
     LoginUseCase,
@@ -41,15 +62,20 @@ from app.application.use_cases.user_use_cases import (
     AdminUpdateUserUseCase,
     DeleteUserUseCase,
     BulkUploadUsersUseCase,
+    StartBulkUploadJobUseCase,
+    GetBulkUploadJobUseCase,
 )
 
+logger = logging.getLogger(__name__)
+
 
 # Repository dependencies
 async def get_user_repository(
-    session: AsyncSession = Depends(get_db_session)
+    session: AsyncSession = Depends(get_db_session),
+    read_session: AsyncSession = Depends(get_read_db_session),
 ) -> UserRepositoryInterface:
-    """Get user repository instance."""
-    return SQLAlchemyUserRepository(session)
+    """Get user repository instance (reads may be served by the replica)."""
+    return SQLAlchemyUserRepository(session, read_session)
 
 
 # PASO 6: Refresh token repository dependency
@@ -60,17 +86,89 @@ async def get_refresh_token_repository(
     return SQLAlchemyRefreshTokenRepository(session)
 
 
+async def get_bulk_upload_job_repository(
+    session: AsyncSession = Depends(get_db_session)
+) -> BulkUploadJobRepositoryInterface:
+    """Get bulk upload job repository instance."""
+    return SQLAlchemyBulkUploadJobRepository(session)
+
+
+async def get_unit_of_work(
+    session: AsyncSession = Depends(get_db_session)
+) -> UnitOfWorkInterface:
+    """Get the unit of work over the request session shared by the repositories."""
+    return SQLAlchemyUnitOfWork(session)
+
+
 # Service dependencies
+@lru_cache()
+def get_password_hash_pool() -> Optional[PasswordHashPool]:
+    """Get the password hashing process pool, or None when hashing runs on threads."""
+    workers = settings.PASSWORD_HASH_WORKERS
+    if workers is None:
+        # Every server process gets its own pool, so they split the cores
+        workers = max(1, (os.cpu_count() or 1) // max(1, settings.WEB_CONCURRENCY))
+    if workers <= 0:
+        return None
+    return PasswordHashPool(workers=workers, max_queue=settings.PASSWORD_HASH_MAX_QUEUE)
+
+
+@lru_cache()
+def get_breached_password_filter() -> Optional[BreachedPasswordFilter]:
+    """Get the memory-mapped breached password filter, or None when not configured."""
+    if not settings.PASSWORD_BREACHED_FILTER_PATH:
+        return None
+    try:
+        return BreachedPasswordFilter(settings.PASSWORD_BREACHED_FILTER_PATH)
+    except (OSError, ValueError):
+        logger.exception("Cannot open PASSWORD_BREACHED_FILTER_PATH=%s; breached passwords are not checked", settings.PASSWORD_BREACHED_FILTER_PATH)
+        return None
+
+
 @lru_cache()
 def get_password_service() -> PasswordServiceInterface:
-    """Get password service instance."""
-    return BcryptPasswordService()
+    """Get password service instance (calibrating the bcrypt cost when enabled)."""
+    breached_filter = get_breached_password_filter()
+    if settings.PASSWORD_HASH_CALIBRATE:
+        try:
+            rounds = calibrate_bcrypt_rounds(settings.PASSWORD_HASH_TARGET_MS)
+        except Exception:
+            logger.exception("Bcrypt calibration failed; using PASSWORD_HASH_ROUNDS=%d", settings.PASSWORD_HASH_ROUNDS)
+        else:
+            logger.info("Bcrypt cost calibrated to %d for %d ms", rounds, settings.PASSWORD_HASH_TARGET_MS)
+            return BcryptPasswordService(
+                get_password_hash_pool(), rounds=rounds, allow_higher_rounds=True, breached_filter=breached_filter
+            )
+    return BcryptPasswordService(get_password_hash_pool(), breached_filter=breached_filter)
+
+
+@lru_cache()
+def get_redis() -> Optional[Redis]:
+    """Get the shared Redis client, or None when REDIS_URL is not configured."""
+    if not settings.REDIS_URL:
+        return None
+    return Redis.from_url(settings.REDIS_URL)
+
+
+@lru_cache()
+def get_revocation_store() -> RevocationStoreInterface:
+    """Get the token revocation store (Redis when configured, otherwise per process)."""
+    if settings.TOKEN_REVOCATION_BACKEND == "redis":
+        redis = get_redis()
+        if redis is not None:
+            return RedisRevocationStore(
+                redis,
+                bloom_capacity=settings.TOKEN_REVOCATION_BLOOM_CAPACITY,
+                fail_open=settings.TOKEN_REVOCATION_FAIL_OPEN,
+            )
+        logger.warning("TOKEN_REVOCATION_BACKEND=redis without REDIS_URL; using the memory backend")
+    return InMemoryRevocationStore()
 
 
 @lru_cache()
 def get_token_service() -> TokenServiceInterface:
     """Get token service instance."""
-    return JWTTokenService()
+    return JWTTokenService(revocation_store=get_revocation_store())
 
 
 @lru_cache()
@@ -79,24 +177,92 @@ def get_email_service() -> EmailServiceInterface:
     return SMTPEmailService()
 
 
+@lru_cache()
+def get_login_recorder() -> Optional[LoginRecorderInterface]:
+    """Get the write-behind login recorder, or None when logins are written inline."""
+    if not settings.LOGIN_WRITE_BEHIND_ENABLED:
+        return None
+    return WriteBehindLoginRecorder(
+        database_config.async_session_maker,
+        flush_interval_ms=settings.LOGIN_WRITE_BEHIND_FLUSH_MS,
+        max_batch=settings.LOGIN_WRITE_BEHIND_MAX_BATCH,
+    )
+
+
+@lru_cache()
+def get_principal_cache() -> Optional[PrincipalCacheInterface]:
+    """Get the principal cache, or None when every request reads the user from the database."""
+    backend = settings.PRINCIPAL_CACHE_BACKEND
+    if backend == "none" and settings.AUTH_CLAIMS_ONLY:
+        # Claims-only authorization always caches the token version watermark
+        backend = "memory"
+    if backend == "redis":
+        redis = get_redis()
+        if redis is not None:
+            return RedisPrincipalCache(redis, ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS)
+        logger.warning("PRINCIPAL_CACHE_BACKEND=redis without REDIS_URL; using the memory backend")
+        backend = "memory"
+    if backend == "memory":
+        return InMemoryPrincipalCache(
+            ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+            max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+        )
+    return None
+
+
+@lru_cache()
+def get_user_list_cache() -> Optional[UserListCacheInterface]:
+    """Get the user list page cache, or None when every page is read from the database."""
+    # Pages come from the replica, so bumps are repeated once it has caught up
+    rebump_after_seconds = settings.DATABASE_READ_YOUR_WRITES_SECONDS if settings.DATABASE_REPLICA_URL else 0.0
+    backend = settings.USER_LIST_CACHE_BACKEND
+    if backend == "redis":
+        redis = get_redis()
+        if redis is not None:
+            return RedisUserListCache(
+                redis,
+                ttl_seconds=settings.USER_LIST_CACHE_TTL_SECONDS,
+                rebump_after_seconds=rebump_after_seconds,
+            )
+        logger.warning("USER_LIST_CACHE_BACKEND=redis without REDIS_URL; using the memory backend")
+        backend = "memory"
+    if backend == "memory":
+        return InMemoryUserListCache(
+            ttl_seconds=settings.USER_LIST_CACHE_TTL_SECONDS,
+            max_entries=settings.USER_LIST_CACHE_MAX_ENTRIES,
+            rebump_after_seconds=rebump_after_seconds,
+        )
+    return None
+
+
 # Use case dependencies - Authentication
 def get_login_use_case(
     user_repository: UserRepositoryInterface = Depends(get_user_repository),
     refresh_token_repository: RefreshTokenRepositoryInterface = Depends(get_refresh_token_repository),  # PASO 6: Added
     password_service: PasswordServiceInterface = Depends(get_password_service),
-    token_service: TokenServiceInterface = Depends(get_token_service)
+    token_service: TokenServiceInterface = Depends(get_token_service),
+    login_recorder: Optional[LoginRecorderInterface] = Depends(get_login_recorder),
+    unit_of_work: UnitOfWorkInterface = Depends(get_unit_of_work),
 ) -> LoginUseCase:
     """Get login use case instance."""
-    return LoginUseCase(user_repository, refresh_token_repository, password_service, token_service)  # PASO 6: Updated
+    return LoginUseCase(
+        user_repository,
+        refresh_token_repository,  # PASO 6: Updated
+        password_service,
+        token_service,
+        login_recorder,
+        unit_of_work,
+    )
 
 
 def get_refresh_token_use_case(  # PASO 6: Added
     user_repository: UserRepositoryInterface = Depends(get_user_repository),
     refresh_token_repository: RefreshTokenRepositoryInterface = Depends(get_refresh_token_repository),
-    token_service: TokenServiceInterface = Depends(get_token_service)
+    token_service: TokenServiceInterface = Depends(get_token_service),
+    unit_of_work: UnitOfWorkInterface = Depends(get_unit_of_work),
 ) -> RefreshTokenUseCase:  # PASO 6: Added
     """Get refresh token use case instance."""
-    return RefreshTokenUseCase(user_repository, refresh_token_repository, token_service)  # PASO 6: Added
+    return RefreshTokenUseCase(user_repository, refresh_token_repository, token_service, unit_of_work)  # PASO 6: Added
 
 
 def get_logout_use_case(
@@ -117,20 +283,27 @@ def get_validate_token_use_case(
 def get_change_password_use_case(
     user_repository: UserRepositoryInterface = Depends(get_user_repository),
     password_service: PasswordServiceInterface = Depends(get_password_service),
-    email_service: EmailServiceInterface = Depends(get_email_service)
+    email_service: EmailServiceInterface = Depends(get_email_service),
+    principal_cache: Optional[PrincipalCacheInterface] = Depends(get_principal_cache),
+    unit_of_work: UnitOfWorkInterface = Depends(get_unit_of_work),
+    list_cache: Optional[UserListCacheInterface] = Depends(get_user_list_cache),
 ) -> ChangePasswordUseCase:
     """Get change password use case instance."""
-    return ChangePasswordUseCase(user_repository, password_service, email_service)
+    return ChangePasswordUseCase(
+        user_repository, password_service, email_service, principal_cache, unit_of_work, list_cache
+    )
 
 
 # Use case dependencies - User Management
 def get_create_user_use_case(
     user_repository: UserRepositoryInterface = Depends(get_user_repository),
     password_service: PasswordServiceInterface = Depends(get_password_service),
-    email_service: EmailServiceInterface = Depends(get_email_service)
+    email_service: EmailServiceInterface = Depends(get_email_service),
+    list_cache: Optional[UserListCacheInterface] = Depends(get_user_list_cache),
+    unit_of_work: UnitOfWorkInterface = Depends(get_unit_of_work),
 ) -> CreateUserUseCase:
     """Get create user use case instance."""
-    return CreateUserUseCase(user_repository, password_service, email_service)
+    return CreateUserUseCase(user_repository, password_service, email_service, list_cache, unit_of_work)
 
 
 def get_get_user_by_id_use_case(
@@ -141,32 +314,42 @@ def get_get_user_by_id_use_case(
 
 
 def get_update_user_use_case(
-    user_repository: UserRepositoryInterface = Depends(get_user_repository)
+    user_repository: UserRepositoryInterface = Depends(get_user_repository),
+    principal_cache: Optional[PrincipalCacheInterface] = Depends(get_principal_cache),
+    unit_of_work: UnitOfWorkInterface = Depends(get_unit_of_work),
+    list_cache: Optional[UserListCacheInterface] = Depends(get_user_list_cache),
 ) -> UpdateUserUseCase:
     """Get update user use case instance."""
-    return UpdateUserUseCase(user_repository)
+    return UpdateUserUseCase(user_repository, principal_cache, unit_of_work, list_cache)
 
 
 def get_activate_user_use_case(
-    user_repository: UserRepositoryInterface = Depends(get_user_repository)
+    user_repository: UserRepositoryInterface = Depends(get_user_repository),
+    principal_cache: Optional[PrincipalCacheInterface] = Depends(get_principal_cache),
+    unit_of_work: UnitOfWorkInterface = Depends(get_unit_of_work),
+    list_cache: Optional[UserListCacheInterface] = Depends(get_user_list_cache),
 ) -> ActivateUserUseCase:
     """Get activate user use case instance."""
-    return ActivateUserUseCase(user_repository)
+    return ActivateUserUseCase(user_repository, principal_cache, unit_of_work, list_cache)
 
 
 def get_deactivate_user_use_case(
     user_repository: UserRepositoryInterface = Depends(get_user_repository),
-    email_service: EmailServiceInterface = Depends(get_email_service)
+    email_service: EmailServiceInterface = Depends(get_email_service),
+    principal_cache: Optional[PrincipalCacheInterface] = Depends(get_principal_cache),
+    unit_of_work: UnitOfWorkInterface = Depends(get_unit_of_work),
+    list_cache: Optional[UserListCacheInterface] = Depends(get_user_list_cache),
 ) -> DeactivateUserUseCase:
     """Get deactivate user use case instance."""
-    return DeactivateUserUseCase(user_repository, email_service)
+    return DeactivateUserUseCase(user_repository, email_service, principal_cache, unit_of_work, list_cache)
 
 
 def get_list_users_use_case(
-    user_repository: UserRepositoryInterface = Depends(get_user_repository)
+    user_repository: UserRepositoryInterface = Depends(get_user_repository),
+    list_cache: Optional[UserListCacheInterface] = Depends(get_user_list_cache),
 ) -> ListUsersUseCase:
     """Get list users use case instance."""
-    return ListUsersUseCase(user_repository)
+    return ListUsersUseCase(user_repository, list_cache)
 
 
 # PASO 4: Dependencias para casos de uso de administración avanzada
@@ -181,52 +364,126 @@ def get_get_user_detail_use_case(
 def get_admin_update_user_use_case(
     user_repository: UserRepositoryInterface = Depends(get_user_repository),
     password_service: PasswordServiceInterface = Depends(get_password_service),
-    email_service: EmailServiceInterface = Depends(get_email_service)
+    email_service: EmailServiceInterface = Depends(get_email_service),
+    principal_cache: Optional[PrincipalCacheInterface] = Depends(get_principal_cache),
+    unit_of_work: UnitOfWorkInterface = Depends(get_unit_of_work),
+    list_cache: Optional[UserListCacheInterface] = Depends(get_user_list_cache),
 ) -> AdminUpdateUserUseCase:
     """Get admin update user use case instance."""
-    return AdminUpdateUserUseCase(user_repository, password_service, email_service)
+    return AdminUpdateUserUseCase(
+        user_repository, password_service, email_service, principal_cache, unit_of_work, list_cache
+    )
 
 
 def get_delete_user_use_case(
     user_repository: UserRepositoryInterface = Depends(get_user_repository),
-    email_service: EmailServiceInterface = Depends(get_email_service)
+    email_service: EmailServiceInterface = Depends(get_email_service),
+    principal_cache: Optional[PrincipalCacheInterface] = Depends(get_principal_cache),
+    unit_of_work: UnitOfWorkInterface = Depends(get_unit_of_work),
+    list_cache: Optional[UserListCacheInterface] = Depends(get_user_list_cache),
 ) -> DeleteUserUseCase:
     """Get delete user use case instance."""
-    return DeleteUserUseCase(user_repository, email_service)
+    return DeleteUserUseCase(user_repository, email_service, principal_cache, unit_of_work, list_cache)
 
 
 def get_bulk_upload_users_use_case(
     user_repository: UserRepositoryInterface = Depends(get_user_repository),
     password_service: PasswordServiceInterface = Depends(get_password_service),
-    email_service: EmailServiceInterface = Depends(get_email_service)
+    email_service: EmailServiceInterface = Depends(get_email_service),
+    list_cache: Optional[UserListCacheInterface] = Depends(get_user_list_cache),
+    unit_of_work: UnitOfWorkInterface = Depends(get_unit_of_work),
+    principal_cache: Optional[PrincipalCacheInterface] = Depends(get_principal_cache),
 ) -> BulkUploadUsersUseCase:
     """Get bulk upload users use case instance."""
-    return BulkUploadUsersUseCase(user_repository, password_service, email_service)
+    return BulkUploadUsersUseCase(
+        user_repository,
+        password_service,
+        email_service,
+        list_cache,
+        unit_of_work,
+        principal_cache,
+        defer_password_hash=settings.BULK_UPLOAD_DEFER_PASSWORD_HASH,
+        chunk_size=settings.BULK_UPLOAD_CHUNK_SIZE,
+        update_existing_fields=settings.BULK_UPLOAD_UPDATE_EXISTING_FIELDS,
+        max_reported_rows=settings.BULK_UPLOAD_MAX_REPORTED_ROWS,
+    )
+
+
+def _bulk_upload_use_case_for_session(session: AsyncSession) -> BulkUploadUsersUseCase:
+    """Bulk upload use case of a background job, writing through the job's own session."""
+    return BulkUploadUsersUseCase(
+        SQLAlchemyUserRepository(session),
+        get_password_service(),
+        get_email_service(),
+        get_user_list_cache(),
+        SQLAlchemyUnitOfWork(session),
+        get_principal_cache(),
+        defer_password_hash=settings.BULK_UPLOAD_DEFER_PASSWORD_HASH,
+        chunk_size=settings.BULK_UPLOAD_CHUNK_SIZE,
+        update_existing_fields=settings.BULK_UPLOAD_UPDATE_EXISTING_FIELDS,
+        max_reported_rows=settings.BULK_UPLOAD_MAX_REPORTED_ROWS,
+    )
+
+
+@lru_cache()
+def get_bulk_upload_job_worker() -> BulkUploadJobWorker:
+    """Get the in-process worker running background bulk uploads."""
+    return BulkUploadJobWorker(
+        database_config.async_session_maker,
+        _bulk_upload_use_case_for_session,
+        settings.BULK_UPLOAD_JOB_DIR,
+        workers=settings.BULK_UPLOAD_JOB_WORKERS,
+        lease_seconds=settings.BULK_UPLOAD_JOB_LEASE_SECONDS,
+    )
+
+
+def get_bulk_upload_job_queue() -> BulkUploadJobQueueInterface:
+    """Get the queue of background bulk uploads."""
+    return get_bulk_upload_job_worker()
+
+
+def get_start_bulk_upload_job_use_case(
+    job_queue: BulkUploadJobQueueInterface = Depends(get_bulk_upload_job_queue),
+) -> StartBulkUploadJobUseCase:
+    """Get start bulk upload job use case instance."""
+    return StartBulkUploadJobUseCase(job_queue)
+
+
+def get_get_bulk_upload_job_use_case(
+    job_repository: BulkUploadJobRepositoryInterface = Depends(get_bulk_upload_job_repository),
+) -> GetBulkUploadJobUseCase:
+    """Get bulk upload job status use case instance."""
+    return GetBulkUploadJobUseCase(job_repository)
 
 
 # PASO 5: Dependencias para funcionalidades de autenticación críticas
 
 def get_forgot_password_use_case(
     user_repository: UserRepositoryInterface = Depends(get_user_repository),
-    email_service: EmailServiceInterface = Depends(get_email_service)
+    email_service: EmailServiceInterface = Depends(get_email_service),
+    unit_of_work: UnitOfWorkInterface = Depends(get_unit_of_work),
 ) -> ForgotPasswordUseCase:
     """Get forgot password use case instance."""
-    return ForgotPasswordUseCase(user_repository, email_service)
+    return ForgotPasswordUseCase(user_repository, email_service, unit_of_work)
 
 
 def get_reset_password_use_case(
     user_repository: UserRepositoryInterface = Depends(get_user_repository),
     password_service: PasswordServiceInterface = Depends(get_password_service),
-    token_service: TokenServiceInterface = Depends(get_token_service)
+    token_service: TokenServiceInterface = Depends(get_token_service),
+    principal_cache: Optional[PrincipalCacheInterface] = Depends(get_principal_cache),
+    unit_of_work: UnitOfWorkInterface = Depends(get_unit_of_work),
 ) -> ResetPasswordUseCase:
     """Get reset password use case instance."""
-    return ResetPasswordUseCase(user_repository, password_service, token_service)
+    return ResetPasswordUseCase(user_repository, password_service, token_service, principal_cache, unit_of_work)
 
 
 def get_force_change_password_use_case(
     user_repository: UserRepositoryInterface = Depends(get_user_repository),
     password_service: PasswordServiceInterface = Depends(get_password_service),
-    token_service: TokenServiceInterface = Depends(get_token_service)
+    token_service: TokenServiceInterface = Depends(get_token_service),
+    principal_cache: Optional[PrincipalCacheInterface] = Depends(get_principal_cache),
+    unit_of_work: UnitOfWorkInterface = Depends(get_unit_of_work),
 ) -> ForceChangePasswordUseCase:
     """Get force change password use case instance."""
-    return ForceChangePasswordUseCase(user_repository, password_service, token_service)
+    return ForceChangePasswordUseCase(user_repository, password_service, token_service, principal_cache, unit_of_work)
@@ -1,6 +1,6 @@
 """Domain layer for user service."""
 
-from .entities import User, UserRole, RefreshToken
+from .entities import User, UserRole, RefreshToken, BulkUploadJob, BulkUploadJobStatus, DEFERRED_PASSWORD_HASH
 from .value_objects import Email, DocumentNumber, DocumentType
 from .exceptions import (
     UserDomainException,
@@ -14,14 +14,28 @@ from .exceptions import (
     UserSessionError,
     InvalidTokenError,
     WeakPasswordError,
+    InvalidCursorError,
+    PasswordHashingOverloadedError,
+    BulkUploadJobNotFoundError,
+)
+from .repositories import (
+    UserRepositoryInterface,
+    RefreshTokenRepositoryInterface,
+    BulkUploadJobRepositoryInterface,
+    UnitOfWorkInterface,
+    CountMode,
+    UserImportOutcome,
+    UserImportResult,
 )
-from .repositories import UserRepositoryInterface, RefreshTokenRepositoryInterface
 
 __all__ = [
     # Entities
     "User",
     "UserRole",
     "RefreshToken",
+    "BulkUploadJob",
+    "BulkUploadJobStatus",
+    "DEFERRED_PASSWORD_HASH",
     # Value Objects
     "Email",
     "DocumentNumber",
@@ -38,7 +52,15 @@ __all__ = [
     "UserSessionError",
     "InvalidTokenError",
     "WeakPasswordError",
+    "InvalidCursorError",
+    "PasswordHashingOverloadedError",
+    "BulkUploadJobNotFoundError",
     # Repositories
     "UserRepositoryInterface",
     "RefreshTokenRepositoryInterface",
+    "BulkUploadJobRepositoryInterface",
+    "UnitOfWorkInterface",
+    "CountMode",
+    "UserImportOutcome",
+    "UserImportResult",
 ]
@@ -1,10 +1,14 @@
 """Domain entities module."""
 
-from .user_entity import User, UserRole
+from .user_entity import User, UserRole, DEFERRED_PASSWORD_HASH
 from .refresh_token_entity import RefreshToken
+from .bulk_upload_job_entity import BulkUploadJob, BulkUploadJobStatus
 
 __all__ = [
     "User",
     "UserRole",
     "RefreshToken",
+    "BulkUploadJob",
+    "BulkUploadJobStatus",
+    "DEFERRED_PASSWORD_HASH",
 ]
@@ -0,0 +1,67 @@
+"""Bulk upload job domain entity."""
+
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+
+
+class BulkUploadJobStatus(str, Enum):
+    """Lifecycle of a bulk upload job."""
+    
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass
+class BulkUploadJob:
+    """
+    A bulk upload processed in the background.
+    
+    ``rows_processed`` counts the CSV rows whose outcome has been committed,
+    so an interrupted job resumes after that row. A running job belongs to
+    the worker named ``owner`` until ``lease_until``; once the lease has
+    expired, another worker may claim the job.
+    """
+    
+    filename: str
+    created_by: uuid.UUID
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
+    status: BulkUploadJobStatus = BulkUploadJobStatus.PENDING
+    rows_processed: int = 0
+    successful: int = 0
+    failed: int = 0
+    errors: list[dict] = field(default_factory=list)
+    error_message: str | None = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    updated_at: datetime = field(default_factory=datetime.utcnow)
+    finished_at: datetime | None = None
+    owner: str | None = None
+    lease_until: datetime | None = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (BulkUploadJobStatus.COMPLETED, BulkUploadJobStatus.FAILED)
+
+    def record_progress(self, rows_processed: int, successful: int, failed: int, new_errors: list[dict]):
+        """Record the totals after a committed chunk and the row errors found since the last one."""
+        self.rows_processed = rows_processed
+        self.successful = successful
+        self.failed = failed
+        self.errors = self.errors + list(new_errors)
+        self.updated_at = datetime.utcnow()
+
+    def complete(self):
+        self.status = BulkUploadJobStatus.COMPLETED
+        self.lease_until = None
+        self.finished_at = datetime.utcnow()
+        self.updated_at = self.finished_at
+
+    def fail(self, reason: str):
+        self.status = BulkUploadJobStatus.FAILED
+        self.error_message = reason
+        self.lease_until = None
+        self.finished_at = datetime.utcnow()
+        self.updated_at = self.finished_at
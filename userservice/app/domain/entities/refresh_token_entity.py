@@ -11,6 +11,8 @@ from ..exceptions.user_exceptions import InvalidTokenError
 class RefreshToken:
     """Refresh token domain entity for JWT token management."""
     
+    DEFAULT_EXPIRES_IN_DAYS = 30
+    
     def __init__(
         self,
         token: str,
@@ -20,7 +22,8 @@ class RefreshToken:
         id: Optional[UUID] = None,
         created_at: Optional[datetime] = None,
         is_active: bool = True,
-        last_used_at: Optional[datetime] = None
+        last_used_at: Optional[datetime] = None,
+        family_id: Optional[UUID] = None
     ):
         self._id = id or uuid4()
         self._token = token
@@ -30,6 +33,8 @@ class RefreshToken:
         self._created_at = created_at or datetime.now(timezone.utc)
         self._is_active = is_active
         self._last_used_at = last_used_at
+        # Tokens rotated from the same login share a family (the first token's id)
+        self._family_id = family_id or self._id
     
     @property
     def id(self) -> UUID:
@@ -71,6 +76,11 @@ class RefreshToken:
         """Get last usage datetime."""
         return self._last_used_at
     
+    @property
+    def family_id(self) -> UUID:
+        """Get the rotation family this token belongs to."""
+        return self._family_id
+    
     def is_valid(self) -> bool:
         """Check if refresh token is valid and not expired."""
         now = datetime.now(timezone.utc)
@@ -99,30 +109,41 @@ class RefreshToken:
         if self.is_expired():
             raise InvalidTokenError("Refresh token has expired")
     
+    @staticmethod
+    def generate_token() -> str:
+        """Generate a new random token value."""
+        return secrets.token_urlsafe(64)  # 512-bit token
+    
+    @classmethod
+    def default_expires_at(cls, expires_in_days: Optional[int] = None) -> datetime:
+        """Expiration datetime for a token issued now."""
+        days = cls.DEFAULT_EXPIRES_IN_DAYS if expires_in_days is None else expires_in_days
+        return datetime.now(timezone.utc) + timedelta(days=days)
+    
     @classmethod
     def create_for_user(
         cls,
         user_id: UUID,
         device_info: Optional[str] = None,
-        expires_in_days: int = 30
+        expires_in_days: int = DEFAULT_EXPIRES_IN_DAYS,
+        family_id: Optional[UUID] = None
     ) -> "RefreshToken":
         """Create a new refresh token for a user."""
-        token = secrets.token_urlsafe(64)  # 512-bit token
-        expires_at = datetime.now(timezone.utc) + timedelta(days=expires_in_days)
-        
         return cls(
-            token=token,
+            token=cls.generate_token(),
             user_id=user_id,
-            expires_at=expires_at,
-            device_info=device_info
+            expires_at=cls.default_expires_at(expires_in_days),
+            device_info=device_info,
+            family_id=family_id
         )
     
     def rotate(self, device_info: Optional[str] = None) -> "RefreshToken":
-        """Create a new refresh token and revoke current one."""
+        """Create a new refresh token in the same family and revoke current one."""
         self.revoke()
         return self.create_for_user(
             user_id=self._user_id,
-            device_info=device_info or self._device_info
+            device_info=device_info or self._device_info,
+            family_id=self._family_id
         )
     
     def __eq__(self, other) -> bool:
@@ -1,5 +1,6 @@
+import hmac
 import uuid
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from enum import Enum
 
@@ -7,6 +8,10 @@ from ..value_objects import Email, DocumentNumber, DocumentType
 from ..value_objects.user_role import UserRole
 from ..exceptions import InvalidUserDataError
 
+# Stored instead of a hash while the initial password (the document number)
+# has not been hashed yet; it is hashed on the user's first successful login
+DEFERRED_PASSWORD_HASH = "!deferred:document_number"
+
 @dataclass
 class User:
     first_name: str
@@ -26,6 +31,17 @@ class User:
     # PASO 5: Password reset token support
     reset_password_token: str | None = None
     reset_password_token_expires_at: datetime | None = None
+    # Bumped whenever access tokens issued earlier must stop authorizing; the
+    # repository persists a bump as an SQL increment, never as this value
+    token_version: int = 0
+    # Fields assigned since the entity was loaded; None means unknown (write everything)
+    _changed_fields: set[str] | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        changed = self.__dict__.get("_changed_fields")
+        if changed is not None and name in _TRACKED_FIELDS and self.__dict__.get(name) != value:
+            changed.add(name)
+        super().__setattr__(name, value)
 
     def __post_init__(self):
         if not self.first_name or not self.first_name.strip():
@@ -40,6 +56,17 @@ class User:
             # For backward compatibility, assume CC if string is provided
             object.__setattr__(self, 'document_number', DocumentNumber(self.document_number, DocumentType.CC))
 
+    @property
+    def changed_fields(self) -> frozenset[str] | None:
+        """Fields changed since ``mark_clean``, or None if the entity was never loaded."""
+        if self._changed_fields is None:
+            return None
+        return frozenset(self._changed_fields)
+
+    def mark_clean(self):
+        """Start tracking changes from the current state (called after loading or saving)."""
+        object.__setattr__(self, '_changed_fields', set())
+
     def full_name(self) -> str:
         return f"{self.first_name} {self.last_name}"
 
@@ -58,22 +85,43 @@ class User:
             self.email = email
         self.updated_at = datetime.utcnow()
 
+    @property
+    def has_deferred_password(self) -> bool:
+        """Whether the initial password is still waiting to be hashed."""
+        return self.hashed_password == DEFERRED_PASSWORD_HASH
+
+    def matches_deferred_password(self, password: str) -> bool:
+        """Check a password against the not yet hashed initial password."""
+        return self.has_deferred_password and hmac.compare_digest(
+            password.encode(), self.document_number.value.encode()
+        )
+
     def change_password(self, new_hashed_password: str):
         self.hashed_password = new_hashed_password
         self.must_change_password = False
+        self.token_version += 1
         self.updated_at = datetime.utcnow()
 
+    def change_role(self, role: UserRole):
+        if role != self.role:
+            self.role = role
+            self.token_version += 1
+            self.updated_at = datetime.utcnow()
+
     def activate(self):
         self.is_active = True
         self.updated_at = datetime.utcnow()
 
     def deactivate(self):
+        if self.is_active:
+            self.token_version += 1
         self.is_active = False
         self.updated_at = datetime.utcnow()
     
     def soft_delete(self):
         """Mark user as deleted (soft delete)."""
         self.is_active = False
+        self.token_version += 1
         self.deleted_at = datetime.utcnow()
         self.updated_at = datetime.utcnow()
         
@@ -109,4 +157,11 @@ class User:
         """Force change password and update must_change_password flag."""
         self.hashed_password = new_hashed_password
         self.must_change_password = False
+        self.token_version += 1
         self.updated_at = datetime.utcnow()
+
+
+# Persistent fields whose assignment marks the entity as changed
+_TRACKED_FIELDS = frozenset(
+    f.name for f in fields(User) if f.name not in ("id", "created_at", "_changed_fields")
+)
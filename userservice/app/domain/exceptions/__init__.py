@@ -12,6 +12,9 @@ from .user_exceptions import (
     UserSessionError,
     InvalidTokenError,
     WeakPasswordError,
+    InvalidCursorError,
+    PasswordHashingOverloadedError,
+    BulkUploadJobNotFoundError,
 )
 
 __all__ = [
@@ -26,4 +29,7 @@ __all__ = [
     "UserSessionError",
     "InvalidTokenError",
     "WeakPasswordError",
+    "InvalidCursorError",
+    "PasswordHashingOverloadedError",
+    "BulkUploadJobNotFoundError",
 ]
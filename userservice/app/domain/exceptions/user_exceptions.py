@@ -107,4 +107,26 @@ class WeakPasswordError(UserDomainException):
     """Raised when password doesn't meet security requirements."""
     
     def __init__(self, reason: str = "Password is too weak"):
-        super().__init__(reason)
\ No newline at end of file
+        super().__init__(reason)
+
+
+class InvalidCursorError(UserDomainException):
+    """Raised when a pagination cursor cannot be decoded."""
+    
+    def __init__(self, reason: str = "Invalid pagination cursor"):
+        super().__init__(reason)
+
+
+class PasswordHashingOverloadedError(UserDomainException):
+    """Raised when the password hashing queue is full."""
+    
+    def __init__(self, reason: str = "Password hashing is overloaded, retry later"):
+        super().__init__(reason)
+
+
+class BulkUploadJobNotFoundError(UserDomainException):
+    """Raised when a bulk upload job is not found."""
+    
+    def __init__(self, job_id: str):
+        message = f"Bulk upload job not found with id: {job_id}"
+        super().__init__(message)
@@ -1,9 +1,16 @@
 """Domain repositories module."""
 
-from .user_repository_interface import UserRepositoryInterface
+from .user_repository_interface import UserRepositoryInterface, CountMode, UserImportOutcome, UserImportResult
 from .refresh_token_repository_interface import RefreshTokenRepositoryInterface
+from .bulk_upload_job_repository_interface import BulkUploadJobRepositoryInterface
+from .unit_of_work_interface import UnitOfWorkInterface
 
 __all__ = [
     "UserRepositoryInterface",
+    "CountMode",
+    "UserImportOutcome",
+    "UserImportResult",
     "RefreshTokenRepositoryInterface",
+    "BulkUploadJobRepositoryInterface",
+    "UnitOfWorkInterface",
 ]
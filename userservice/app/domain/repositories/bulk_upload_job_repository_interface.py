@@ -0,0 +1,52 @@
+"""Bulk upload job repository interface."""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from ..entities.bulk_upload_job_entity import BulkUploadJob
+
+
+class BulkUploadJobRepositoryInterface(ABC):
+    """Interface for bulk upload job repository operations."""
+    
+    @abstractmethod
+    async def create(self, job: BulkUploadJob) -> BulkUploadJob:
+        """Save a new job."""
+        pass
+    
+    @abstractmethod
+    async def get_by_id(self, job_id: UUID) -> Optional[BulkUploadJob]:
+        """Get a job by ID."""
+        pass
+    
+    @abstractmethod
+    async def update(self, job: BulkUploadJob) -> BulkUploadJob:
+        """Save the status and progress of a job."""
+        pass
+    
+    @abstractmethod
+    async def list_unfinished(self) -> List[BulkUploadJob]:
+        """Get pending and running jobs, oldest first."""
+        pass
+    
+    @abstractmethod
+    async def claim(self, job_id: UUID, owner: str, lease_until: datetime) -> Optional[BulkUploadJob]:
+        """
+        Atomically mark a job as running for ``owner`` until ``lease_until``.
+        
+        Only a pending job, or a running one whose lease has expired, can be
+        claimed; otherwise nothing changes and None is returned.
+        """
+        pass
+    
+    @abstractmethod
+    async def renew_lease(self, job_id: UUID, owner: str, lease_until: datetime) -> bool:
+        """Extend the lease of a running job; False when ``owner`` no longer holds it."""
+        pass
+    
+    @abstractmethod
+    async def release(self, job_id: UUID, owner: str) -> None:
+        """Let another worker claim a running job held by ``owner`` right away."""
+        pass
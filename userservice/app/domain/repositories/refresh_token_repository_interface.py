@@ -1,6 +1,7 @@
 """Refresh token repository interface."""
 
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
@@ -40,6 +41,22 @@ class RefreshTokenRepositoryInterface(ABC):
         """Revoke all refresh tokens for a user. Returns count of revoked tokens."""
         pass
     
+    @abstractmethod
+    async def rotate(self, token: str, new_token: str, new_expires_at: datetime) -> Optional[RefreshToken]:
+        """
+        Atomically revoke an active, unexpired token and issue its replacement.
+        
+        The replacement inherits the user, device and family of the old token.
+        Returns None when the token is unknown, revoked, already rotated or
+        expired, so only one of several concurrent rotations can succeed.
+        """
+        pass
+    
+    @abstractmethod
+    async def revoke_family(self, family_id: UUID) -> int:
+        """Revoke every active token of a rotation family. Returns count of revoked tokens."""
+        pass
+    
     @abstractmethod
     async def delete_expired_tokens(self) -> int:
         """Delete all expired tokens. Returns count of deleted tokens."""
@@ -0,0 +1,17 @@
+"""Unit of work interface."""
+
+from abc import ABC, abstractmethod
+
+
+class UnitOfWorkInterface(ABC):
+    """Interface for the transaction shared by the repositories of one request."""
+    
+    @abstractmethod
+    async def commit(self) -> None:
+        """Commit everything the repositories wrote in this unit of work."""
+        pass
+    
+    @abstractmethod
+    async def rollback(self) -> None:
+        """Discard everything the repositories wrote in this unit of work."""
+        pass
@@ -1,9 +1,34 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from datetime import datetime
+from enum import Enum
+from typing import NamedTuple, Optional, List, Sequence, Set, Tuple
 import uuid
 from ..entities.user_entity import User
 
 
+class CountMode(str, Enum):
+    """How the total of a user listing is computed."""
+    
+    EXACT = "exact"  # COUNT over the filtered rows
+    ESTIMATE = "estimate"  # Planner estimate where the database provides one
+    NONE = "none"  # Skip the total entirely
+
+
+class UserImportOutcome(str, Enum):
+    """What an import did with one user."""
+    
+    CREATED = "created"
+    UPDATED = "updated"  # Selected fields of the existing user were overwritten
+    SKIPPED = "skipped"  # Email or document number already taken
+
+
+class UserImportResult(NamedTuple):
+    """What an import did with one user, and which stored user it wrote."""
+    
+    outcome: UserImportOutcome
+    user_id: Optional[uuid.UUID] = None  # The existing user when UPDATED; None when SKIPPED
+
+
 class UserRepositoryInterface(ABC):
     """
     Repository interface for User entity.
@@ -26,6 +51,43 @@ class UserRepositoryInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    async def import_many(
+        self, users: Sequence[User], update_fields: Sequence[str] = ()
+    ) -> List[UserImportResult]:
+        """
+        Import users, resolving clashes with existing users set-wise.
+        
+        A user whose document number belongs to an existing user updates
+        ``update_fields`` of that user, unless its email belongs to another
+        one. Any other user whose email or document number is taken is skipped.
+        
+        Args:
+            users: User entities to import
+            update_fields: Entity fields to overwrite on existing users;
+                empty to skip every existing user
+            
+        Returns:
+            List[UserImportResult]: The outcome of each user, in order
+        """
+        pass
+
+    @abstractmethod
+    async def find_existing_identities(
+        self, emails: Sequence[str], document_numbers: Sequence[str]
+    ) -> Tuple[Set[str], Set[str]]:
+        """
+        Find which of the given emails and document numbers already belong to a user.
+        
+        Args:
+            emails: Normalized emails to look up
+            document_numbers: Normalized document numbers to look up
+            
+        Returns:
+            Tuple[Set[str], Set[str]]: The taken emails and the taken document numbers
+        """
+        pass
+
     @abstractmethod
     async def get_by_id(self, user_id: uuid.UUID) -> Optional[User]:
         """
@@ -39,6 +101,45 @@ class UserRepositoryInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_token_version(self, user_id: uuid.UUID) -> Optional[int]:
+        """
+        Retrieve the token version watermark of a user.
+        
+        Args:
+            user_id: UUID of the user
+            
+        Returns:
+            Optional[int]: Current token version, None if the user does not exist
+        """
+        pass
+
+    @abstractmethod
+    async def bump_token_version(self, user_id: uuid.UUID) -> Optional[int]:
+        """
+        Increment the token version watermark of a user in the database.
+        
+        Args:
+            user_id: UUID of the user
+            
+        Returns:
+            Optional[int]: New token version, None if the user does not exist
+        """
+        pass
+
+    @abstractmethod
+    async def get_updated_at(self, user_id: uuid.UUID) -> Optional[datetime]:
+        """
+        Retrieve only the last modification time of a user.
+        
+        Args:
+            user_id: UUID of the user
+            
+        Returns:
+            Optional[datetime]: updated_at of the user, None if the user does not exist
+        """
+        pass
+
     @abstractmethod
     async def get_by_email(self, email: str) -> Optional[User]:
         """
@@ -118,6 +219,61 @@ class UserRepositoryInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    async def list_users_after(
+        self,
+        after: Optional[Tuple[datetime, uuid.UUID]] = None,
+        limit: int = 10,
+        role: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        search_term: Optional[str] = None
+    ) -> List[User]:
+        """
+        List users with keyset (cursor) pagination, newest first.
+        
+        Args:
+            after: (created_at, id) of the last user of the previous page,
+                or None for the first page
+            limit: Maximum number of records to return
+            role: Filter by user role (optional)
+            is_active: Filter by active status (optional)
+            search_term: Search in name, email, or document (optional)
+            
+        Returns:
+            List[User]: Users ordered by (created_at, id) descending that
+            sort strictly after the given key
+        """
+        pass
+
+    @abstractmethod
+    async def list_users_with_total(
+        self,
+        offset: int = 0,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, uuid.UUID]] = None,
+        role: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        search_term: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT
+    ) -> Tuple[List[User], Optional[int]]:
+        """
+        List a page of users together with the total of the filtered set.
+        
+        Args:
+            offset: Number of records to skip (ignored when ``after`` is given)
+            limit: Maximum number of records to return
+            after: Keyset position to continue from (optional)
+            role: Filter by user role (optional)
+            is_active: Filter by active status (optional)
+            search_term: Search in name, email, or document (optional)
+            count_mode: Whether the total is exact, estimated or skipped
+            
+        Returns:
+            Tuple[List[User], Optional[int]]: The page of users and the total
+            (None when ``count_mode`` is NONE)
+        """
+        pass
+
     @abstractmethod
     async def count_users(
         self,
@@ -1,11 +1,29 @@
 """Infrastructure adapters module."""
 
 from .bcrypt_password_service import BcryptPasswordService
+from .password_hash_pool import PasswordHashPool
+from .breached_password_filter import BreachedPasswordFilter, build_breached_password_filter
 from .jwt_token_service import JWTTokenService
 from .smtp_email_service import SMTPEmailService
+from .write_behind_login_recorder import WriteBehindLoginRecorder
+from .principal_cache import InMemoryPrincipalCache, RedisPrincipalCache
+from .revocation_store import InMemoryRevocationStore, RedisRevocationStore
+from .user_list_cache import InMemoryUserListCache, RedisUserListCache
+from .bulk_upload_job_worker import BulkUploadJobWorker
 
 __all__ = [
     "BcryptPasswordService",
+    "PasswordHashPool",
+    "BreachedPasswordFilter",
+    "build_breached_password_filter",
     "JWTTokenService", 
     "SMTPEmailService",
+    "WriteBehindLoginRecorder",
+    "InMemoryPrincipalCache",
+    "RedisPrincipalCache",
+    "InMemoryRevocationStore",
+    "RedisRevocationStore",
+    "InMemoryUserListCache",
+    "RedisUserListCache",
+    "BulkUploadJobWorker",
 ]
@@ -1,18 +1,101 @@
 """Bcrypt password service implementation."""
 
+import asyncio
 import secrets
 import string
 import re
+import time
+from functools import lru_cache
+from typing import Optional
 from passlib.context import CryptContext
 
-from ...application.interfaces import PasswordServiceInterface
+from app.config import settings
+from ...application.interfaces import PasswordServiceInterface, HashPriority
+from .breached_password_filter import BreachedPasswordFilter
+from .password_hash_pool import PasswordHashPool
+
+_SPECIAL_CHARS = frozenset("!@#$%^&*()_+-=[]{};':\"\\|,.<>/?")
+
+# Common weak patterns, checked against the lowercased password
+_WEAK_PATTERN = re.compile(
+    r"(.)\1{2,}"                            # Three or more repeated characters
+    r"|123456|abcdef|qwerty"                # Sequential numbers, letters and keyboard rows
+    r"|^(?:password|admin|user|test)\d*$"   # Common words optionally followed by digits
+    r"|^\d+$"                               # Only digits
+)
+
+# Verification reads the cost from the stored hash, so one context serves every cost
+_verify_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+@lru_cache(maxsize=None)
+def _hashing_context(rounds: int) -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__default_rounds=rounds)
+
+
+def _hash_password(password: str, rounds: int) -> str:
+    """Hash at the given cost; runs in hashing worker processes."""
+    return _hashing_context(rounds).hash(password)
+
+
+def _verify_password(password: str, hashed_password: str) -> bool:
+    """Verify against any cost; runs in hashing worker processes."""
+    return _verify_context.verify(password, hashed_password)
+
+
+def calibrate_bcrypt_rounds(target_ms: float, min_rounds: int = 10, max_rounds: int = 16) -> int:
+    """
+    Highest bcrypt cost whose hash takes at most ``target_ms`` on this host.
+    
+    Each step up doubles the work, so costs are only measured while the
+    previous one predicts a fit; the result never goes below ``min_rounds``.
+    """
+    target = target_ms / 1000
+
+    def measure(rounds: int) -> float:
+        started = time.perf_counter()
+        _hash_password("calibration-password", rounds)
+        return time.perf_counter() - started
+
+    rounds = min_rounds
+    elapsed = measure(rounds)
+    while rounds < max_rounds and elapsed * 2 <= target:
+        elapsed = measure(rounds + 1)
+        if elapsed > target:
+            break
+        rounds += 1
+    return rounds
 
 
 class BcryptPasswordService(PasswordServiceInterface):
-    """Bcrypt implementation of PasswordServiceInterface."""
+    """
+    Bcrypt implementation of PasswordServiceInterface.
+    
+    The async methods run on ``hash_pool`` when one is given, otherwise on
+    a thread (bcrypt releases the GIL), so they never block the event loop.
+    New hashes use ``rounds`` (``PASSWORD_HASH_ROUNDS`` by default) and
+    ``needs_rehash`` flags stored hashes of any other cost, or only lower
+    ones with ``allow_higher_rounds`` so workers that calibrated to
+    different costs do not keep rehashing each other's hashes. Passwords
+    found in ``breached_filter`` fail ``validate_password_strength``.
+    """
     
-    def __init__(self):
-        self._pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    def __init__(
+        self,
+        hash_pool: Optional[PasswordHashPool] = None,
+        rounds: Optional[int] = None,
+        allow_higher_rounds: bool = False,
+        breached_filter: Optional[BreachedPasswordFilter] = None,
+    ):
+        self._rounds = rounds if rounds is not None else settings.PASSWORD_HASH_ROUNDS
+        cost_policy = {"bcrypt__min_rounds": self._rounds}
+        if not allow_higher_rounds:
+            cost_policy["bcrypt__max_rounds"] = self._rounds
+        self._pwd_context = CryptContext(
+            schemes=["bcrypt"], deprecated="auto", bcrypt__default_rounds=self._rounds, **cost_policy
+        )
+        self._hash_pool = hash_pool
+        self._breached_filter = breached_filter
         self._min_length = 8
         self._min_uppercase = 1
         self._min_lowercase = 1
@@ -27,6 +110,32 @@ class BcryptPasswordService(PasswordServiceInterface):
         """Verify a password against its hash."""
         return self._pwd_context.verify(password, hashed_password)
     
+    @property
+    def rounds(self) -> int:
+        """Bcrypt cost of new hashes."""
+        return self._rounds
+    
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Whether a stored hash was made with a cost outside the current policy."""
+        return self._pwd_context.needs_update(hashed_password)
+    
+    async def hash_password_async(self, password: str, priority: HashPriority = HashPriority.INTERACTIVE) -> str:
+        """Hash a password in a worker process (or thread) without blocking the event loop."""
+        if self._hash_pool is None:
+            return await asyncio.to_thread(_hash_password, password, self._rounds)
+        return await self._hash_pool.run(_hash_password, password, self._rounds, priority=priority)
+    
+    async def verify_password_async(
+        self,
+        password: str,
+        hashed_password: str,
+        priority: HashPriority = HashPriority.INTERACTIVE,
+    ) -> bool:
+        """Verify a password in a worker process (or thread) without blocking the event loop."""
+        if self._hash_pool is None:
+            return await asyncio.to_thread(_verify_password, password, hashed_password)
+        return await self._hash_pool.run(_verify_password, password, hashed_password, priority=priority)
+    
     def generate_temporary_password(self) -> str:
         """Generate a secure temporary password."""
         # Ensure at least one character from each required category
@@ -52,38 +161,30 @@ class BcryptPasswordService(PasswordServiceInterface):
         if not password or len(password) < self._min_length:
             return False
         
-        # Check for minimum uppercase letters
-        if len(re.findall(r'[A-Z]', password)) < self._min_uppercase:
-            return False
+        # Count every character class in a single pass
+        uppercase = lowercase = digits = special = 0
+        for char in password:
+            if "A" <= char <= "Z":
+                uppercase += 1
+            elif "a" <= char <= "z":
+                lowercase += 1
+            elif char.isdecimal():
+                digits += 1
+            elif char in _SPECIAL_CHARS:
+                special += 1
         
-        # Check for minimum lowercase letters
-        if len(re.findall(r'[a-z]', password)) < self._min_lowercase:
+        if (
+            uppercase < self._min_uppercase
+            or lowercase < self._min_lowercase
+            or digits < self._min_digits
+            or special < self._min_special_chars
+        ):
             return False
         
-        # Check for minimum digits
-        if len(re.findall(r'\d', password)) < self._min_digits:
+        if _WEAK_PATTERN.search(password.lower()):
             return False
         
-        # Check for minimum special characters
-        if len(re.findall(r'[!@#$%^&*()_+\-=\[\]{};\':"\\|,.<>\/?]', password)) < self._min_special_chars:
+        if self._breached_filter is not None and password in self._breached_filter:
             return False
         
-        # Check for common weak patterns
-        weak_patterns = [
-            r'(.)\1{2,}',        # Three or more repeated characters
-            r'123456',           # Sequential numbers
-            r'abcdef',           # Sequential letters
-            r'qwerty',           # Common keyboard patterns
-            r'^password\d*$',    # Starts with "password" optionally followed by digits
-            r'^admin\d*$',       # Starts with "admin" optionally followed by digits
-            r'^user\d*$',        # Starts with "user" optionally followed by digits
-            r'^test\d*$',        # Starts with "test" optionally followed by digits
-            r'^\d+$',            # Only digits
-        ]
-        
-        password_lower = password.lower()
-        for pattern in weak_patterns:
-            if re.search(pattern, password_lower):
-                return False
-        
         return True
@@ -0,0 +1,104 @@
+"""Memory-mapped Bloom filter of common and breached passwords."""
+
+import hashlib
+import math
+import mmap
+import os
+import struct
+from typing import Iterable, Iterator
+
+_MAGIC = b"UBPWBF01"
+# magic, bit count, hash count, entry count
+_HEADER = struct.Struct("<8sQIQ")
+
+
+def _normalize(password: str) -> bytes:
+    # Case-insensitive: "Password1!" is as guessable as "password1!"
+    return password.lower().encode("utf-8", "surrogatepass")
+
+
+def _positions(password: str, bit_count: int, hash_count: int) -> Iterator[int]:
+    digest = hashlib.blake2b(_normalize(password), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "little")
+    h2 = int.from_bytes(digest[8:], "little") | 1
+    for i in range(hash_count):
+        yield (h1 + i * h2) % bit_count
+
+
+def build_breached_password_filter(
+    passwords: Iterable[str],
+    path: str,
+    capacity: int,
+    error_rate: float = 0.001,
+) -> int:
+    """
+    Write a filter file for ``capacity`` passwords and return how many were added.
+
+    The file is written next to ``path`` and renamed over it, so a running
+    service never maps a half-written filter.
+    """
+    capacity = max(1, capacity)
+    bit_count = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+    hash_count = max(1, round(bit_count / capacity * math.log(2)))
+    bits = bytearray((bit_count + 7) // 8)
+    count = 0
+    for password in passwords:
+        if not password:
+            continue
+        for position in _positions(password, bit_count, hash_count):
+            bits[position >> 3] |= 1 << (position & 7)
+        count += 1
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, bit_count, hash_count, count))
+        f.write(bits)
+    os.replace(tmp_path, path)
+    return count
+
+
+class BreachedPasswordFilter:
+    """
+    Read-only view of a filter file built by ``build_breached_password_filter``.
+
+    The bit array is memory-mapped, so pages are shared with the page cache
+    and every worker process instead of being copied into each one, and a
+    lookup touches ``hash_count`` bytes. ``password in filter`` is False only
+    for passwords that were never added; a True answer may be a false
+    positive, i.e. a rare strong password rejected as common.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._mmap) < _HEADER.size:
+                raise ValueError(f"{path} is not a breached password filter")
+            magic, self.bit_count, self.hash_count, self.count = _HEADER.unpack_from(self._mmap)
+            if magic != _MAGIC or len(self._mmap) < _HEADER.size + (self.bit_count + 7) // 8:
+                raise ValueError(f"{path} is not a breached password filter")
+        except Exception:
+            self._mmap.close()
+            raise
+        self.path = path
+
+    def __contains__(self, password: str) -> bool:
+        bits, offset = self._mmap, _HEADER.size
+        return all(
+            bits[offset + (position >> 3)] & (1 << (position & 7))
+            for position in _positions(password, self.bit_count, self.hash_count)
+        )
+
+    def close(self) -> None:
+        """Unmap the filter file."""
+        self._mmap.close()
+
+    def stats(self) -> dict:
+        """Size and expected false positive rate of the filter."""
+        return {
+            "path": self.path,
+            "entries": self.count,
+            "bits": self.bit_count,
+            "hashes": self.hash_count,
+            "false_positive_rate": (1 - math.exp(-self.hash_count * self.count / self.bit_count)) ** self.hash_count,
+        }
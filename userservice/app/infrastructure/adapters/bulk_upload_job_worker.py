@@ -0,0 +1,231 @@
+"""In-process background worker for bulk upload jobs."""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import AsyncIterable, AsyncIterator, Callable, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ...application.dtos import BulkUploadProgressDTO
+from ...application.interfaces import BulkUploadJobQueueInterface
+from ...application.use_cases.user_use_cases import BulkUploadUsersUseCase
+from ...domain import BulkUploadJob
+from ..repositories.sqlalchemy_bulk_upload_job_repository import SQLAlchemyBulkUploadJobRepository
+
+logger = logging.getLogger(__name__)
+
+_READ_CHUNK_BYTES = 64 * 1024
+
+
+class _LeaseLost(Exception):
+    """The job was claimed by another worker after this one's lease expired."""
+
+
+class BulkUploadJobWorker(BulkUploadJobQueueInterface):
+    """
+    Runs bulk uploads on ``workers`` asyncio tasks of the serving process.
+
+    Uploads are spooled to ``spool_dir`` before the job is queued, and the
+    job's progress is committed in the same transaction as the users of each
+    chunk. A file that cannot be read to the end fails its job once the rows
+    before the error are saved.
+    
+    Several server processes may share the jobs table and the spool
+    directory: a job is claimed in the database before it runs and its
+    lease of ``lease_seconds`` is renewed with every chunk, so only one
+    worker runs it at a time. Unfinished jobs are queued by ``start()`` and
+    every ``lease_seconds`` afterwards; a job left running by a stopped
+    worker is released right away, one whose worker died is claimed once
+    its lease expires, and either resumes after the rows it had committed.
+    The spool directory must survive restarts.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        use_case_factory: Callable[[AsyncSession], BulkUploadUsersUseCase],
+        spool_dir: str,
+        workers: int = 1,
+        lease_seconds: float = 300,
+    ):
+        self._session_maker = session_maker
+        self._use_case_factory = use_case_factory
+        self._spool_dir = spool_dir
+        self._workers = max(1, workers)
+        self._lease = timedelta(seconds=lease_seconds)
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._queue: asyncio.Queue[UUID] = asyncio.Queue()
+        self._queued: Set[UUID] = set()
+        self._tasks: List[asyncio.Task] = []
+
+    def _spool_path(self, job_id: UUID) -> str:
+        return os.path.join(self._spool_dir, f"{job_id}.csv")
+
+    async def submit(self, chunks: AsyncIterable[bytes], filename: str, created_by: UUID) -> BulkUploadJob:
+        """Spool the upload to disk, save the pending job and queue it."""
+        job = BulkUploadJob(filename=filename, created_by=created_by)
+        path = self._spool_path(job.id)
+        partial_path = path + ".part"
+        os.makedirs(self._spool_dir, exist_ok=True)
+        try:
+            with open(partial_path, "wb") as spool:
+                async for chunk in chunks:
+                    await asyncio.to_thread(spool.write, chunk)
+            os.replace(partial_path, path)
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+
+        async with self._session_maker() as session:
+            await SQLAlchemyBulkUploadJobRepository(session).create(job)
+            await session.commit()
+        self._enqueue(job.id)
+        return job
+    
+    def _enqueue(self, job_id: UUID) -> None:
+        if job_id not in self._queued:
+            self._queued.add(job_id)
+            self._queue.put_nowait(job_id)
+
+    async def start(self) -> None:
+        """Queue the unfinished jobs and start the worker tasks."""
+        if self._tasks:
+            return
+        await self._queue_unfinished()
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self._workers)]
+        self._tasks.append(asyncio.create_task(self._requeue_periodically()))
+    
+    async def _queue_unfinished(self) -> None:
+        """Queue pending and running jobs; those held by a live worker are skipped when claimed."""
+        try:
+            async with self._session_maker() as session:
+                unfinished = await SQLAlchemyBulkUploadJobRepository(session).list_unfinished()
+        except Exception:
+            logger.exception("Cannot look up unfinished bulk upload jobs; none are resumed")
+            return
+        for job in unfinished:
+            if os.path.exists(self._spool_path(job.id)):
+                self._enqueue(job.id)
+            else:
+                logger.warning("Bulk upload job %s cannot resume: its upload is not in %s", job.id, self._spool_dir)
+    
+    async def _requeue_periodically(self) -> None:
+        # Picks up the jobs of workers that died without releasing them
+        while True:
+            await asyncio.sleep(self._lease.total_seconds())
+            await self._queue_unfinished()
+    
+    async def stop(self) -> None:
+        """Stop the worker tasks; a job cut short is released for the next worker to resume."""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    async def join(self) -> None:
+        """Wait until every queued job has finished."""
+        await self._queue.join()
+
+    async def _run(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            self._queued.discard(job_id)
+            try:
+                await self._run_job(job_id)
+            except Exception:
+                logger.exception("Bulk upload job %s could not be run", job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _read_spool(self, path: str) -> AsyncIterator[bytes]:
+        with open(path, "rb") as spool:
+            while chunk := await asyncio.to_thread(spool.read, _READ_CHUNK_BYTES):
+                yield chunk
+
+    def _lease_until(self) -> datetime:
+        return datetime.utcnow() + self._lease
+    
+    async def _run_job(self, job_id: UUID) -> None:
+        path = self._spool_path(job_id)
+        async with self._session_maker() as session:
+            job_repository = SQLAlchemyBulkUploadJobRepository(session)
+            job: Optional[BulkUploadJob] = await job_repository.claim(job_id, self._owner, self._lease_until())
+            await session.commit()
+            if job is None:
+                return  # Finished, or running on another worker
+            if job.rows_processed:
+                logger.info("Resuming bulk upload job %s after row %d", job.id, job.rows_processed)
+            
+            # Totals committed before an interruption; this run adds to them
+            base_rows, base_successful, base_failed = job.rows_processed, job.successful, job.failed
+            base_errors = job.errors
+            
+            async def renew_lease() -> None:
+                job.lease_until = self._lease_until()
+                if not await job_repository.renew_lease(job_id, self._owner, job.lease_until):
+                    raise _LeaseLost()
+            
+            async def progress(report: BulkUploadProgressDTO) -> None:
+                await renew_lease()
+                job.record_progress(
+                    base_rows + report.processed,
+                    base_successful + report.successful,
+                    base_failed + report.failed,
+                    report.errors,
+                )
+                await job_repository.update(job)
+                # Commits the chunk's users together with the progress that accounts for them
+                await session.commit()
+            
+            try:
+                result = await self._use_case_factory(session).execute_stream(
+                    self._read_spool(path), progress, skip_rows=base_rows
+                )
+                await renew_lease()
+                job.record_progress(
+                    base_rows + result.total_processed,
+                    base_successful + result.successful,
+                    base_failed + result.failed,
+                    [],
+                )
+                job.errors = base_errors + result.errors  # In row order
+                if result.stream_error is not None:
+                    # Resuming would stop at the same place, so the job ends here
+                    job.fail(result.stream_error)
+                else:
+                    job.complete()
+                await job_repository.update(job)
+                await session.commit()
+            except _LeaseLost:
+                # The uncommitted chunk is left to the worker that claimed the job
+                logger.warning("Bulk upload job %s was claimed by another worker; stopped", job_id)
+                await session.rollback()
+                return
+            except asyncio.CancelledError:
+                # Stopped: let the next worker resume the job without waiting for the lease
+                await session.rollback()
+                await job_repository.release(job_id, self._owner)
+                await session.commit()
+                raise
+            except Exception as e:
+                logger.exception("Bulk upload job %s failed", job_id)
+                await session.rollback()
+                if not await job_repository.renew_lease(job_id, self._owner, self._lease_until()):
+                    return
+                job = await job_repository.get_by_id(job_id)
+                job.fail(str(e))
+                await job_repository.update(job)
+                await session.commit()
+        
+        if os.path.exists(path):
+            os.remove(path)
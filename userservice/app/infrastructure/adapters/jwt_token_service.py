@@ -1,8 +1,11 @@
 """JWT token service implementation."""
 
+import hashlib
 import os
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Any, Set
+from typing import Dict, Any, Optional, Tuple
 from uuid import UUID
 
 import jwt
@@ -10,23 +13,61 @@ from jwt.exceptions import InvalidTokenError, ExpiredSignatureError
 
 from app.config import settings
 from app.application.interfaces.token_service_interface import TokenServiceInterface
+from app.application.interfaces.revocation_store_interface import RevocationStoreInterface
+from app.infrastructure.adapters.revocation_store import InMemoryRevocationStore
 from app.domain.exceptions.user_exceptions import InvalidTokenError as DomainInvalidTokenError
 
 
+def _token_digest(token: str) -> bytes:
+    """Cache key of a token, so raw bearer tokens are never kept in memory."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
 class JWTTokenService(TokenServiceInterface):
-    """JWT implementation of TokenServiceInterface."""
+    """
+    JWT implementation of TokenServiceInterface.
+    
+    Verified claims are kept in a bounded LRU keyed by a token digest until
+    the token's ``exp``, so repeated validations of the same bearer token
+    skip the signature check and JSON parsing.
+    """
     
-    def __init__(self):
+    def __init__(
+        self,
+        verified_cache_size: Optional[int] = None,
+        revocation_store: Optional[RevocationStoreInterface] = None,
+    ):
         self._secret_key = settings.JWT_SECRET_KEY
         self._algorithm = settings.JWT_ALGORITHM
         self._access_token_expire_minutes = settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES
         self._refresh_token_expire_days = settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS
         
-        # In production, this should be stored in Redis or a database
-        self._revoked_tokens: Set[str] = set()
+        # Revoked tokens and user-wide revocations, shared between workers with Redis
+        self._revocation_store = revocation_store or InMemoryRevocationStore()
+        
+        # digest -> (exp timestamp, claims); 0 disables the cache
+        if verified_cache_size is None:
+            verified_cache_size = settings.JWT_VERIFIED_CACHE_SIZE
+        self._verified_cache_size = verified_cache_size
+        self._verified: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.verified_cache_hits = 0
+        self.verified_cache_misses = 0
     
-    def create_access_token(self, user_id: UUID, role: str, expires_delta: int = None) -> str:
-        """Create an access token for a user."""
+    def create_access_token(
+        self,
+        user_id: UUID,
+        role: str,
+        expires_delta: int = None,
+        is_active: bool = True,
+        must_change_password: bool = False,
+        token_version: Optional[int] = None,
+    ) -> str:
+        """
+        Create an access token for a user.
+        
+        When ``token_version`` is given the token also carries the active flag
+        and ``must_change_password``, so role checks can skip loading the user.
+        """
         if expires_delta:
             expire = datetime.utcnow() + timedelta(minutes=expires_delta)
         else:
@@ -39,6 +80,12 @@ class JWTTokenService(TokenServiceInterface):
             "exp": expire,
             "iat": datetime.utcnow(),
         }
+        if token_version is not None:
+            to_encode.update(
+                active=is_active,
+                must_change_password=must_change_password,
+                token_version=token_version,
+            )
         
         encoded_jwt = jwt.encode(to_encode, self._secret_key, algorithm=self._algorithm)
         return encoded_jwt
@@ -59,13 +106,39 @@ class JWTTokenService(TokenServiceInterface):
     
     def decode_token(self, token: str) -> Dict[str, Any]:
         """Decode and validate a JWT token."""
+        if self._verified_cache_size:
+            key = _token_digest(token)
+            entry = self._verified.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if time.time() < expires_at:
+                    self._verified.move_to_end(key)
+                    self.verified_cache_hits += 1
+                    return dict(payload)
+                del self._verified[key]
+            self.verified_cache_misses += 1
+        
         try:
             payload = jwt.decode(token, self._secret_key, algorithms=[self._algorithm])
-            return payload
         except ExpiredSignatureError:
             raise InvalidTokenError("Token has expired")
         except InvalidTokenError as e:
             raise InvalidTokenError(f"Invalid token: {str(e)}")
+        
+        if self._verified_cache_size and isinstance(payload.get("exp"), (int, float)):
+            self._verified[key] = (payload["exp"], dict(payload))
+            if len(self._verified) > self._verified_cache_size:
+                self._verified.popitem(last=False)
+        return payload
+    
+    def get_verified_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of the verified-token cache."""
+        return {
+            "size": len(self._verified),
+            "max_size": self._verified_cache_size,
+            "hits": self.verified_cache_hits,
+            "misses": self.verified_cache_misses,
+        }
     
     def is_token_valid(self, token: str) -> bool:
         """Check if a token is valid and not expired."""
@@ -84,41 +157,54 @@ class JWTTokenService(TokenServiceInterface):
         
         return datetime.fromtimestamp(exp_timestamp)
     
-    def revoke_token(self, token: str) -> None:
-        """Revoke a token (add to blacklist)."""
-        # In production, store this in Redis with expiration
-        self._revoked_tokens.add(token)
+    async def revoke_token(self, token: str) -> None:
+        """Revoke a token until it expires."""
+        key = _token_digest(token)
+        self._verified.pop(key, None)
+        try:
+            exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+        except InvalidTokenError:
+            exp = None
+        if isinstance(exp, (int, float)):
+            ttl = exp - time.time()
+            if ttl <= 0:
+                # Already expired, nothing left to revoke
+                return
+        else:
+            ttl = self._access_token_expire_minutes * 60
+        await self._revocation_store.revoke(f"token:{key.hex()}", time.time(), ttl)
     
-    def is_token_revoked(self, token: str) -> bool:
+    async def is_token_revoked(self, token: str) -> bool:
         """Check if a token has been revoked."""
-        return token in self._revoked_tokens
+        return await self._revocation_store.get(f"token:{_token_digest(token).hex()}") is not None
     
-    def revoke_all_user_tokens(self, user_id: UUID, exclude_current: bool = False) -> None:
+    async def revoke_all_user_tokens(self, user_id: UUID) -> None:
         """
-        Revoke all tokens for a specific user.
-        
-        In a production environment, this would typically:
-        1. Update a blacklist in Redis/database with user_id and timestamp
-        2. When validating tokens, check if token.iat < blacklist.timestamp
+        Revoke all tokens issued to a user up to now.
         
-        For now, we'll use a simple in-memory approach.
+        Stores the revocation time (whole seconds, like ``iat``) for as long
+        as the longest-lived token could still be valid. Tokens issued in
+        the same second stay valid, so a login or refresh right after the
+        revocation works.
         """
-        # In production, this would be implemented with Redis:
-        # redis.set(f"user_blacklist:{user_id}", datetime.utcnow().timestamp())
-        # 
-        # For development, we'll track revoked user IDs with timestamps
-        if not hasattr(self, '_revoked_users'):
-            self._revoked_users = {}
-        
-        self._revoked_users[str(user_id)] = datetime.utcnow().timestamp()
+        ttl = max(self._access_token_expire_minutes * 60, self._refresh_token_expire_days * 86400)
+        await self._revocation_store.revoke(f"user:{user_id}", float(int(time.time())), ttl)
     
-    def is_user_token_revoked(self, user_id: UUID, token_issued_at: datetime) -> bool:
+    async def is_user_token_revoked(self, user_id: UUID, token_issued_at: datetime) -> bool:
         """Check if a user's token was revoked after it was issued."""
-        if not hasattr(self, '_revoked_users'):
-            return False
-            
-        user_blacklist_time = self._revoked_users.get(str(user_id))
-        if not user_blacklist_time:
+        revoked_at = await self._revocation_store.get(f"user:{user_id}")
+        if revoked_at is None:
             return False
-            
-        return token_issued_at.timestamp() < user_blacklist_time
+        return int(token_issued_at.timestamp()) < revoked_at
+    
+    def validate_refresh_token(self, refresh_token: str) -> Dict[str, Any]:
+        """Validate and decode a refresh token."""
+        payload = self.decode_token(refresh_token)
+        if payload.get("type") != "refresh":
+            raise InvalidTokenError("Token is not a refresh token")
+        return payload
+    
+    def get_user_id_from_refresh_token(self, refresh_token: str) -> UUID:
+        """Extract user ID from refresh token."""
+        payload = self.validate_refresh_token(refresh_token)
+        return UUID(payload["sub"])
@@ -0,0 +1,166 @@
+"""Bounded, prioritized process pool for password hashing."""
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+from ...application.interfaces import HashPriority
+from ...domain.exceptions import PasswordHashingOverloadedError
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHashPool:
+    """
+    Runs CPU-bound hashing jobs in worker processes, ``workers`` at a time.
+
+    Jobs wait in a priority queue in this process rather than in the
+    executor, so an interactive login submitted behind a bulk upload runs
+    next instead of last. At most ``max_queue`` jobs wait at once:
+    interactive jobs beyond that fail fast with
+    PasswordHashingOverloadedError, while batch jobs wait for room and may
+    only fill half the queue, keeping the rest for interactive requests.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 64, executor: Optional[Executor] = None):
+        self._workers = max(1, workers)
+        self._max_queue = max_queue
+        self._batch_limit = max(1, max_queue // 2)
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._room: Optional[asyncio.Condition] = None
+        self._dispatchers: List[asyncio.Task] = []
+        self._sequence = itertools.count()
+        self._queued = {priority: 0 for priority in HashPriority}
+        self._running = 0
+        self._metrics = {
+            priority: {
+                "submitted": 0,
+                "rejected": 0,
+                "started": 0,
+                "completed": 0,
+                "wait_seconds_total": 0.0,
+                "wait_seconds_max": 0.0,
+            }
+            for priority in HashPriority
+        }
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return sum(self._queued.values())
+
+    async def start(self) -> None:
+        """Start the worker processes and the dispatchers feeding them."""
+        if self._dispatchers:
+            return
+        if self._executor is None:
+            self._executor = self._create_executor()
+        self._queue = asyncio.PriorityQueue()
+        self._room = asyncio.Condition()
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self._workers)]
+
+    def _create_executor(self) -> Executor:
+        # Spawned workers do not inherit the event loop, sockets or threads of this process
+        return ProcessPoolExecutor(self._workers, mp_context=multiprocessing.get_context("spawn"))
+
+    async def stop(self) -> None:
+        """Stop dispatching, cancel the jobs still queued and shut the worker processes down."""
+        for task in self._dispatchers:
+            task.cancel()
+        for task in self._dispatchers:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._dispatchers = []
+        while self._queue is not None and not self._queue.empty():
+            priority, *_, future = self._queue.get_nowait()
+            self._queued[priority] -= 1
+            future.cancel()
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, fn: Callable[..., Any], *args: Any, priority: HashPriority = HashPriority.INTERACTIVE) -> Any:
+        """Run ``fn(*args)`` in a worker process once every job of higher priority has started."""
+        await self.start()
+        metrics = self._metrics[priority]
+        if priority is HashPriority.INTERACTIVE:
+            if self.queue_depth >= self._max_queue:
+                metrics["rejected"] += 1
+                raise PasswordHashingOverloadedError()
+        else:
+            async with self._room:
+                await self._room.wait_for(lambda: self.queue_depth < self._batch_limit)
+
+        future = asyncio.get_running_loop().create_future()
+        metrics["submitted"] += 1
+        self._queued[priority] += 1
+        self._queue.put_nowait((priority, next(self._sequence), time.monotonic(), fn, args, future))
+        return await future
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            priority, _, enqueued_at, fn, args, future = await self._queue.get()
+            self._queued[priority] -= 1
+            async with self._room:
+                self._room.notify_all()
+            if future.cancelled():
+                continue
+
+            waited = time.monotonic() - enqueued_at
+            metrics = self._metrics[priority]
+            metrics["started"] += 1
+            metrics["wait_seconds_total"] += waited
+            metrics["wait_seconds_max"] = max(metrics["wait_seconds_max"], waited)
+            self._running += 1
+            executor = self._executor
+            try:
+                result = await loop.run_in_executor(executor, fn, *args)
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+            except BrokenProcessPool as exc:
+                # A worker died (e.g. OOM-killed); fail this job and replace the pool
+                logger.error("Password hashing worker died, restarting the pool", exc_info=True)
+                if not future.done():
+                    future.set_exception(exc)
+                if self._owns_executor and self._executor is executor:
+                    self._executor = self._create_executor()
+                    executor.shutdown(wait=False, cancel_futures=True)
+            except Exception as exc:
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self._running -= 1
+                metrics["completed"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, running jobs and per-priority wait times."""
+        by_priority = {}
+        for priority in HashPriority:
+            metrics = self._metrics[priority]
+            by_priority[priority.name.lower()] = {
+                **metrics,
+                "queued": self._queued[priority],
+                "wait_seconds_avg": metrics["wait_seconds_total"] / metrics["started"] if metrics["started"] else 0.0,
+            }
+        return {
+            "workers": self._workers,
+            "max_queue": self._max_queue,
+            "queue_depth": self.queue_depth,
+            "running": self._running,
+            "priorities": by_priority,
+        }
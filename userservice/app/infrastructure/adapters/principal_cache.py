@@ -0,0 +1,280 @@
+"""Principal caches used to resolve the user of an access token."""
+
+import asyncio
+import json
+import logging
+import time
+from abc import abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from uuid import UUID
+
+from ...application.interfaces import PrincipalCacheInterface
+from ...domain.entities.user_entity import User
+from ...domain.value_objects import Email, DocumentNumber, DocumentType
+from ...domain.value_objects.user_role import UserRole
+
+logger = logging.getLogger(__name__)
+
+# A leader whose load failed; waiters then load on their own
+_LOAD_FAILED = object()
+
+# Entry kinds kept per user: the principal snapshot and the token version watermark
+_PRINCIPAL = "principal"
+_TOKEN_VERSION = "token-version"
+
+_DATETIME_FIELDS = ("created_at", "updated_at", "last_login_at", "deleted_at")
+
+
+def principal_to_dict(user: User) -> Dict[str, Any]:
+    """
+    Snapshot of the fields authorization and ``/auth/me`` need.
+
+    The password hash and reset token are left out so they never reach a
+    shared cache.
+    """
+    data = {
+        "id": str(user.id),
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "email": user.email.value,
+        "document_number": user.document_number.value,
+        "document_type": user.document_number.document_type.value,
+        "role": user.role.value,
+        "is_active": user.is_active,
+        "must_change_password": user.must_change_password,
+        "phone": user.phone,
+        "token_version": user.token_version,
+    }
+    for name in _DATETIME_FIELDS:
+        value = getattr(user, name)
+        data[name] = value.isoformat() if value is not None else None
+    return data
+
+
+def principal_from_dict(data: Dict[str, Any]) -> User:
+    """Rebuild a user from ``principal_to_dict``; it writes only what callers change."""
+    user = User(
+        id=UUID(data["id"]),
+        first_name=data["first_name"],
+        last_name=data["last_name"],
+        email=Email(data["email"]),
+        document_number=DocumentNumber(data["document_number"], DocumentType(data["document_type"])),
+        hashed_password="",
+        role=UserRole(data["role"]),
+        is_active=data["is_active"],
+        must_change_password=data["must_change_password"],
+        phone=data["phone"],
+        token_version=data.get("token_version", 0),
+        **{
+            name: datetime.fromisoformat(data[name]) if data[name] is not None else None
+            for name in _DATETIME_FIELDS
+        },
+    )
+    user.mark_clean()
+    return user
+
+
+class BasePrincipalCache(PrincipalCacheInterface):
+    """
+    Single-flight loading and counters shared by the cache backends.
+
+    Each user has two entries, the principal snapshot and the token version
+    watermark, dropped together by ``invalidate``. Concurrent misses for one
+    entry wait on the first request's load instead of all hitting the
+    database. An invalidation during a load keeps that load's result out of
+    the cache. Unknown users are never cached.
+    """
+
+    backend = "base"
+
+    def __init__(self, ttl_seconds: float = 30.0):
+        self._ttl = ttl_seconds
+        self._inflight: Dict[Tuple[str, UUID], asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    @abstractmethod
+    async def _get(self, key: Tuple[str, UUID]) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def _set(self, key: Tuple[str, UUID], data: Dict[str, Any]) -> None:
+        pass
+
+    @abstractmethod
+    async def _delete(self, *keys: Tuple[str, UUID]) -> None:
+        pass
+
+    async def get_or_load(
+        self,
+        user_id: UUID,
+        loader: Callable[[UUID], Awaitable[Optional[User]]],
+    ) -> Optional[User]:
+        """Return the cached user, or load it once and cache it."""
+        user, data = await self._get_or_load((_PRINCIPAL, user_id), loader, principal_to_dict)
+        if user is not None:
+            return user
+        return principal_from_dict(data) if data is not None else None
+
+    async def get_token_version(
+        self,
+        user_id: UUID,
+        loader: Callable[[UUID], Awaitable[Optional[int]]],
+    ) -> Optional[int]:
+        """Return the cached token version watermark, or load it once and cache it."""
+        _, data = await self._get_or_load(
+            (_TOKEN_VERSION, user_id), loader, lambda version: {"token_version": version}
+        )
+        return data["token_version"] if data is not None else None
+
+    async def _get_or_load(
+        self,
+        key: Tuple[str, UUID],
+        loader: Callable[[UUID], Awaitable[Any]],
+        encode: Callable[[Any], Dict[str, Any]],
+    ) -> Tuple[Any, Optional[Dict[str, Any]]]:
+        """Return ``(loaded value, data)``; the value is only set when this call loaded it."""
+        data = await self._get(key)
+        if data is not None:
+            self.hits += 1
+            return None, data
+        self.misses += 1
+
+        leader = self._inflight.get(key)
+        if leader is not None:
+            self.coalesced += 1
+            data = await asyncio.shield(leader)
+            if data is _LOAD_FAILED:
+                value = await loader(key[1])
+                return value, encode(value) if value is not None else None
+            return None, data
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        data = _LOAD_FAILED
+        try:
+            value = await loader(key[1])
+            data = encode(value) if value is not None else None
+            if data is not None and self._inflight.get(key) is future:
+                await self._set(key, data)
+                if self._inflight.get(key) is not future:
+                    # Invalidated while writing: do not leave the old row behind
+                    await self._delete(key)
+            return value, data
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            future.set_result(data)
+
+    async def invalidate(self, user_id: UUID) -> None:
+        """Drop the cached user and keep any load in progress from caching it."""
+        keys = ((_PRINCIPAL, user_id), (_TOKEN_VERSION, user_id))
+        for key in keys:
+            self._inflight.pop(key, None)
+        self.invalidations += 1
+        await self._delete(*keys)
+
+    def stats(self) -> dict:
+        """Hit/miss counters of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "ttl_seconds": self._ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+        }
+
+
+class InMemoryPrincipalCache(BasePrincipalCache):
+    """
+    Per-process LRU cache with a TTL.
+
+    Invalidations only reach this process, so with several workers a change
+    made through another worker is seen here once the entry expires; use the
+    Redis backend when that window matters.
+    """
+
+    backend = "memory"
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 10000):
+        super().__init__(ttl_seconds)
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, UUID], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    async def _get(self, key: Tuple[str, UUID]) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return data
+
+    async def _set(self, key: Tuple[str, UUID], data: Dict[str, Any]) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def _delete(self, *keys: Tuple[str, UUID]) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size of the cache."""
+        return {**super().stats(), "size": len(self._entries), "max_entries": self._max_entries}
+
+
+class RedisPrincipalCache(BasePrincipalCache):
+    """
+    Cache shared by every worker through Redis.
+
+    Entries expire through the key TTL and the size is bounded by the Redis
+    ``maxmemory`` policy. When Redis is unreachable lookups fall back to the
+    database and the failure is counted in ``errors``.
+    """
+
+    backend = "redis"
+
+    def __init__(self, redis, ttl_seconds: float = 30.0, key_prefix: str = "userservice:"):
+        super().__init__(ttl_seconds)
+        self._redis = redis
+        self._key_prefix = key_prefix
+
+    def _key(self, key: Tuple[str, UUID]) -> str:
+        kind, user_id = key
+        return f"{self._key_prefix}{kind}:{user_id}"
+
+    async def _get(self, key: Tuple[str, UUID]) -> Optional[Dict[str, Any]]:
+        try:
+            raw = await self._redis.get(self._key(key))
+        except Exception:
+            self.errors += 1
+            logger.warning("Principal cache read failed for %s", self._key(key), exc_info=True)
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    async def _set(self, key: Tuple[str, UUID], data: Dict[str, Any]) -> None:
+        try:
+            await self._redis.set(self._key(key), json.dumps(data), px=int(self._ttl * 1000))
+        except Exception:
+            self.errors += 1
+            logger.warning("Principal cache write failed for %s", self._key(key), exc_info=True)
+
+    async def _delete(self, *keys: Tuple[str, UUID]) -> None:
+        try:
+            await self._redis.delete(*(self._key(key) for key in keys))
+        except Exception:
+            self.errors += 1
+            logger.error("Principal cache invalidation failed for %s", keys[0][1], exc_info=True)
@@ -0,0 +1,248 @@
+"""Token revocation stores (in-memory and Redis with a Bloom filter front)."""
+
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+from ...application.interfaces import RevocationStoreInterface
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over string keys.
+
+    ``key in bloom`` is False only for keys that were never added; a True
+    answer may be a false positive (about ``error_rate`` at ``capacity``).
+    """
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.01):
+        self.capacity = capacity
+        self._size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray(self._size // 8 + 1)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self._hashes):
+            yield (h1 + i * h2) % self._size
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class InMemoryRevocationStore(RevocationStoreInterface):
+    """
+    Process-local revocation entries with expiry sweeps.
+
+    Expired entries are swept every ``sweep_interval_seconds``, by the
+    background task once started and otherwise on the next ``revoke``.
+    Revocations are not shared between workers.
+    """
+
+    def __init__(self, sweep_interval_seconds: float = 60.0):
+        self._entries: Dict[str, Tuple[float, float]] = {}
+        self._sweep_interval = sweep_interval_seconds
+        self._last_sweep = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def revoke(self, key: str, value: float, ttl_seconds: float) -> None:
+        """Store a revocation entry until it expires."""
+        if time.monotonic() - self._last_sweep >= self._sweep_interval:
+            self.sweep()
+        self._entries[key] = (time.time() + ttl_seconds, value)
+
+    async def get(self, key: str) -> Optional[float]:
+        """Value of a live revocation entry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        return value
+
+    def sweep(self) -> int:
+        """Drop expired entries, returning how many were removed."""
+        now = time.time()
+        expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        self._last_sweep = time.monotonic()
+        return len(expired)
+
+    async def start(self) -> None:
+        """Start the periodic sweep task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic sweep task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._sweep_interval)
+            self.sweep()
+
+    def stats(self) -> dict:
+        """Number of live and not yet swept entries."""
+        return {"entries": len(self._entries)}
+
+
+class RedisRevocationStore(RevocationStoreInterface):
+    """
+    Revocation entries shared by every worker through Redis.
+
+    Each entry is a key whose TTL is the remaining life of what it revokes,
+    so Redis drops it once the tokens it covers have expired. Every worker
+    keeps a Bloom filter of the revoked keys, seeded by a SCAN and kept
+    current through a pub/sub channel, so lookups of keys that were never
+    revoked (almost all of them) are answered without a round trip. Until
+    the filter is seeded, and while the subscription is down, every lookup
+    goes to Redis. The filter is rebuilt every ``rebuild_interval_seconds``
+    (or once it holds ``bloom_capacity`` keys) to forget expired entries.
+    A lookup that cannot reach Redis is counted in ``errors`` and logged;
+    with ``fail_open`` it reports "not revoked", otherwise the error is
+    raised and the token is rejected.
+    """
+
+    def __init__(
+        self,
+        redis,
+        key_prefix: str = "userservice:revoked:",
+        channel: str = "userservice:revocations",
+        bloom_capacity: int = 100000,
+        rebuild_interval_seconds: float = 300.0,
+        fail_open: bool = True,
+    ):
+        self._redis = redis
+        self._key_prefix = key_prefix
+        self._channel = channel
+        self._bloom_capacity = bloom_capacity
+        self._rebuild_interval = rebuild_interval_seconds
+        self._fail_open = fail_open
+        self._bloom = BloomFilter(bloom_capacity)
+        self._added_during_rebuild: Optional[List[str]] = None
+        self._ready = False
+        self._task: Optional[asyncio.Task] = None
+        self.bloom_negatives = 0
+        self.lookups = 0
+        self.errors = 0
+
+    def _remember(self, key: str) -> None:
+        self._bloom.add(key)
+        if self._added_during_rebuild is not None:
+            self._added_during_rebuild.append(key)
+
+    async def revoke(self, key: str, value: float, ttl_seconds: float) -> None:
+        """Store a revocation entry and announce it to the other workers."""
+        self._remember(key)
+        await self._redis.set(self._key_prefix + key, value, px=max(1, int(ttl_seconds * 1000)))
+        await self._redis.publish(self._channel, key)
+
+    async def get(self, key: str) -> Optional[float]:
+        """Value of a live revocation entry; keys outside the Bloom filter skip Redis."""
+        if self._ready and key not in self._bloom:
+            self.bloom_negatives += 1
+            return None
+        self.lookups += 1
+        try:
+            raw = await self._redis.get(self._key_prefix + key)
+        except Exception:
+            self.errors += 1
+            if not self._fail_open:
+                logger.error("Revocation lookup failed for %s; rejecting the token", key, exc_info=True)
+                raise
+            logger.warning("Revocation lookup failed for %s; treating it as not revoked", key, exc_info=True)
+            return None
+        return float(raw) if raw is not None else None
+
+    async def rebuild(self) -> None:
+        """Rebuild the Bloom filter from the live keys in Redis."""
+        self._added_during_rebuild = []
+        try:
+            keys = []
+            async for raw in self._redis.scan_iter(match=self._key_prefix + "*", count=1000):
+                key = raw.decode() if isinstance(raw, bytes) else raw
+                keys.append(key[len(self._key_prefix):])
+            # Leave room for new revocations so a large live set does not rebuild every tick
+            bloom = BloomFilter(max(self._bloom_capacity, 2 * len(keys)))
+            for key in keys + self._added_during_rebuild:
+                bloom.add(key)
+            self._bloom = bloom
+        finally:
+            self._added_during_rebuild = None
+
+    async def start(self) -> None:
+        """Subscribe to revocations of the other workers and seed the Bloom filter."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop listening; lookups go to Redis again."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._ready = False
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self._channel)
+                    # Seed after subscribing so no revocation falls in between
+                    await self.rebuild()
+                    self._ready = True
+                    next_rebuild = time.monotonic() + self._rebuild_interval
+                    while True:
+                        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                        if message is not None:
+                            data = message["data"]
+                            self._remember(data.decode() if isinstance(data, bytes) else data)
+                        if time.monotonic() >= next_rebuild or self._bloom.count >= self._bloom.capacity:
+                            await self.rebuild()
+                            next_rebuild = time.monotonic() + self._rebuild_interval
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._ready = False
+                logger.warning("Revocation subscription lost, retrying", exc_info=True)
+                await asyncio.sleep(1.0)
+
+    def stats(self) -> dict:
+        """Counters of lookups answered locally and by Redis."""
+        return {
+            "ready": self._ready,
+            "bloom_keys": self._bloom.count,
+            "bloom_negatives": self.bloom_negatives,
+            "lookups": self.lookups,
+            "errors": self.errors,
+            "fail_open": self._fail_open,
+        }
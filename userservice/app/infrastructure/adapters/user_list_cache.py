@@ -0,0 +1,253 @@
+"""Generation-versioned caches for pages of the user list."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from abc import abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from ...application.dtos.user_dtos import UserListDTO, UserResponseDTO
+from ...application.interfaces import UserListCacheInterface
+
+logger = logging.getLogger(__name__)
+
+_DATETIME_FIELDS = ("created_at", "updated_at", "last_login_at")
+
+
+def user_list_to_dict(result: UserListDTO) -> Dict[str, Any]:
+    """JSON-ready form of a user list page."""
+    data = asdict(result)
+    for user in data["users"]:
+        user["id"] = str(user["id"])
+        for name in _DATETIME_FIELDS:
+            if user[name] is not None:
+                user[name] = user[name].isoformat()
+    return data
+
+
+def user_list_from_dict(data: Dict[str, Any]) -> UserListDTO:
+    """Rebuild a user list page from ``user_list_to_dict``."""
+    users = []
+    for user in data["users"]:
+        user = dict(user, id=UUID(user["id"]))
+        for name in _DATETIME_FIELDS:
+            if user[name] is not None:
+                user[name] = datetime.fromisoformat(user[name])
+        users.append(UserResponseDTO(**user))
+    return UserListDTO(**dict(data, users=users))
+
+
+class BaseUserListCache(UserListCacheInterface):
+    """
+    Pages cached under the generations of their scopes.
+
+    Every page key embeds the current generation of each scope it depends
+    on, so bumping a scope makes all of its pages unreachable at once; the
+    orphaned entries then age out through the TTL and size bound. The
+    generations are read before the page is loaded, so a bump that races
+    with a load leaves that page under the old generation.
+
+    Pages are loaded from the read replica, which may not have the change
+    yet right after a bump. With ``rebump_after_seconds`` (the replica lag
+    bound) each bumped scope is bumped again once that long has passed
+    since its last bump, orphaning pages cached from a lagging replica.
+    """
+
+    backend = "none"
+
+    def __init__(self, ttl_seconds: float = 30.0, rebump_after_seconds: float = 0.0):
+        self._ttl = ttl_seconds
+        self._rebump_after = rebump_after_seconds
+        self._rebump_at: Dict[str, float] = {}
+        self._rebump_tasks: Set[asyncio.Task] = set()
+        self.hits = 0
+        self.misses = 0
+        self.bumps = 0
+        self.errors = 0
+
+    async def get_or_load(
+        self,
+        scopes: Sequence[str],
+        key: str,
+        loader: Callable[[], Awaitable[UserListDTO]],
+    ) -> UserListDTO:
+        """Return the cached page for the current generations, loading it on a miss."""
+        generations = await self._generations(scopes)
+        if generations is None:
+            self.misses += 1
+            return await loader()
+
+        versioned_key = "|".join(f"{scope}@{generation}" for scope, generation in zip(scopes, generations))
+        versioned_key = f"{versioned_key}|{key}"
+        cached = await self._get(versioned_key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        result = await loader()
+        await self._set(versioned_key, result)
+        return result
+
+    async def bump(self, *scopes: str) -> None:
+        """Move every scope to its next generation."""
+        self.bumps += 1
+        await self._bump(scopes)
+        if self._rebump_after <= 0:
+            return
+        for scope in scopes:
+            if scope not in self._rebump_at:
+                task = asyncio.create_task(self._rebump_later(scope))
+                self._rebump_tasks.add(task)
+                task.add_done_callback(self._rebump_tasks.discard)
+            self._rebump_at[scope] = time.monotonic() + self._rebump_after
+
+    async def _rebump_later(self, scope: str) -> None:
+        # Later bumps of the scope push its deadline back
+        while (delay := self._rebump_at[scope] - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+        del self._rebump_at[scope]
+        await self._bump((scope,))
+
+    def stats(self) -> dict:
+        """Hit/miss counters of the cache."""
+        return {
+            "backend": self.backend,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bumps": self.bumps,
+            "errors": self.errors,
+        }
+
+    @abstractmethod
+    async def _generations(self, scopes: Sequence[str]) -> Optional[Tuple[int, ...]]:
+        pass
+
+    @abstractmethod
+    async def _get(self, key: str) -> Optional[UserListDTO]:
+        pass
+
+    @abstractmethod
+    async def _set(self, key: str, result: UserListDTO) -> None:
+        pass
+
+    @abstractmethod
+    async def _bump(self, scopes: Sequence[str]) -> None:
+        pass
+
+
+class InMemoryUserListCache(BaseUserListCache):
+    """
+    Per-process LRU cache bounded by ``max_entries``.
+
+    Generations are local too, so with several workers a change made
+    through one of them reaches the others only when their pages expire.
+    """
+
+    backend = "memory"
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 1000, rebump_after_seconds: float = 0.0):
+        super().__init__(ttl_seconds, rebump_after_seconds)
+        self._max_entries = max_entries
+        self._generation_counters: Dict[str, int] = {}
+        self._entries: "OrderedDict[str, Tuple[float, UserListDTO]]" = OrderedDict()
+
+    async def _generations(self, scopes: Sequence[str]) -> Optional[Tuple[int, ...]]:
+        return tuple(self._generation_counters.get(scope, 0) for scope in scopes)
+
+    async def _get(self, key: str) -> Optional[UserListDTO]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    async def _set(self, key: str, result: UserListDTO) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def _bump(self, scopes: Sequence[str]) -> None:
+        for scope in scopes:
+            self._generation_counters[scope] = self._generation_counters.get(scope, 0) + 1
+
+    def stats(self) -> dict:
+        return {**super().stats(), "size": len(self._entries), "max_entries": self._max_entries}
+
+
+class RedisUserListCache(BaseUserListCache):
+    """
+    Cache shared by every worker through Redis.
+
+    Generations are Redis counters read with one MGET per lookup, so a bump
+    through any worker is seen by all of them. Pages expire through the key
+    TTL and the size is bounded by the Redis ``maxmemory`` policy. When
+    Redis is unreachable pages are loaded from the database and the
+    failure is counted in ``errors``.
+    """
+
+    backend = "redis"
+
+    def __init__(
+        self,
+        redis,
+        ttl_seconds: float = 30.0,
+        key_prefix: str = "userservice:users-list:",
+        rebump_after_seconds: float = 0.0,
+    ):
+        super().__init__(ttl_seconds, rebump_after_seconds)
+        self._redis = redis
+        self._key_prefix = key_prefix
+
+    def _generation_key(self, scope: str) -> str:
+        return f"{self._key_prefix}generation:{scope}"
+
+    def _page_key(self, key: str) -> str:
+        # Search terms make keys arbitrarily long; a digest keeps them bounded
+        return f"{self._key_prefix}page:{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}"
+
+    async def _generations(self, scopes: Sequence[str]) -> Optional[Tuple[int, ...]]:
+        try:
+            values = await self._redis.mget([self._generation_key(scope) for scope in scopes])
+        except Exception:
+            self.errors += 1
+            logger.warning("User list cache generation read failed", exc_info=True)
+            return None
+        return tuple(int(value) if value is not None else 0 for value in values)
+
+    async def _get(self, key: str) -> Optional[UserListDTO]:
+        try:
+            raw = await self._redis.get(self._page_key(key))
+        except Exception:
+            self.errors += 1
+            logger.warning("User list cache read failed", exc_info=True)
+            return None
+        return user_list_from_dict(json.loads(raw)) if raw is not None else None
+
+    async def _set(self, key: str, result: UserListDTO) -> None:
+        try:
+            await self._redis.set(
+                self._page_key(key), json.dumps(user_list_to_dict(result)), px=int(self._ttl * 1000)
+            )
+        except Exception:
+            self.errors += 1
+            logger.warning("User list cache write failed", exc_info=True)
+
+    async def _bump(self, scopes: Sequence[str]) -> None:
+        try:
+            for scope in scopes:
+                await self._redis.incr(self._generation_key(scope))
+        except Exception:
+            self.errors += 1
+            logger.error("User list cache invalidation failed for %s", ", ".join(scopes), exc_info=True)
@@ -0,0 +1,116 @@
+"""Write-behind recorder for user login timestamps."""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import case, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ...application.interfaces import LoginRecorderInterface
+from ..models import UserModel
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindLoginRecorder(LoginRecorderInterface):
+    """
+    Buffers login timestamps in memory and writes them in batches.
+
+    Repeated logins of the same user collapse into one entry (latest wins).
+    The buffer is flushed every ``flush_interval_ms`` or as soon as it holds
+    ``max_batch`` users, with one multi-row UPDATE per batch. Timestamps still
+    buffered when the process dies are lost, which is acceptable for
+    ``last_login_at``.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        flush_interval_ms: int = 500,
+        max_batch: int = 500,
+    ):
+        self._session_maker = session_maker
+        self._flush_interval = flush_interval_ms / 1000
+        self._max_batch = max_batch
+        self._pending: Dict[UUID, datetime] = {}
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.flushed_users = 0
+        self.flush_count = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of users waiting to be written."""
+        return len(self._pending)
+
+    async def record_login(self, user_id: UUID, logged_in_at: datetime) -> None:
+        """Queue the last login timestamp of a user."""
+        self._pending[user_id] = logged_in_at
+        if len(self._pending) >= self._max_batch:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Write every queued timestamp, one UPDATE per ``max_batch`` users."""
+        async with self._flush_lock:
+            written = 0
+            while self._pending:
+                batch = dict(list(self._pending.items())[:self._max_batch])
+                for user_id in batch:
+                    del self._pending[user_id]
+                try:
+                    await self._write_batch(batch)
+                except BaseException as exc:
+                    # Keep the batch for the next flush unless a newer login replaced it
+                    for user_id, logged_in_at in batch.items():
+                        self._pending.setdefault(user_id, logged_in_at)
+                    if not isinstance(exc, Exception):
+                        raise
+                    logger.exception("Failed to flush %d login timestamps", len(batch))
+                    break
+                written += len(batch)
+            if written:
+                self.flushed_users += written
+                self.flush_count += 1
+            return written
+
+    async def _write_batch(self, batch: Dict[UUID, datetime]) -> None:
+        timestamps = case(batch, value=UserModel.id)
+        statement = (
+            update(UserModel)
+            .where(UserModel.id.in_(list(batch)))
+            .values(last_login_at=timestamps, updated_at=timestamps)
+            .execution_options(synchronize_session=False)
+        )
+        async with self._session_maker() as session:
+            await session.execute(statement)
+            await session.commit()
+
+    async def start(self) -> None:
+        """Start the periodic flush task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush task and write whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._pending:
+                await self.flush()
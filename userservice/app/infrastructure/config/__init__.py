@@ -1,8 +1,10 @@
 """Infrastructure configuration module."""
 
-from .database import database_config, DatabaseConfig
+from .database import database_config, DatabaseConfig, get_db_session, get_read_db_session
 
 __all__ = [
     "database_config",
     "DatabaseConfig",
+    "get_db_session",
+    "get_read_db_session",
 ]
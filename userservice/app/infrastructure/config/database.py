@@ -1,36 +1,128 @@
 """Database configuration for user service."""
 
 import os
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict, Optional
+from uuid import uuid4
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.engine import make_url
 from sqlalchemy.pool import NullPool
 from sqlalchemy import text
 
 from app.config import settings
 from ..models import Base
+from ..models.user_search import install_search_index
+from .pool import InstrumentedAsyncQueuePool, get_pool_stats
+from .routing import (
+    READ_YOUR_WRITES_COOKIE,
+    ReadYourWritesTracker,
+    TrackedSession,
+    describe_session_usage,
+    get_routing_key,
+    session_needs_commit,
+)
+
+
+def _build_engine_options(database_url: str) -> Dict[str, Any]:
+    """Build create_async_engine keyword arguments from the pool settings."""
+    options: Dict[str, Any] = {"echo": settings.DATABASE_ECHO}
+    
+    if os.getenv("ENVIRONMENT") == "test":
+        options["poolclass"] = NullPool
+        return options
+    
+    url = make_url(database_url)
+    if url.get_backend_name() != "postgresql":
+        # SQLite picks its own pool (NullPool/StaticPool) which takes no sizing
+        return options
+    
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+    )
+    
+    if url.get_driver_name() == "asyncpg":
+        if settings.DATABASE_PGBOUNCER_MODE:
+            # Transaction pooling hands each transaction a different server
+            # connection, so named prepared statements must not be reused.
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        else:
+            options["connect_args"] = {
+                "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+                "prepared_statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+            }
+    
+    return options
+
+
+class SessionUsageStats:
+    """Counts request sessions by what they did (none, read or write)."""
+    
+    def __init__(self):
+        self.counts: Dict[str, int] = {"none": 0, "read": 0, "write": 0}
+    
+    def record(self, usage: str) -> None:
+        """Record the usage of a finished request session."""
+        self.counts[usage] = self.counts.get(usage, 0) + 1
+    
+    def as_dict(self) -> Dict[str, int]:
+        """Get a copy of the counters."""
+        return dict(self.counts)
 
 
 class DatabaseConfig:
     """Database configuration class."""
     
-    def __init__(self):
-        self.database_url = settings.DATABASE_URL
+    def __init__(self, database_url: Optional[str] = None, replica_url: Optional[str] = None):
+        self.database_url = database_url or settings.DATABASE_URL
         self.engine = create_async_engine(
             self.database_url,
-            echo=settings.DATABASE_ECHO,
-            poolclass=NullPool if os.getenv("ENVIRONMENT") == "test" else None,
+            **_build_engine_options(self.database_url),
         )
         self.async_session_maker = async_sessionmaker(
             bind=self.engine,
             class_=AsyncSession,
+            sync_session_class=TrackedSession,
             expire_on_commit=False,
         )
+        
+        # Optional read replica; without one, reads are served by the primary
+        self.replica_url = replica_url or settings.DATABASE_REPLICA_URL
+        self.replica_engine = None
+        self.replica_session_maker = None
+        if self.replica_url:
+            self.replica_engine = create_async_engine(
+                self.replica_url,
+                **_build_engine_options(self.replica_url),
+            )
+            self.replica_session_maker = async_sessionmaker(
+                bind=self.replica_engine,
+                class_=AsyncSession,
+                expire_on_commit=False,
+            )
+        self.read_your_writes = ReadYourWritesTracker(settings.DATABASE_READ_YOUR_WRITES_SECONDS)
+        self.session_usage = SessionUsageStats()
     
+    @property
+    def has_replica(self) -> bool:
+        """Check whether a read replica is configured."""
+        return self.replica_session_maker is not None
     
     async def create_tables(self) -> None:
         """Create database tables."""
         async with self.engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            # Tables that already existed skip after_create, so make sure the
+            # search index objects (and their backfill) are in place
+            await conn.run_sync(install_search_index)
     
     async def drop_tables(self) -> None:
         """Drop database tables."""
@@ -48,9 +140,19 @@ class DatabaseConfig:
             finally:
                 await session.close()
     
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get live connection pool statistics."""
+        stats = {"primary": get_pool_stats(self.engine.pool)}
+        if self.replica_engine is not None:
+            stats["replica"] = get_pool_stats(self.replica_engine.pool)
+        stats["sessions"] = self.session_usage.as_dict()
+        return stats
+    
     async def close(self) -> None:
-        """Close database engine."""
+        """Close database engines."""
         await self.engine.dispose()
+        if self.replica_engine is not None:
+            await self.replica_engine.dispose()
 
 
 # Global database configuration instance
@@ -58,19 +160,62 @@ database_config = DatabaseConfig()
 engine = database_config.engine
 
 
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
-    """Get database session for dependency injection."""
+async def get_db_session(request: Request = None) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get database session for dependency injection.
+    
+    The session only checks out a connection on its first query, and only
+    issues COMMIT when something was written; read-only requests just
+    release the connection. What the session did is recorded in
+    ``request.state.db_transaction`` ("none", "read" or "write"), and after
+    a commit ``request.state.db_primary_until`` holds the epoch time until
+    which the client's reads stay on the primary.
+    """
     async with database_config.async_session_maker() as session:
         try:
             yield session
-            await session.commit()
+            if session_needs_commit(session):
+                await session.commit()
+                primary_until = database_config.read_your_writes.mark_write(get_routing_key(request))
+                if request is not None:
+                    request.state.db_primary_until = primary_until
         except Exception:
             await session.rollback()
             raise
         finally:
+            usage = describe_session_usage(session)
+            database_config.session_usage.record(usage)
+            if request is not None:
+                request.state.db_transaction = usage
             await session.close()
 
 
+async def get_read_db_session(
+    request: Request,
+    session: AsyncSession = Depends(get_db_session),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get a read-only session for dependency injection.
+    
+    Served by the replica when one is configured, except for clients that
+    wrote within the read-your-writes window, which stay on the primary.
+    The window is tracked by this process and by the ``READ_YOUR_WRITES_COOKIE``
+    the client got with its write, so it holds across workers.
+    """
+    if not database_config.has_replica or database_config.read_your_writes.is_sticky(
+        get_routing_key(request), request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    ):
+        yield session
+        return
+    
+    async with database_config.replica_session_maker() as replica_session:
+        try:
+            yield replica_session
+        finally:
+            await replica_session.rollback()
+            await replica_session.close()
+
+
 async def check_database_health() -> bool:
     """Check database connection health."""
     try:
@@ -0,0 +1,58 @@
+"""Connection pool instrumentation for the async database engine."""
+
+import time
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long callers wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_count = 0
+        self.timeout_count = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def connect(self):
+        """Check out a connection, measuring the time spent waiting for it."""
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.timeout_count += 1
+            raise
+        waited = time.perf_counter() - started
+        self.checkout_count += 1
+        self.total_wait_seconds += waited
+        if waited > self.max_wait_seconds:
+            self.max_wait_seconds = waited
+        return connection
+
+
+def get_pool_stats(pool: Pool) -> Dict[str, Any]:
+    """Return a snapshot of the pool state suitable for metrics or health output."""
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            timeout_seconds=pool.timeout(),
+        )
+
+    if isinstance(pool, InstrumentedAsyncQueuePool):
+        checkouts = pool.checkout_count
+        stats.update(
+            checkouts=checkouts,
+            checkout_timeouts=pool.timeout_count,
+            avg_wait_ms=round(pool.total_wait_seconds * 1000 / checkouts, 3) if checkouts else 0.0,
+            max_wait_ms=round(pool.max_wait_seconds * 1000, 3),
+        )
+
+    return stats
@@ -0,0 +1,154 @@
+"""Read/write routing helpers for primary and replica databases."""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Keys stored in Session.info once the session has begun a transaction on a
+# connection, once it has emitted any write, and once a unit of work that
+# will write has been opened on it
+CONNECTION_USED_KEY = "connection_used"
+HAS_WRITES_KEY = "has_writes"
+PRIMARY_READS_KEY = "primary_reads"
+
+# Cookie handed to a client that wrote, holding the wall-clock time until
+# which its reads must stay on the primary
+READ_YOUR_WRITES_COOKIE = "db_primary_until"
+
+
+class TrackedSession(Session):
+    """Session class that flags in ``info`` when it uses a connection or writes."""
+
+
+@event.listens_for(TrackedSession, "after_begin")
+def _flag_connection(session: Session, transaction, connection) -> None:
+    session.info[CONNECTION_USED_KEY] = True
+
+
+@event.listens_for(TrackedSession, "after_flush")
+def _flag_flush(session: Session, flush_context) -> None:
+    session.info[HAS_WRITES_KEY] = True
+
+
+@event.listens_for(TrackedSession, "do_orm_execute")
+def _flag_dml(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[HAS_WRITES_KEY] = True
+
+
+def session_has_writes(session) -> bool:
+    """Check whether a (sync or async) session has written in its lifetime."""
+    return bool(session.info.get(HAS_WRITES_KEY, False))
+
+
+def mark_session_written(session) -> None:
+    """Flag a (sync or async) session that wrote through raw SQL or its driver connection."""
+    session.info[HAS_WRITES_KEY] = True
+
+
+def pin_session_to_primary(session) -> None:
+    """Send every read of the repositories sharing ``session`` to the primary."""
+    session.info[PRIMARY_READS_KEY] = True
+
+
+def session_reads_primary(session) -> bool:
+    """Check whether reads made alongside ``session`` must avoid the replica."""
+    return session_has_writes(session) or bool(session.info.get(PRIMARY_READS_KEY, False))
+
+
+def session_needs_commit(session) -> bool:
+    """Check whether a session has flushed writes or pending changes to commit."""
+    return session_has_writes(session) or bool(session.new or session.dirty or session.deleted)
+
+
+def describe_session_usage(session) -> str:
+    """Classify what a session did: ``none``, ``read`` or ``write``."""
+    if session_has_writes(session):
+        return "write"
+    if session.info.get(CONNECTION_USED_KEY, False):
+        return "read"
+    return "none"
+
+
+def get_routing_key(request: Optional[Request]) -> Optional[str]:
+    """Identify the client of a request for read-your-writes stickiness."""
+    if request is None:
+        return None
+
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return hashlib.sha256(authorization.encode("utf-8")).hexdigest()
+    if request.client:
+        return f"host:{request.client.host}"
+    return None
+
+
+class ReadYourWritesTracker:
+    """
+    Remembers clients that wrote recently so their reads stay on the primary.
+    
+    The in-memory entries only cover the process that served the write. To
+    keep the client sticky on every worker and instance, ``mark_write``
+    returns the wall-clock deadline that is handed to the client in the
+    ``READ_YOUR_WRITES_COOKIE``, and ``is_sticky`` honors it when sent back.
+    """
+
+    def __init__(self, window_seconds: float, max_entries: int = 10000):
+        self._window_seconds = window_seconds
+        self._max_entries = max_entries
+        self._written_at: "OrderedDict[str, float]" = OrderedDict()
+
+    @property
+    def window_seconds(self) -> float:
+        """How long a client stays on the primary after writing."""
+        return self._window_seconds
+
+    def mark_write(self, key: Optional[str]) -> Optional[float]:
+        """
+        Record that the client identified by ``key`` has just written.
+        
+        Returns the epoch time until which its reads stay on the primary, or
+        None when stickiness is disabled.
+        """
+        if self._window_seconds <= 0:
+            return None
+
+        if key is not None:
+            self._written_at[key] = time.monotonic() + self._window_seconds
+            self._written_at.move_to_end(key)
+            while len(self._written_at) > self._max_entries:
+                self._written_at.popitem(last=False)
+        return time.time() + self._window_seconds
+
+    def is_sticky(self, key: Optional[str], primary_until: Optional[str] = None) -> bool:
+        """
+        Check whether reads for ``key`` must still go to the primary.
+        
+        ``primary_until`` is the cookie value sent by the client; deadlines
+        further away than the window (give or take a second of clock skew
+        between hosts) are ignored.
+        """
+        if primary_until:
+            try:
+                deadline = float(primary_until)
+            except ValueError:
+                deadline = 0.0
+            now = time.time()
+            if now < deadline <= now + self._window_seconds + 1:
+                return True
+
+        if key is None:
+            return False
+
+        expires_at = self._written_at.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            del self._written_at[key]
+            return False
+        return True
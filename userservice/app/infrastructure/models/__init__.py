@@ -2,9 +2,12 @@
 
 from .user_model import UserModel, Base
 from .refresh_token_model import RefreshTokenModel
+from .bulk_upload_job_model import BulkUploadJobModel
+from . import user_search  # registers the search index DDL on the users table
 
 __all__ = [
     "UserModel",
     "RefreshTokenModel", 
+    "BulkUploadJobModel",
     "Base",
 ]
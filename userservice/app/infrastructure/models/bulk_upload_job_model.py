@@ -0,0 +1,34 @@
+"""Bulk upload job SQLAlchemy model."""
+
+from sqlalchemy import Column, String, DateTime, Enum, Integer, JSON, Text
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+from ...domain import BulkUploadJobStatus
+from .user_model import Base
+
+
+class BulkUploadJobModel(Base):
+    """SQLAlchemy model for background bulk upload jobs."""
+    
+    __tablename__ = "bulk_upload_jobs"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    filename = Column(String(255), nullable=False)
+    created_by = Column(UUID(as_uuid=True), nullable=False)
+    status = Column(Enum(BulkUploadJobStatus), nullable=False, index=True)
+    # CSV rows whose outcome is committed; a resumed job skips them
+    rows_processed = Column(Integer, default=0, nullable=False)
+    successful = Column(Integer, default=0, nullable=False)
+    failed = Column(Integer, default=0, nullable=False)
+    errors = Column(JSON, nullable=False)
+    error_message = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+    # Worker running the job, and until when; an expired lease can be claimed
+    owner = Column(String(255), nullable=True)
+    lease_until = Column(DateTime, nullable=True)
+    
+    def __repr__(self) -> str:
+        return f"<BulkUploadJobModel(id={self.id}, status={self.status}, rows_processed={self.rows_processed})>"
@@ -16,6 +16,8 @@ class RefreshTokenModel(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     token = Column(String(128), unique=True, nullable=False, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    # Rotation family: every token rotated from one login shares it
+    family_id = Column(UUID(as_uuid=True), nullable=False, index=True)
     expires_at = Column(DateTime(timezone=True), nullable=False)
     device_info = Column(String(512), nullable=True)
     created_at = Column(DateTime(timezone=True), nullable=False)
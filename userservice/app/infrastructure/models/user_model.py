@@ -2,7 +2,7 @@
 
 from datetime import datetime, timezone
 from uuid import uuid4
-from sqlalchemy import Column, String, Boolean, DateTime, Enum
+from sqlalchemy import Column, String, Boolean, DateTime, Enum, Index, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import declarative_base, relationship
 
@@ -15,6 +15,10 @@ class UserModel(Base):
     """SQLAlchemy model for User entity."""
     
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pagination order for user listings
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     first_name = Column(String(100), nullable=False)
@@ -34,6 +38,8 @@ class UserModel(Base):
     # PASO 5: Password reset token support
     reset_password_token = Column(String(100), nullable=True, index=True)
     reset_password_token_expires_at = Column(DateTime, nullable=True)
+    # Watermark checked against the token_version claim of access tokens
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
     
     # PASO 6: Relationship with refresh tokens
     refresh_tokens = relationship("RefreshTokenModel", back_populates="user", cascade="all, delete-orphan")
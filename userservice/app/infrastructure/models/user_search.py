@@ -0,0 +1,155 @@
+"""Indexed substring search over users.
+
+The search looks for the term inside one lowercased "search document"
+built from first name, last name, email and document number:
+
+* PostgreSQL: a pg_trgm GIN index on the document expression, so
+  ``LIKE '%term%'`` is answered from the index.
+* SQLite: an FTS5 table with the trigram tokenizer, kept in sync by
+  triggers. ``users_search_ids`` gives every user a stable integer rowid
+  (the implicit rowid of ``users`` may change on VACUUM).
+* Anything else: plain ``LIKE`` on each column (sequential scan).
+"""
+
+from typing import List
+
+from sqlalchemy import event, literal_column, select, table, column
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.config import settings
+from .user_model import UserModel
+
+SEARCH_BACKEND_TRIGRAM = "trigram"
+SEARCH_BACKEND_FTS5 = "fts5"
+SEARCH_BACKEND_LIKE = "like"
+
+TRIGRAM_INDEX_NAME = "ix_users_search_trgm"
+FTS5_TABLE_NAME = "users_search"
+FTS5_IDS_TABLE_NAME = "users_search_ids"
+
+# The index expression must match the query expression exactly for the
+# planner to use it, so both are built from this SQL
+SEARCH_DOCUMENT_SQL = "lower(first_name || ' ' || last_name || ' ' || email || ' ' || document_number)"
+_NEW_SEARCH_DOCUMENT_SQL = (
+    "lower(new.first_name || ' ' || new.last_name || ' ' || new.email || ' ' || new.document_number)"
+)
+
+POSTGRES_SEARCH_DDL: List[str] = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX_NAME} ON users "
+    f"USING gin (({SEARCH_DOCUMENT_SQL}) gin_trgm_ops)",
+]
+
+POSTGRES_SEARCH_DROP_DDL: List[str] = [
+    f"DROP INDEX IF EXISTS {TRIGRAM_INDEX_NAME}",
+]
+
+SQLITE_SEARCH_DDL: List[str] = [
+    f"CREATE TABLE IF NOT EXISTS {FTS5_IDS_TABLE_NAME} ("
+    "rowid INTEGER PRIMARY KEY, user_id CHAR(32) NOT NULL UNIQUE)",
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS5_TABLE_NAME} "
+    "USING fts5(search_text, tokenize='trigram')",
+    f"""CREATE TRIGGER IF NOT EXISTS users_search_ai AFTER INSERT ON users BEGIN
+        INSERT INTO {FTS5_IDS_TABLE_NAME} (user_id) VALUES (new.id);
+        INSERT INTO {FTS5_TABLE_NAME} (rowid, search_text)
+        VALUES (last_insert_rowid(), {_NEW_SEARCH_DOCUMENT_SQL});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS users_search_au
+    AFTER UPDATE OF first_name, last_name, email, document_number ON users BEGIN
+        UPDATE {FTS5_TABLE_NAME} SET search_text = {_NEW_SEARCH_DOCUMENT_SQL}
+        WHERE rowid = (SELECT rowid FROM {FTS5_IDS_TABLE_NAME} WHERE user_id = new.id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS users_search_ad AFTER DELETE ON users BEGIN
+        DELETE FROM {FTS5_TABLE_NAME}
+        WHERE rowid = (SELECT rowid FROM {FTS5_IDS_TABLE_NAME} WHERE user_id = old.id);
+        DELETE FROM {FTS5_IDS_TABLE_NAME} WHERE user_id = old.id;
+    END""",
+    # Backfill users created before the search table existed
+    f"""INSERT INTO {FTS5_IDS_TABLE_NAME} (user_id)
+    SELECT id FROM users WHERE id NOT IN (SELECT user_id FROM {FTS5_IDS_TABLE_NAME})""",
+    f"""INSERT INTO {FTS5_TABLE_NAME} (rowid, search_text)
+    SELECT ids.rowid, lower(u.first_name || ' ' || u.last_name || ' ' || u.email || ' ' || u.document_number)
+    FROM users u JOIN {FTS5_IDS_TABLE_NAME} ids ON ids.user_id = u.id
+    WHERE ids.rowid NOT IN (SELECT rowid FROM {FTS5_TABLE_NAME})""",
+]
+
+SQLITE_SEARCH_DROP_DDL: List[str] = [
+    "DROP TRIGGER IF EXISTS users_search_ad",
+    "DROP TRIGGER IF EXISTS users_search_au",
+    "DROP TRIGGER IF EXISTS users_search_ai",
+    f"DROP TABLE IF EXISTS {FTS5_TABLE_NAME}",
+    f"DROP TABLE IF EXISTS {FTS5_IDS_TABLE_NAME}",
+]
+
+_fts5_table = table(FTS5_TABLE_NAME, column("rowid"), column("search_text"))
+_fts5_ids_table = table(FTS5_IDS_TABLE_NAME, column("rowid"), column("user_id"))
+
+
+def resolve_search_backend(dialect_name: str) -> str:
+    """Pick the search backend for a dialect, honouring ``USER_SEARCH_BACKEND``."""
+    configured = settings.USER_SEARCH_BACKEND.lower()
+    if configured != "auto":
+        return configured
+    if dialect_name == "postgresql":
+        return SEARCH_BACKEND_TRIGRAM
+    if dialect_name == "sqlite":
+        return SEARCH_BACKEND_FTS5
+    return SEARCH_BACKEND_LIKE
+
+
+def _like_pattern(search_term: str) -> str:
+    escaped = search_term.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def build_search_condition(search_term: str, dialect_name: str) -> ColumnElement:
+    """Build the WHERE condition matching ``search_term`` for the given dialect."""
+    backend = resolve_search_backend(dialect_name)
+    pattern = _like_pattern(search_term)
+
+    if backend == SEARCH_BACKEND_TRIGRAM:
+        return literal_column(SEARCH_DOCUMENT_SQL).like(pattern, escape="\\")
+
+    if backend == SEARCH_BACKEND_FTS5:
+        # ESCAPE keeps FTS5 from using the trigram index, so only add it when needed
+        escape = "\\" if pattern[1:-1] != search_term.lower() else None
+        matches = (
+            select(_fts5_ids_table.c.user_id)
+            .join(_fts5_table, _fts5_table.c.rowid == _fts5_ids_table.c.rowid)
+            .where(_fts5_table.c.search_text.like(pattern, escape=escape))
+        )
+        return literal_column("users.id").in_(matches)
+
+    return (
+        UserModel.first_name.ilike(pattern, escape="\\")
+        | UserModel.last_name.ilike(pattern, escape="\\")
+        | UserModel.email.ilike(pattern, escape="\\")
+        | UserModel.document_number.ilike(pattern, escape="\\")
+    )
+
+
+def install_search_index(connection: Connection) -> None:
+    """Create the search index objects for the connection's dialect (idempotent)."""
+    backend = resolve_search_backend(connection.dialect.name)
+    if backend == SEARCH_BACKEND_TRIGRAM:
+        statements = POSTGRES_SEARCH_DDL
+    elif backend == SEARCH_BACKEND_FTS5:
+        statements = SQLITE_SEARCH_DDL
+    else:
+        return
+
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+@event.listens_for(UserModel.__table__, "after_create")
+def _install_search_index_after_create(target, connection, **kw) -> None:
+    install_search_index(connection)
+
+
+@event.listens_for(UserModel.__table__, "before_drop")
+def _drop_search_index_before_drop(target, connection, **kw) -> None:
+    if connection.dialect.name == "sqlite":
+        for statement in SQLITE_SEARCH_DROP_DDL:
+            connection.exec_driver_sql(statement)
@@ -2,8 +2,12 @@
 
 from .sqlalchemy_user_repository import SQLAlchemyUserRepository
 from .sqlalchemy_refresh_token_repository import SQLAlchemyRefreshTokenRepository
+from .sqlalchemy_bulk_upload_job_repository import SQLAlchemyBulkUploadJobRepository
+from .sqlalchemy_unit_of_work import SQLAlchemyUnitOfWork
 
 __all__ = [
     "SQLAlchemyUserRepository",
     "SQLAlchemyRefreshTokenRepository",
+    "SQLAlchemyBulkUploadJobRepository",
+    "SQLAlchemyUnitOfWork",
 ]
@@ -0,0 +1,142 @@
+"""SQLAlchemy implementation of bulk upload job repository."""
+
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...domain import BulkUploadJob, BulkUploadJobStatus, BulkUploadJobRepositoryInterface
+from ..models import BulkUploadJobModel
+
+# Fields written by update(); the identity of a job never changes
+_UPDATABLE_FIELDS = (
+    "status",
+    "rows_processed",
+    "successful",
+    "failed",
+    "errors",
+    "error_message",
+    "updated_at",
+    "finished_at",
+    "owner",
+    "lease_until",
+)
+
+
+class SQLAlchemyBulkUploadJobRepository(BulkUploadJobRepositoryInterface):
+    """
+    SQLAlchemy implementation of BulkUploadJobRepositoryInterface.
+    
+    Writes join the caller's transaction, so a job's progress commits
+    together with the users of the chunk it describes.
+    """
+    
+    def __init__(self, session: AsyncSession):
+        self._session = session
+    
+    def _model_to_entity(self, model: BulkUploadJobModel) -> BulkUploadJob:
+        return BulkUploadJob(
+            id=model.id,
+            filename=model.filename,
+            created_by=model.created_by,
+            status=model.status,
+            rows_processed=model.rows_processed,
+            successful=model.successful,
+            failed=model.failed,
+            errors=list(model.errors),
+            error_message=model.error_message,
+            created_at=model.created_at,
+            updated_at=model.updated_at,
+            finished_at=model.finished_at,
+            owner=model.owner,
+            lease_until=model.lease_until,
+        )
+    
+    async def create(self, job: BulkUploadJob) -> BulkUploadJob:
+        """Save a new job."""
+        self._session.add(BulkUploadJobModel(
+            id=job.id,
+            filename=job.filename,
+            created_by=job.created_by,
+            created_at=job.created_at,
+            **{name: getattr(job, name) for name in _UPDATABLE_FIELDS},
+        ))
+        await self._session.flush()
+        return job
+    
+    async def get_by_id(self, job_id: UUID) -> Optional[BulkUploadJob]:
+        """Get a job by ID."""
+        result = await self._session.execute(
+            select(BulkUploadJobModel).where(BulkUploadJobModel.id == job_id)
+        )
+        model = result.scalar_one_or_none()
+        return self._model_to_entity(model) if model else None
+    
+    async def update(self, job: BulkUploadJob) -> BulkUploadJob:
+        """Save the status and progress of a job."""
+        await self._session.execute(
+            update(BulkUploadJobModel)
+            .where(BulkUploadJobModel.id == job.id)
+            .values(**{name: getattr(job, name) for name in _UPDATABLE_FIELDS})
+            .execution_options(synchronize_session=False)
+        )
+        return job
+    
+    async def list_unfinished(self) -> List[BulkUploadJob]:
+        """Get pending and running jobs, oldest first."""
+        result = await self._session.execute(
+            select(BulkUploadJobModel)
+            .where(BulkUploadJobModel.status.in_([BulkUploadJobStatus.PENDING, BulkUploadJobStatus.RUNNING]))
+            .order_by(BulkUploadJobModel.created_at)
+        )
+        return [self._model_to_entity(model) for model in result.scalars()]
+    
+    async def claim(self, job_id: UUID, owner: str, lease_until: datetime) -> Optional[BulkUploadJob]:
+        """Mark a pending job, or a running one with an expired lease, as running for ``owner``."""
+        now = datetime.utcnow()
+        result = await self._session.execute(
+            update(BulkUploadJobModel)
+            .where(
+                BulkUploadJobModel.id == job_id,
+                or_(
+                    BulkUploadJobModel.status == BulkUploadJobStatus.PENDING,
+                    and_(
+                        BulkUploadJobModel.status == BulkUploadJobStatus.RUNNING,
+                        or_(BulkUploadJobModel.lease_until.is_(None), BulkUploadJobModel.lease_until < now),
+                    ),
+                ),
+            )
+            .values(status=BulkUploadJobStatus.RUNNING, owner=owner, lease_until=lease_until, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            return None
+        return await self.get_by_id(job_id)
+    
+    async def renew_lease(self, job_id: UUID, owner: str, lease_until: datetime) -> bool:
+        """Extend the lease of a running job held by ``owner``."""
+        result = await self._session.execute(
+            update(BulkUploadJobModel)
+            .where(
+                BulkUploadJobModel.id == job_id,
+                BulkUploadJobModel.status == BulkUploadJobStatus.RUNNING,
+                BulkUploadJobModel.owner == owner,
+            )
+            .values(lease_until=lease_until)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+    
+    async def release(self, job_id: UUID, owner: str) -> None:
+        """Expire the lease of a running job held by ``owner``."""
+        await self._session.execute(
+            update(BulkUploadJobModel)
+            .where(
+                BulkUploadJobModel.id == job_id,
+                BulkUploadJobModel.status == BulkUploadJobStatus.RUNNING,
+                BulkUploadJobModel.owner == owner,
+            )
+            .values(lease_until=None)
+            .execution_options(synchronize_session=False)
+        )
@@ -2,17 +2,29 @@
 
 from datetime import datetime, timezone
 from typing import List, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, and_
+from sqlalchemy import select, update, insert, delete, and_, literal
 
 from ...domain.entities.refresh_token_entity import RefreshToken
 from ...domain.repositories.refresh_token_repository_interface import RefreshTokenRepositoryInterface
 from ..models.refresh_token_model import RefreshTokenModel
 
 
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """SQLite returns naive datetimes; the entity compares against aware UTC."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
 class SQLAlchemyRefreshTokenRepository(RefreshTokenRepositoryInterface):
-    """SQLAlchemy implementation of refresh token repository."""
+    """
+    SQLAlchemy implementation of refresh token repository.
+    
+    Writes join the caller's transaction; committing is left to the unit of
+    work (or the request session dependency).
+    """
     
     def __init__(self, session: AsyncSession):
         self._session = session
@@ -23,6 +35,7 @@ class SQLAlchemyRefreshTokenRepository(RefreshTokenRepositoryInterface):
             id=refresh_token.id,
             token=refresh_token.token,
             user_id=refresh_token.user_id,
+            family_id=refresh_token.family_id,
             expires_at=refresh_token.expires_at,
             device_info=refresh_token.device_info,
             created_at=refresh_token.created_at,
@@ -31,8 +44,7 @@ class SQLAlchemyRefreshTokenRepository(RefreshTokenRepositoryInterface):
         )
         
         self._session.add(model)
-        await self._session.commit()
-        await self._session.refresh(model)
+        await self._session.flush()
         
         return self._model_to_entity(model)
     
@@ -78,7 +90,6 @@ class SQLAlchemyRefreshTokenRepository(RefreshTokenRepositoryInterface):
             .values(is_active=False)
         )
         result = await self._session.execute(stmt)
-        await self._session.commit()
         
         return result.rowcount > 0
     
@@ -95,7 +106,117 @@ class SQLAlchemyRefreshTokenRepository(RefreshTokenRepositoryInterface):
             .values(is_active=False)
         )
         result = await self._session.execute(stmt)
-        await self._session.commit()
+        
+        return result.rowcount
+    
+    def _revoke_for_rotation(self, token: str, now: datetime):
+        """UPDATE that revokes ``token`` only if it is still active and unexpired."""
+        return (
+            update(RefreshTokenModel)
+            .where(
+                and_(
+                    RefreshTokenModel.token == token,
+                    RefreshTokenModel.is_active == True,
+                    RefreshTokenModel.expires_at > now,
+                )
+            )
+            .values(is_active=False, last_used_at=now)
+        )
+    
+    def _rotation_statement(self, token: str, replacement: dict, now: datetime):
+        """
+        Single statement rotation for PostgreSQL.
+        
+        WITH revoked AS (UPDATE ... WHERE token = :token AND is_active RETURNING ...)
+        INSERT INTO refresh_tokens SELECT <replacement> FROM revoked RETURNING ...
+        """
+        revoked = (
+            self._revoke_for_rotation(token, now)
+            .returning(
+                RefreshTokenModel.user_id,
+                RefreshTokenModel.family_id,
+                RefreshTokenModel.device_info,
+            )
+            .cte("revoked")
+        )
+        replacement_row = select(
+            literal(replacement["id"], RefreshTokenModel.id.type),
+            literal(replacement["token"], RefreshTokenModel.token.type),
+            revoked.c.user_id,
+            revoked.c.family_id,
+            literal(replacement["expires_at"], RefreshTokenModel.expires_at.type),
+            revoked.c.device_info,
+            literal(replacement["created_at"], RefreshTokenModel.created_at.type),
+            literal(True, RefreshTokenModel.is_active.type),
+        )
+        return (
+            insert(RefreshTokenModel)
+            .from_select(
+                ["id", "token", "user_id", "family_id", "expires_at", "device_info", "created_at", "is_active"],
+                replacement_row,
+            )
+            .returning(RefreshTokenModel.user_id, RefreshTokenModel.family_id, RefreshTokenModel.device_info)
+        )
+    
+    async def rotate(self, token: str, new_token: str, new_expires_at: datetime) -> Optional[RefreshToken]:
+        """
+        Revoke ``token`` and insert its replacement, keyed on ``is_active = true``.
+        
+        PostgreSQL does both in one data-modifying CTE. Other dialects run the
+        conditional UPDATE ... RETURNING and then the INSERT; the UPDATE is
+        what serializes concurrent rotations, so the race is closed there too.
+        """
+        now = datetime.now(timezone.utc)
+        replacement = {"id": uuid4(), "token": new_token, "expires_at": new_expires_at, "created_at": now}
+        
+        if self._session.get_bind().dialect.name == "postgresql":
+            result = await self._session.execute(self._rotation_statement(token, replacement, now))
+            row = result.one_or_none()
+        else:
+            result = await self._session.execute(
+                self._revoke_for_rotation(token, now)
+                .returning(
+                    RefreshTokenModel.user_id,
+                    RefreshTokenModel.family_id,
+                    RefreshTokenModel.device_info,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            row = result.one_or_none()
+            if row is not None:
+                await self._session.execute(
+                    insert(RefreshTokenModel).values(
+                        user_id=row.user_id,
+                        family_id=row.family_id,
+                        device_info=row.device_info,
+                        is_active=True,
+                        **replacement,
+                    )
+                )
+        
+        if row is None:
+            return None
+        
+        return RefreshToken(
+            user_id=row.user_id,
+            device_info=row.device_info,
+            family_id=row.family_id,
+            **replacement,
+        )
+    
+    async def revoke_family(self, family_id: UUID) -> int:
+        """Revoke every active token of a rotation family. Returns count of revoked tokens."""
+        stmt = (
+            update(RefreshTokenModel)
+            .where(
+                and_(
+                    RefreshTokenModel.family_id == family_id,
+                    RefreshTokenModel.is_active == True
+                )
+            )
+            .values(is_active=False)
+        )
+        result = await self._session.execute(stmt)
         
         return result.rowcount
     
@@ -105,7 +226,6 @@ class SQLAlchemyRefreshTokenRepository(RefreshTokenRepositoryInterface):
         stmt = delete(RefreshTokenModel).where(RefreshTokenModel.expires_at <= now)
         
         result = await self._session.execute(stmt)
-        await self._session.commit()
         
         return result.rowcount
     
@@ -123,17 +243,14 @@ class SQLAlchemyRefreshTokenRepository(RefreshTokenRepositoryInterface):
             )
         )
         await self._session.execute(stmt)
-        await self._session.commit()
         
-        # Get updated model to return
-        model = await self._session.get(RefreshTokenModel, refresh_token.id)
-        return self._model_to_entity(model)
+        # The row now holds exactly the entity's values, no need to read it back
+        return refresh_token
     
     async def delete(self, token_id: UUID) -> bool:
         """Delete a refresh token by ID."""
         stmt = delete(RefreshTokenModel).where(RefreshTokenModel.id == token_id)
         result = await self._session.execute(stmt)
-        await self._session.commit()
         
         return result.rowcount > 0
     
@@ -154,10 +271,11 @@ class SQLAlchemyRefreshTokenRepository(RefreshTokenRepositoryInterface):
         return RefreshToken(
             token=model.token,
             user_id=model.user_id,
-            expires_at=model.expires_at,
+            expires_at=_as_utc(model.expires_at),
             device_info=model.device_info,
             id=model.id,
-            created_at=model.created_at,
+            created_at=_as_utc(model.created_at),
             is_active=model.is_active,
-            last_used_at=model.last_used_at,
+            last_used_at=_as_utc(model.last_used_at),
+            family_id=model.family_id,
         )
@@ -0,0 +1,30 @@
+"""SQLAlchemy implementation of UnitOfWork."""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...domain import UnitOfWorkInterface
+from ..config.routing import pin_session_to_primary, session_needs_commit
+
+
+class SQLAlchemyUnitOfWork(UnitOfWorkInterface):
+    """
+    Unit of work over the request session.
+    
+    The user and refresh token repositories of a request share this session
+    and never commit on their own; the use case commits once through here.
+    Opening it pins their reads to the primary, so entities loaded to be
+    changed never come from a lagging replica.
+    """
+    
+    def __init__(self, session: AsyncSession):
+        self._session = session
+        pin_session_to_primary(session)
+    
+    async def commit(self) -> None:
+        """Commit the request transaction if anything was written."""
+        if session_needs_commit(self._session):
+            await self._session.commit()
+    
+    async def rollback(self) -> None:
+        """Roll back the request transaction."""
+        await self._session.rollback()
@@ -1,12 +1,20 @@
 """SQLAlchemy implementation of UserRepository."""
 
-from typing import List, Optional
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 from uuid import UUID
-from sqlalchemy import select, func, or_
+from sqlalchemy import Select, select, update, func, or_, tuple_, literal_column, text
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
 
 from ...domain import (
     UserRepositoryInterface, 
+    CountMode,
+    UserImportOutcome,
+    UserImportResult,
     User, 
     UserRole,
     Email,
@@ -15,17 +23,105 @@ from ...domain import (
     UserNotFoundError,
 )
 from ..models import UserModel
+from ..models.user_search import build_search_condition
+from ..config.routing import mark_session_written, session_reads_primary
+
+
+# Entity fields written by update(); id and created_at never change
+_UPDATABLE_FIELDS = (
+    "first_name",
+    "last_name",
+    "email",
+    "document_number",
+    "hashed_password",
+    "role",
+    "is_active",
+    "must_change_password",
+    "updated_at",
+    "last_login_at",
+    "deleted_at",
+    "phone",
+    "reset_password_token",
+    "reset_password_token_expires_at",
+    "token_version",
+)
+
+
+# Temporary table that COPY fills before the import is merged into users
+_IMPORT_STAGING_TABLE = "user_import_staging"
+# Users per executemany batch of imports on databases without COPY
+_IMPORT_BATCH_SIZE = 500
+
+
+def _import_merge_sql(columns: Sequence[str], update_columns: Sequence[str]) -> str:
+    """
+    Statement merging the staging table into users.
+    
+    Returns (row_index, outcome, user_id) for each staged user that was
+    created or, with ``update_columns``, updated; the others were skipped.
+    """
+    ctes = []
+    outcomes_sql = (
+        f"SELECT s.row_index, '{UserImportOutcome.CREATED.value}', i.id "
+        f"FROM inserted i JOIN {_IMPORT_STAGING_TABLE} s ON s.id = i.id"
+    )
+    if update_columns:
+        set_clause = ", ".join(f"{column} = s.{column}" for column in update_columns)
+        ctes.append(
+            f"matched AS ("
+            f"SELECT s.row_index, u.id AS user_id FROM {_IMPORT_STAGING_TABLE} s "
+            f"JOIN users u ON u.document_number = s.document_number "
+            f"WHERE NOT EXISTS (SELECT 1 FROM users o WHERE o.email = s.email AND o.id <> u.id))"
+        )
+        ctes.append(
+            f"updated AS ("
+            f"UPDATE users SET {set_clause} "
+            f"FROM matched m JOIN {_IMPORT_STAGING_TABLE} s ON s.row_index = m.row_index "
+            f"WHERE users.id = m.user_id RETURNING m.row_index, m.user_id)"
+        )
+        outcomes_sql += f" UNION ALL SELECT row_index, '{UserImportOutcome.UPDATED.value}', user_id FROM updated"
+    # ON CONFLICT catches users created concurrently since the statement's snapshot
+    ctes.append(
+        f"inserted AS ("
+        f"INSERT INTO users ({', '.join(columns)}) "
+        f"SELECT {', '.join(f's.{column}' for column in columns)} FROM {_IMPORT_STAGING_TABLE} s "
+        f"WHERE NOT EXISTS (SELECT 1 FROM users u WHERE u.email = s.email OR u.document_number = s.document_number) "
+        f"ON CONFLICT DO NOTHING RETURNING id)"
+    )
+    return f"WITH {', '.join(ctes)} {outcomes_sql}"
+
+
+class _ExplainJSON(Executable, ClauseElement):
+    """PostgreSQL ``EXPLAIN (FORMAT JSON)`` of a statement, keeping its bind parameters."""
+    
+    inherit_cache = False
+    
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_ExplainJSON, "postgresql")
+def _compile_explain_json(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
 
 
 class SQLAlchemyUserRepository(UserRepositoryInterface):
     """SQLAlchemy implementation of UserRepositoryInterface."""
     
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, read_session: Optional[AsyncSession] = None):
         self._session = session
+        self._replica_session = read_session
+    
+    @property
+    def _read_session(self) -> AsyncSession:
+        """Session for read-only queries; the primary once this request writes or will write."""
+        if self._replica_session is None or session_reads_primary(self._session):
+            return self._session
+        return self._replica_session
     
     def _model_to_entity(self, model: UserModel) -> User:
-        """Convert UserModel to User entity."""
-        return User(
+        """Convert UserModel to User entity, tracking changes from the loaded state."""
+        user = User(
             id=model.id,
             first_name=model.first_name,
             last_name=model.last_name,
@@ -40,7 +136,12 @@ class SQLAlchemyUserRepository(UserRepositoryInterface):
             updated_at=model.updated_at,
             last_login_at=model.last_login_at,
             deleted_at=model.deleted_at,
+            reset_password_token=model.reset_password_token,
+            reset_password_token_expires_at=model.reset_password_token_expires_at,
+            token_version=model.token_version,
         )
+        user.mark_clean()
+        return user
     
     def _entity_to_model(self, entity: User) -> UserModel:
         """Convert User entity to UserModel."""
@@ -58,6 +159,7 @@ class SQLAlchemyUserRepository(UserRepositoryInterface):
             created_at=entity.created_at,
             updated_at=entity.updated_at,
             last_login_at=entity.last_login_at,
+            token_version=entity.token_version,
         )
     
     async def create(self, user: User) -> User:
@@ -68,17 +170,179 @@ class SQLAlchemyUserRepository(UserRepositoryInterface):
         await self._session.refresh(model)
         return self._model_to_entity(model)
     
+    async def import_many(
+        self, users: Sequence[User], update_fields: Sequence[str] = ()
+    ) -> List[UserImportResult]:
+        """
+        Import users, skipping or updating those that clash with existing users.
+        
+        On PostgreSQL with asyncpg the users are COPYed into a temporary
+        staging table and merged into ``users`` with one statement; elsewhere
+        they are written with executemany batches.
+        """
+        # Identity fields are what an import matches on, so they are never overwritten
+        invalid = (set(update_fields) - set(_UPDATABLE_FIELDS)) | ({"email", "document_number"} & set(update_fields))
+        if invalid:
+            raise ValueError(f"Fields cannot be updated by an import: {', '.join(sorted(invalid))}")
+        if not users:
+            return []
+        rows = [
+            {"id": user.id, "created_at": user.created_at, **self._column_values(user)}
+            for user in users
+        ]
+        update_fields = frozenset(update_fields) | {"updated_at"} if update_fields else frozenset()
+        
+        connection = await self._session.connection()
+        if connection.dialect.driver == "asyncpg":
+            return await self._import_with_copy(connection, users, rows, update_fields)
+        return await self._import_in_batches(connection.dialect.name, users, rows, update_fields)
+    
+    async def _import_with_copy(self, connection, users, rows: List[dict], update_fields: frozenset) -> List[UserImportResult]:
+        """Stage the users with COPY and merge them into users in one statement."""
+        columns = list(rows[0])
+        # Opening the staging table through the session starts the transaction COPY joins
+        await connection.execute(text(
+            f"CREATE TEMPORARY TABLE {_IMPORT_STAGING_TABLE} "
+            f"(row_index integer NOT NULL, LIKE users INCLUDING DEFAULTS) ON COMMIT DROP"
+        ))
+        # Writes below bypass the ORM, so flag them for the commit at the end of the request
+        mark_session_written(self._session)
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            _IMPORT_STAGING_TABLE,
+            columns=["row_index", *columns],
+            records=[
+                # asyncpg sends enums by label, which SQLAlchemy makes the member name
+                (index, *(value.name if isinstance(value, UserRole) else value for value in row.values()))
+                for index, row in enumerate(rows)
+            ],
+        )
+        
+        update_columns = list(self._column_values(users[0], update_fields)) if update_fields else []
+        result = await connection.execute(text(_import_merge_sql(columns, update_columns)))
+        
+        outcomes = [UserImportResult(UserImportOutcome.SKIPPED)] * len(rows)
+        for index, outcome, user_id in result:
+            outcomes[index] = UserImportResult(UserImportOutcome(outcome), user_id)
+        # Another import in this transaction creates the table again
+        await connection.execute(text(f"DROP TABLE {_IMPORT_STAGING_TABLE}"))
+        return outcomes
+    
+    async def _import_in_batches(self, dialect_name: str, users, rows: List[dict], update_fields: frozenset) -> List[UserImportResult]:
+        """Import users with executemany INSERT ... ON CONFLICT DO NOTHING (and UPDATE) batches."""
+        dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+        outcomes = [UserImportResult(UserImportOutcome.SKIPPED)] * len(rows)
+        for start in range(0, len(rows), _IMPORT_BATCH_SIZE):
+            batch = range(start, min(start + _IMPORT_BATCH_SIZE, len(rows)))
+            to_insert = list(batch)
+            
+            if update_fields:
+                result = await self._session.execute(
+                    select(UserModel.id, UserModel.email, UserModel.document_number).where(or_(
+                        UserModel.email.in_([rows[i]["email"] for i in batch]),
+                        UserModel.document_number.in_([rows[i]["document_number"] for i in batch]),
+                    ))
+                )
+                email_owners: Dict[str, UUID] = {}
+                document_owners: Dict[str, UUID] = {}
+                for user_id, email, document_number in result:
+                    email_owners[email] = user_id
+                    document_owners[document_number] = user_id
+                
+                to_insert, updates = [], []
+                for i in batch:
+                    document_owner = document_owners.get(rows[i]["document_number"])
+                    email_owner = email_owners.get(rows[i]["email"])
+                    if document_owner is not None and email_owner in (None, document_owner):
+                        updates.append((i, {"id": document_owner, **self._column_values(users[i], update_fields)}))
+                    elif document_owner is None and email_owner is None:
+                        to_insert.append(i)
+                if updates:
+                    # Bulk UPDATE by primary key, one executemany
+                    await self._session.execute(update(UserModel), [values for _, values in updates])
+                    for i, values in updates:
+                        outcomes[i] = UserImportResult(UserImportOutcome.UPDATED, values["id"])
+            
+            if not to_insert:
+                continue
+            result = await self._session.execute(
+                dialect_insert(UserModel.__table__).on_conflict_do_nothing(), [rows[i] for i in to_insert]
+            )
+            if result.rowcount == len(to_insert):
+                created = to_insert
+            else:
+                # Some clashed with existing users; find out which were written
+                written = set((await self._session.execute(
+                    select(UserModel.id).where(UserModel.id.in_([rows[i]["id"] for i in to_insert]))
+                )).scalars())
+                created = [i for i in to_insert if rows[i]["id"] in written]
+            for i in created:
+                outcomes[i] = UserImportResult(UserImportOutcome.CREATED, rows[i]["id"])
+        return outcomes
+    
+    async def find_existing_identities(
+        self, emails: Sequence[str], document_numbers: Sequence[str]
+    ) -> Tuple[Set[str], Set[str]]:
+        """Find which of the given emails and document numbers are taken, in one query."""
+        if not emails and not document_numbers:
+            return set(), set()
+        emails = {email.lower() for email in emails}
+        document_numbers = {document_number.upper() for document_number in document_numbers}
+        result = await self._session.execute(
+            select(UserModel.email, UserModel.document_number).where(
+                or_(UserModel.email.in_(emails), UserModel.document_number.in_(document_numbers))
+            )
+        )
+        taken_emails, taken_documents = set(), set()
+        for email, document_number in result:
+            if email in emails:
+                taken_emails.add(email)
+            if document_number in document_numbers:
+                taken_documents.add(document_number)
+        return taken_emails, taken_documents
+    
     async def get_by_id(self, user_id: UUID) -> Optional[User]:
         """Get user by ID."""
-        result = await self._session.execute(
+        result = await self._read_session.execute(
             select(UserModel).where(UserModel.id == user_id)
         )
         model = result.scalar_one_or_none()
         return self._model_to_entity(model) if model else None
     
+    async def get_token_version(self, user_id: UUID) -> Optional[int]:
+        """Get the token version watermark of a user from the primary."""
+        result = await self._session.execute(
+            select(UserModel.token_version).where(UserModel.id == user_id)
+        )
+        return result.scalar_one_or_none()
+    
+    async def bump_token_version(self, user_id: UUID) -> Optional[int]:
+        """Increment the token version watermark of a user in SQL and return the new value."""
+        statement = (
+            update(UserModel)
+            .where(UserModel.id == user_id)
+            .values(token_version=UserModel.token_version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if self._session.get_bind().dialect.update_returning:
+            result = await self._session.execute(statement.returning(UserModel.token_version))
+            return result.scalar_one_or_none()
+        
+        result = await self._session.execute(statement)
+        if not result.rowcount:
+            return None
+        return await self.get_token_version(user_id)
+    
+    async def get_updated_at(self, user_id: UUID) -> Optional[datetime]:
+        """Get updated_at of a user by primary key without building the entity."""
+        result = await self._read_session.execute(
+            select(UserModel.updated_at).where(UserModel.id == user_id)
+        )
+        return result.scalar_one_or_none()
+    
     async def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email."""
-        result = await self._session.execute(
+        result = await self._read_session.execute(
             select(UserModel).where(UserModel.email == email.lower())
         )
         model = result.scalar_one_or_none()
@@ -86,40 +350,75 @@ class SQLAlchemyUserRepository(UserRepositoryInterface):
     
     async def get_by_document_number(self, document_number: str) -> Optional[User]:
         """Get user by document number."""
-        result = await self._session.execute(
+        result = await self._read_session.execute(
             select(UserModel).where(UserModel.document_number == document_number.upper())
         )
         model = result.scalar_one_or_none()
         return self._model_to_entity(model) if model else None
     
+    def _column_values(self, user: User, changed_fields: Optional[frozenset] = None) -> dict:
+        """Map entity fields to column values, limited to ``changed_fields`` when given."""
+        values = {}
+        for name in _UPDATABLE_FIELDS:
+            if changed_fields is not None and name not in changed_fields:
+                continue
+            if name == "email":
+                values["email"] = user.email.value
+            elif name == "document_number":
+                values["document_number"] = user.document_number.value
+                values["document_type"] = user.document_number.document_type.value
+            else:
+                values[name] = getattr(user, name)
+        return values
+    
     async def update(self, user: User) -> User:
-        """Update user."""
-        # Get existing model
-        result = await self._session.execute(
-            select(UserModel).where(UserModel.id == user.id)
+        """
+        Update user with a single ``UPDATE ... SET <changed columns>``.
+        
+        Entities loaded by this repository only write the fields changed since
+        they were loaded; entities built elsewhere write every column. The new
+        row comes back through RETURNING, or a follow-up SELECT on dialects
+        without UPDATE ... RETURNING.
+        
+        ``token_version`` is never written from the entity: a change to it is
+        applied as ``token_version + 1`` in SQL, as ``bump_token_version``
+        does, so an entity loaded before a concurrent bump cannot undo it.
+        """
+        changed_fields = user.changed_fields
+        if changed_fields is not None and not changed_fields:
+            return user
+        
+        values = self._column_values(user, changed_fields)
+        if values.pop("token_version", None) is not None and changed_fields is not None:
+            values["token_version"] = UserModel.token_version + 1
+        
+        statement = (
+            update(UserModel)
+            .where(UserModel.id == user.id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
         )
-        model = result.scalar_one_or_none()
+        
+        if self._session.get_bind().dialect.update_returning:
+            result = await self._session.execute(
+                statement.returning(UserModel),
+                execution_options={"populate_existing": True},
+            )
+            model = result.scalar_one_or_none()
+        else:
+            result = await self._session.execute(statement)
+            model = None
+            if result.rowcount:
+                model = (await self._session.execute(
+                    select(UserModel)
+                    .where(UserModel.id == user.id)
+                    .execution_options(populate_existing=True)
+                )).scalar_one_or_none()
         
         if not model:
             raise UserNotFoundError(str(user.id))
         
-        # Update fields
-        model.first_name = user.first_name
-        model.last_name = user.last_name
-        model.email = user.email.value
-        model.document_number = user.document_number.value
-        model.document_type = user.document_number.document_type.value
-        model.hashed_password = user.hashed_password
-        model.role = user.role
-        model.is_active = user.is_active
-        model.must_change_password = user.must_change_password
-        model.updated_at = user.updated_at
-        model.last_login_at = user.last_login_at
-        model.deleted_at = user.deleted_at  # PASO 4: Soft delete support
-        model.phone = user.phone  # PASO 4: Additional user field
-        
-        await self._session.flush()
-        await self._session.refresh(model)
+        user.mark_clean()
         return self._model_to_entity(model)
     
     async def delete(self, user_id: UUID) -> bool:
@@ -135,18 +434,14 @@ class SQLAlchemyUserRepository(UserRepositoryInterface):
         await self._session.delete(model)
         return True
     
-    async def list_users(
+    def _apply_filters(
         self,
-        offset: int = 0,
-        limit: int = 10,
+        query: Select,
         role: Optional[UserRole] = None,
         is_active: Optional[bool] = None,
         search_term: Optional[str] = None,
-    ) -> List[User]:
-        """List users with filtering and pagination."""
-        query = select(UserModel)
-        
-        # Apply filters
+    ) -> Select:
+        """Apply the user listing filters to a query."""
         if role:
             query = query.where(UserModel.role == role)
         
@@ -154,52 +449,134 @@ class SQLAlchemyUserRepository(UserRepositoryInterface):
             query = query.where(UserModel.is_active == is_active)
         
         if search_term:
-            search_pattern = f"%{search_term.lower()}%"
-            query = query.where(
-                or_(
-                    func.lower(UserModel.first_name).contains(search_pattern),
-                    func.lower(UserModel.last_name).contains(search_pattern),
-                    func.lower(UserModel.email).contains(search_pattern),
-                    UserModel.document_number.contains(search_term.upper()),
-                )
-            )
+            # Indexed search chosen by dialect (pg_trgm on PostgreSQL, FTS5 on SQLite)
+            dialect_name = self._read_session.get_bind().dialect.name
+            query = query.where(build_search_condition(search_term, dialect_name))
+        
+        return query
+    
+    async def list_users(
+        self,
+        offset: int = 0,
+        limit: int = 10,
+        role: Optional[UserRole] = None,
+        is_active: Optional[bool] = None,
+        search_term: Optional[str] = None,
+    ) -> List[User]:
+        """List users with filtering and pagination."""
+        query = self._apply_filters(select(UserModel), role, is_active, search_term)
         
-        # Apply pagination and ordering
-        query = query.order_by(UserModel.created_at.desc()).offset(offset).limit(limit)
+        # Apply pagination and ordering (id breaks ties so pages are stable)
+        query = (
+            query.order_by(UserModel.created_at.desc(), UserModel.id.desc())
+            .offset(offset)
+            .limit(limit)
+        )
         
-        result = await self._session.execute(query)
+        result = await self._read_session.execute(query)
         models = result.scalars().all()
         
         return [self._model_to_entity(model) for model in models]
     
-    async def count_users(
+    async def list_users_after(
         self,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        limit: int = 10,
         role: Optional[UserRole] = None,
         is_active: Optional[bool] = None,
         search_term: Optional[str] = None,
-    ) -> int:
-        """Count users with filtering."""
-        query = select(func.count(UserModel.id))
+    ) -> List[User]:
+        """List users with keyset pagination on the (created_at, id) index."""
+        query = self._apply_filters(select(UserModel), role, is_active, search_term)
         
-        # Apply same filters as list_users
-        if role:
-            query = query.where(UserModel.role == role)
+        if after is not None:
+            created_at, user_id = after
+            query = query.where(tuple_(UserModel.created_at, UserModel.id) < tuple_(created_at, user_id))
         
-        if is_active is not None:
-            query = query.where(UserModel.is_active == is_active)
+        query = query.order_by(UserModel.created_at.desc(), UserModel.id.desc()).limit(limit)
         
-        if search_term:
-            search_pattern = f"%{search_term.lower()}%"
-            query = query.where(
-                or_(
-                    func.lower(UserModel.first_name).contains(search_pattern),
-                    func.lower(UserModel.last_name).contains(search_pattern),
-                    func.lower(UserModel.email).contains(search_pattern),
-                    UserModel.document_number.contains(search_term.upper()),
-                )
+        result = await self._read_session.execute(query)
+        models = result.scalars().all()
+        
+        return [self._model_to_entity(model) for model in models]
+    
+    async def list_users_with_total(
+        self,
+        offset: int = 0,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        role: Optional[UserRole] = None,
+        is_active: Optional[bool] = None,
+        search_term: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
+    ) -> Tuple[List[User], Optional[int]]:
+        """List a page of users and the filtered total in a single statement."""
+        filtered = self._apply_filters(select(UserModel), role, is_active, search_term)
+        has_filters = bool(role or is_active is not None or search_term)
+        is_postgres = self._read_session.get_bind().dialect.name == "postgresql"
+        
+        total_column = None
+        if count_mode == CountMode.EXACT or (count_mode == CountMode.ESTIMATE and not is_postgres):
+            if after is None:
+                # Window count runs over the filtered set before OFFSET/LIMIT
+                total_column = func.count().over()
+            else:
+                total_column = self._apply_filters(
+                    select(func.count(UserModel.id)), role, is_active, search_term
+                ).scalar_subquery()
+        elif count_mode == CountMode.ESTIMATE and not has_filters:
+            total_column = literal_column(
+                "(SELECT reltuples::bigint FROM pg_class WHERE oid = 'users'::regclass)"
             )
         
-        result = await self._session.execute(query)
+        query = filtered
+        if total_column is not None:
+            query = query.add_columns(total_column.label("total"))
+        if after is not None:
+            created_at, user_id = after
+            query = query.where(tuple_(UserModel.created_at, UserModel.id) < tuple_(created_at, user_id))
+        else:
+            query = query.offset(offset)
+        query = query.order_by(UserModel.created_at.desc(), UserModel.id.desc()).limit(limit)
+        
+        result = await self._read_session.execute(query)
+        rows = result.all()
+        users = [self._model_to_entity(row[0]) for row in rows]
+        
+        if count_mode == CountMode.NONE:
+            return users, None
+        
+        total = rows[0].total if rows and total_column is not None else None
+        if total is None and count_mode == CountMode.ESTIMATE and is_postgres and has_filters:
+            total = await self._estimate_count(filtered)
+        if total is None or total < 0:
+            # Page past the end, or a table the planner has never analyzed
+            total = await self.count_users(role=role, is_active=is_active, search_term=search_term)
+        
+        return users, total
+    
+    async def _estimate_count(self, query: Select) -> Optional[int]:
+        """Get the planner's row estimate for a query without running it (PostgreSQL)."""
+        connection = await self._read_session.connection()
+        result = await connection.execute(_ExplainJSON(query))
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        try:
+            return int(plan[0]["Plan"]["Plan Rows"])
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None
+    
+    async def count_users(
+        self,
+        role: Optional[UserRole] = None,
+        is_active: Optional[bool] = None,
+        search_term: Optional[str] = None,
+    ) -> int:
+        """Count users with filtering."""
+        query = self._apply_filters(select(func.count(UserModel.id)), role, is_active, search_term)
+        
+        result = await self._read_session.execute(query)
         return result.scalar()
     
     async def exists_by_email(self, email: str) -> bool:
@@ -1,5 +1,7 @@
 from .auth import (
+    Principal,
     get_current_user,
+    get_current_principal,
     get_current_active_user,
     require_role,
     get_admin_user,
@@ -9,7 +11,9 @@ from .auth import (
 )
 
 __all__ = [
+    "Principal",
     "get_current_user",
+    "get_current_principal",
     "get_current_active_user", 
     "require_role",
     "get_admin_user",
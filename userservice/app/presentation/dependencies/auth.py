@@ -1,6 +1,7 @@
 """Authentication dependencies for FastAPI endpoints."""
 
-from typing import Annotated, List
+from datetime import datetime, timezone
+from typing import Annotated, Any, Awaitable, Callable, Dict, List, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from uuid import UUID
@@ -12,26 +13,86 @@ from app.domain.exceptions.user_exceptions import (
     UserNotFoundError,
     UserDomainException
 )
-from app.dependencies import get_token_service, get_user_repository
+from app.config import settings
+from app.dependencies import get_token_service, get_user_repository, get_principal_cache
 from app.application.interfaces.token_service_interface import TokenServiceInterface
+from app.application.interfaces.principal_cache_interface import PrincipalCacheInterface
 from app.domain.repositories.user_repository_interface import UserRepositoryInterface
 
 security = HTTPBearer()
 
 
+class Principal:
+    """
+    Authenticated caller as seen by authorization.
+    
+    Carries what role checks need; ``get_user`` loads the full entity only
+    for endpoints that actually use it.
+    """
+    
+    def __init__(
+        self,
+        id: UUID,
+        role: UserRole,
+        is_active: bool,
+        must_change_password: bool,
+        load_user: Callable[[], Awaitable[Optional[User]]],
+    ):
+        self.id = id
+        self.role = role
+        self.is_active = is_active
+        self.must_change_password = must_change_password
+        self._load_user = load_user
+        self._user: Optional[User] = None
+    
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        """Principal of an already loaded user."""
+        async def load_user() -> User:
+            return user
+        principal = cls(user.id, user.role, user.is_active, user.must_change_password, load_user)
+        principal._user = user
+        return principal
+    
+    async def get_user(self) -> User:
+        """Load the user entity (once per request)."""
+        if self._user is None:
+            self._user = await self._load_user()
+            if self._user is None:
+                raise UserNotFoundError(str(self.id))
+        return self._user
+
+
+async def _ensure_not_revoked(
+    token_service: TokenServiceInterface,
+    token: str,
+    payload: Dict[str, Any],
+    user_id: UUID,
+) -> None:
+    """Raise InvalidTokenError for logged-out tokens and tokens issued before a user-wide revocation."""
+    issued_at = datetime.fromtimestamp(payload.get("iat", 0), tz=timezone.utc)
+    if await token_service.is_token_revoked(token) or await token_service.is_user_token_revoked(user_id, issued_at):
+        raise InvalidTokenError("Token has been revoked")
+
+
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     token_service: Annotated[TokenServiceInterface, Depends(get_token_service)],
     user_repository: Annotated[UserRepositoryInterface, Depends(get_user_repository)],
+    principal_cache: Annotated[Optional[PrincipalCacheInterface], Depends(get_principal_cache)],
 ) -> User:
     """Dependency to get current authenticated user."""
     try:
         # Validar y decodificar el token
         payload = token_service.decode_token(credentials.credentials)
         user_id = UUID(payload.get("sub"))
+        await _ensure_not_revoked(token_service, credentials.credentials, payload, user_id)
         
-        # Obtener el usuario de la base de datos
-        user = await user_repository.get_by_id(user_id)
+        # Obtener el usuario de la caché de principales o de la base de datos
+        if principal_cache is not None:
+            user = await principal_cache.get_or_load(user_id, user_repository.get_by_id)
+        else:
+            user = await user_repository.get_by_id(user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -60,6 +121,95 @@ async def get_current_user(
         )
 
 
+async def _principal_from_claims(
+    token: str,
+    token_service: TokenServiceInterface,
+    user_repository: UserRepositoryInterface,
+    principal_cache: Optional[PrincipalCacheInterface],
+) -> Optional[Principal]:
+    """Principal built from the token claims, or None for tokens issued without them."""
+    try:
+        payload = token_service.decode_token(token)
+        token_version = payload.get("token_version")
+        if token_version is None:
+            return None
+        user_id = UUID(payload.get("sub"))
+        role = UserRole(payload.get("role"))
+        await _ensure_not_revoked(token_service, token, payload, user_id)
+        
+        # Marca de versión del usuario: cambia con rol, desactivación o contraseña
+        if principal_cache is not None:
+            current_version = await principal_cache.get_token_version(user_id, user_repository.get_token_version)
+        else:
+            current_version = await user_repository.get_token_version(user_id)
+    except InvalidTokenError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Error de autenticación",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    if current_version is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Usuario no encontrado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if current_version != token_version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token desactualizado, renueve la sesión",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    async def load_user() -> Optional[User]:
+        return await user_repository.get_by_id(user_id)
+    
+    return Principal(
+        user_id,
+        role,
+        is_active=payload.get("active", True),
+        must_change_password=payload.get("must_change_password", False),
+        load_user=load_user,
+    )
+
+
+async def get_current_principal(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    token_service: Annotated[TokenServiceInterface, Depends(get_token_service)],
+    user_repository: Annotated[UserRepositoryInterface, Depends(get_user_repository)],
+    principal_cache: Annotated[Optional[PrincipalCacheInterface], Depends(get_principal_cache)],
+) -> Principal:
+    """
+    Dependency to get the active principal used for role checks.
+    
+    With ``AUTH_CLAIMS_ONLY`` the principal comes from the token claims once
+    its ``token_version`` matches the user's watermark; otherwise (and for
+    tokens issued without those claims) the user is loaded.
+    """
+    principal = None
+    if settings.AUTH_CLAIMS_ONLY:
+        principal = await _principal_from_claims(
+            credentials.credentials, token_service, user_repository, principal_cache
+        )
+    if principal is None:
+        user = await get_current_user(credentials, token_service, user_repository, principal_cache)
+        principal = Principal.from_user(user)
+    
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Usuario inactivo"
+        )
+    return principal
+
+
 async def get_current_active_user(
     current_user: Annotated[User, Depends(get_current_user)]
 ) -> User:
@@ -75,8 +225,8 @@ async def get_current_active_user(
 def require_role(required_roles: List[UserRole]):
     """Dependency factory to require specific roles."""
     def role_checker(
-        current_user: Annotated[User, Depends(get_current_active_user)]
-    ) -> User:
+        current_user: Annotated[Principal, Depends(get_current_principal)]
+    ) -> Principal:
         if current_user.role not in required_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -88,28 +238,28 @@ def require_role(required_roles: List[UserRole]):
 
 # Role-specific dependencies
 async def get_admin_user(
-    current_user: Annotated[User, Depends(require_role([UserRole.ADMIN]))]
-) -> User:
+    current_user: Annotated[Principal, Depends(require_role([UserRole.ADMIN]))]
+) -> Principal:
     """Dependency to get admin user."""
     return current_user
 
 
 async def get_instructor_or_admin_user(
-    current_user: Annotated[User, Depends(require_role([UserRole.INSTRUCTOR, UserRole.ADMIN]))]
-) -> User:
+    current_user: Annotated[Principal, Depends(require_role([UserRole.INSTRUCTOR, UserRole.ADMIN]))]
+) -> Principal:
     """Dependency to get instructor or admin user."""
     return current_user
 
 
 async def get_administrative_or_admin_user(
-    current_user: Annotated[User, Depends(require_role([UserRole.ADMINISTRATIVE, UserRole.ADMIN]))]
-) -> User:
+    current_user: Annotated[Principal, Depends(require_role([UserRole.ADMINISTRATIVE, UserRole.ADMIN]))]
+) -> Principal:
     """Dependency to get administrative or admin user."""
     return current_user
 
 
 async def get_any_authenticated_user(
-    current_user: Annotated[User, Depends(get_current_active_user)]
-) -> User:
+    current_user: Annotated[Principal, Depends(get_current_principal)]
+) -> Principal:
     """Dependency to get any authenticated active user."""
     return current_user
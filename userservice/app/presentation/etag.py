@@ -0,0 +1,32 @@
+"""Strong ETags and If-None-Match handling for user resources."""
+
+import hashlib
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from fastapi import Response, status
+
+
+def user_etag(user_id: UUID, updated_at: datetime) -> str:
+    """Strong ETag of a user representation, derived from id and updated_at."""
+    if updated_at.tzinfo is not None:
+        updated_at = updated_at.astimezone(timezone.utc).replace(tzinfo=None)
+    digest = hashlib.blake2b(f"{user_id}:{updated_at.isoformat()}".encode(), digest_size=16)
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches ``etag`` (weak comparison, RFC 9110)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the current ETag."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
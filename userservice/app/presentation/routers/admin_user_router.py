@@ -1,7 +1,7 @@
 """Router for admin user management endpoints (PASO 4)."""
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Header, Response
+from typing import Annotated, AsyncIterator, Optional
 from uuid import UUID
 
 from app.dependencies import (
@@ -9,17 +9,22 @@ from app.dependencies import (
     get_admin_update_user_use_case,
     get_delete_user_use_case,
     get_bulk_upload_users_use_case,
+    get_start_bulk_upload_job_use_case,
+    get_get_bulk_upload_job_use_case,
 )
-from app.presentation.dependencies.auth import get_admin_user
-from app.domain.entities.user_entity import User
+from app.presentation.dependencies.auth import Principal, get_admin_user
+from app.presentation.etag import user_etag, etag_matches, not_modified
 from app.application.use_cases.user_use_cases import (
     GetUserDetailUseCase,
     AdminUpdateUserUseCase,
     DeleteUserUseCase,
     BulkUploadUsersUseCase,
+    StartBulkUploadJobUseCase,
+    GetBulkUploadJobUseCase,
 )
 from app.application.dtos.user_dtos import (
     AdminUpdateUserDTO,
+    BulkUploadJobDTO,
 )
 from app.presentation.schemas.user_schemas import (
     AdminUpdateUserRequest,
@@ -27,6 +32,7 @@ from app.presentation.schemas.user_schemas import (
     DeleteUserResponse,
     BulkUploadRequest,
     BulkUploadResponse,
+    BulkUploadJobResponse,
     MessageResponse,
 )
 
@@ -37,16 +43,28 @@ router = APIRouter(prefix="/admin/users", tags=["Admin - User Management"])
 async def get_user_detail(
     user_id: UUID,
     get_user_detail_use_case: Annotated[GetUserDetailUseCase, Depends(get_get_user_detail_use_case)],
-    current_user: Annotated[User, Depends(get_admin_user)]
+    current_user: Annotated[Principal, Depends(get_admin_user)],
+    response: Response,
+    if_none_match: Annotated[Optional[str], Header()] = None
 ):
     """
     Obtener información detallada de un usuario específico.
     Requiere permisos de ADMIN.
     
     HU-BE-013: Obtener Usuario Específico (Admin)
+    
+    Responde con ETag; con If-None-Match vigente devuelve 304 sin cargar el usuario.
     """
+    if if_none_match:
+        updated_at = await get_user_detail_use_case.get_updated_at(user_id)
+        if updated_at is not None:
+            etag = user_etag(user_id, updated_at)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+    
     try:
         user_detail = await get_user_detail_use_case.execute(user_id)
+        response.headers["ETag"] = user_etag(user_detail.id, user_detail.updated_at)
         
         # Generate HATEOAS links
         links = {
@@ -87,7 +105,7 @@ async def update_user(
     user_id: UUID,
     update_request: AdminUpdateUserRequest,
     admin_update_user_use_case: Annotated[AdminUpdateUserUseCase, Depends(get_admin_update_user_use_case)],
-    current_user: Annotated[User, Depends(get_admin_user)]
+    current_user: Annotated[Principal, Depends(get_admin_user)]
 ):
     """
     Actualizar información de un usuario.
@@ -148,7 +166,7 @@ async def update_user(
 async def delete_user(
     user_id: UUID,
     delete_user_use_case: Annotated[DeleteUserUseCase, Depends(get_delete_user_use_case)],
-    current_user: Annotated[User, Depends(get_admin_user)]
+    current_user: Annotated[Principal, Depends(get_admin_user)]
 ):
     """
     Eliminar (desactivar) un usuario del sistema.
@@ -183,7 +201,7 @@ async def delete_user(
 async def bulk_upload_users(
     upload_request: BulkUploadRequest,
     bulk_upload_use_case: Annotated[BulkUploadUsersUseCase, Depends(get_bulk_upload_users_use_case)],
-    current_user: Annotated[User, Depends(get_admin_user)]
+    current_user: Annotated[Principal, Depends(get_admin_user)]
 ):
     """
     Carga masiva de usuarios desde archivo CSV.
@@ -205,6 +223,8 @@ async def bulk_upload_users(
             failed=result.failed,
             errors=result.errors,
             created_users=result.created_users,
+            updated_users=result.updated_users,
+            truncated=result.truncated,
         )
         
     except Exception as e:
@@ -214,10 +234,16 @@ async def bulk_upload_users(
         )
 
 
+async def _read_upload_chunks(file: UploadFile, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """Leer el archivo subido por bloques en lugar de cargarlo completo en memoria."""
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
 @router.post("/upload-file", response_model=BulkUploadResponse)
 async def bulk_upload_users_file(
     bulk_upload_use_case: Annotated[BulkUploadUsersUseCase, Depends(get_bulk_upload_users_use_case)],
-    current_user: Annotated[User, Depends(get_admin_user)],
+    current_user: Annotated[Principal, Depends(get_admin_user)],
     file: UploadFile = File(..., description="CSV file with user data")
 ):
     """
@@ -234,12 +260,8 @@ async def bulk_upload_users_file(
                 detail="Only CSV files are allowed"
             )
         
-        # Read file content
-        content = await file.read()
-        csv_content = content.decode('utf-8')
-        
-        # Process upload
-        result = await bulk_upload_use_case.execute(csv_content)
+        # Process upload while the file is read in chunks
+        result = await bulk_upload_use_case.execute_stream(_read_upload_chunks(file))
         
         return BulkUploadResponse(
             message=result.message,
@@ -248,6 +270,8 @@ async def bulk_upload_users_file(
             failed=result.failed,
             errors=result.errors,
             created_users=result.created_users,
+            updated_users=result.updated_users,
+            truncated=result.truncated,
         )
         
     except HTTPException:
@@ -257,3 +281,88 @@ async def bulk_upload_users_file(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Error processing file upload: {str(e)}"
         )
+
+
+def _job_response(job: BulkUploadJobDTO) -> BulkUploadJobResponse:
+    return BulkUploadJobResponse(
+        id=job.id,
+        filename=job.filename,
+        status=job.status,
+        rows_processed=job.rows_processed,
+        successful=job.successful,
+        failed=job.failed,
+        errors=job.errors,
+        error_message=job.error_message,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+        finished_at=job.finished_at,
+    )
+
+
+@router.post("/upload/jobs", response_model=BulkUploadJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_bulk_upload_job(
+    upload_request: BulkUploadRequest,
+    start_job_use_case: Annotated[StartBulkUploadJobUseCase, Depends(get_start_bulk_upload_job_use_case)],
+    current_user: Annotated[Principal, Depends(get_admin_user)]
+):
+    """
+    Carga masiva de usuarios en segundo plano.
+    Requiere permisos de ADMIN.
+    
+    Responde de inmediato con el trabajo creado; el avance y los errores
+    se consultan en GET /admin/users/upload/{job_id}.
+    """
+    try:
+        job = await start_job_use_case.execute(
+            upload_request.file_content, upload_request.filename, current_user.id
+        )
+        return _job_response(job)
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Error processing bulk upload: {str(e)}"
+        )
+
+
+@router.post("/upload-file/jobs", response_model=BulkUploadJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_bulk_upload_file_job(
+    start_job_use_case: Annotated[StartBulkUploadJobUseCase, Depends(get_start_bulk_upload_job_use_case)],
+    current_user: Annotated[Principal, Depends(get_admin_user)],
+    file: UploadFile = File(..., description="CSV file with user data")
+):
+    """
+    Carga masiva en segundo plano desde archivo CSV subido directamente.
+    Requiere permisos de ADMIN.
+    """
+    if not file.filename.endswith('.csv'):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only CSV files are allowed"
+        )
+    
+    try:
+        job = await start_job_use_case.execute_stream(_read_upload_chunks(file), file.filename, current_user.id)
+        return _job_response(job)
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Error processing file upload: {str(e)}"
+        )
+
+
+@router.get("/upload/{job_id}", response_model=BulkUploadJobResponse)
+async def get_bulk_upload_job(
+    job_id: UUID,
+    get_job_use_case: Annotated[GetBulkUploadJobUseCase, Depends(get_get_bulk_upload_job_use_case)],
+    current_user: Annotated[Principal, Depends(get_admin_user)]
+):
+    """
+    Consultar el estado de una carga masiva en segundo plano.
+    Requiere permisos de ADMIN.
+    
+    Incluye las filas procesadas hasta el último bloque guardado y la lista de errores.
+    """
+    job = await get_job_use_case.execute(job_id)
+    return _job_response(job)
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Response
 from fastapi.security import OAuth2PasswordRequestForm
-from typing import Annotated
+from typing import Annotated, Optional
 
 from app.dependencies import (
     get_login_use_case,
@@ -42,6 +42,7 @@ from app.presentation.schemas.user_schemas import (
     ForceChangePasswordRequest,
 )
 from app.presentation.dependencies.auth import get_current_user, get_current_active_user
+from app.presentation.etag import user_etag, etag_matches, not_modified
 from app.domain.entities.user_entity import User
 from app.domain.exceptions.user_exceptions import (
     AuthenticationError,
@@ -50,6 +51,7 @@ from app.domain.exceptions.user_exceptions import (
     WeakPasswordError,
     UserInactiveError,
     InvalidPasswordError,
+    PasswordHashingOverloadedError,
 )
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -84,6 +86,12 @@ async def login(
             detail=str(e),
             headers={"WWW-Authenticate": "Bearer"}
         )
+    except PasswordHashingOverloadedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -112,13 +120,21 @@ async def logout(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_profile(
-    current_user: Annotated[User, Depends(get_current_active_user)]
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    response: Response,
+    if_none_match: Annotated[Optional[str], Header()] = None
 ):
     """
     Obtener el perfil del usuario autenticado.
+    Responde con ETag; con If-None-Match vigente devuelve 304 sin cuerpo.
     """
     from app.application.dtos.user_dtos import UserResponseDTO
     
+    etag = user_etag(current_user.id, current_user.updated_at)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    
     return UserResponseDTO(
         id=current_user.id,
         first_name=current_user.first_name,
@@ -322,6 +338,8 @@ async def reset_password(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except PasswordHashingOverloadedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -369,6 +387,8 @@ async def force_change_password(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except PasswordHashingOverloadedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Response
 from typing import Annotated, Optional
 from uuid import UUID
 
@@ -12,13 +12,16 @@ from app.dependencies import (
     get_change_password_use_case,
 )
 from app.presentation.dependencies.auth import (
+    Principal,
     get_admin_user,
     get_administrative_or_admin_user,
     get_instructor_or_admin_user,
     get_any_authenticated_user,
 )
-from app.domain.entities.user_entity import User
+from app.presentation.etag import user_etag, etag_matches, not_modified
 from app.domain.value_objects.user_role import UserRole
+from app.domain.exceptions.user_exceptions import InvalidCursorError, PasswordHashingOverloadedError
+from app.domain.repositories.user_repository_interface import CountMode
 from app.application.use_cases.user_use_cases import (
     CreateUserUseCase,
     GetUserByIdUseCase,
@@ -51,7 +54,7 @@ router = APIRouter(prefix="/users", tags=["Users"])
 async def create_user(
     user_request: CreateUserRequest,
     create_user_use_case: Annotated[CreateUserUseCase, Depends(get_create_user_use_case)],
-    current_user: Annotated[User, Depends(get_administrative_or_admin_user)]
+    current_user: Annotated[Principal, Depends(get_administrative_or_admin_user)]
 ):
     """
     Crear un nuevo usuario en el sistema.
@@ -71,6 +74,8 @@ async def create_user(
         result = await create_user_use_case.execute(user_dto)
         return result
         
+    except PasswordHashingOverloadedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -81,16 +86,20 @@ async def create_user(
 @router.get("/", response_model=UserListResponse)
 async def list_users(
     list_users_use_case: Annotated[ListUsersUseCase, Depends(get_list_users_use_case)],
-    current_user: Annotated[User, Depends(get_instructor_or_admin_user)],
+    current_user: Annotated[Principal, Depends(get_instructor_or_admin_user)],
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Page size"),
     role: Optional[str] = Query(None, description="Filter by role"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
-    search_term: Optional[str] = Query(None, description="Search in name, email, document")
+    search_term: Optional[str] = Query(None, description="Search in name, email, document"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from next_cursor (keyset pagination, ignores page)"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count mode: exact, estimate or none")
 ):
     """
     Listar usuarios con paginación y filtros.
     Requiere permisos de ADMIN, ADMINISTRATIVE o INSTRUCTOR.
+    
+    Soporta paginación por offset (page) y por cursor (cursor/next_cursor).
     """
     try:
         filters = UserFilterDTO(
@@ -99,9 +108,14 @@ async def list_users(
             search_term=search_term
         ) if any([role, is_active is not None, search_term]) else None
         
-        result = await list_users_use_case.execute(page, page_size, filters)
+        result = await list_users_use_case.execute(page, page_size, filters, cursor=cursor, count_mode=count)
         return result
         
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -113,14 +127,26 @@ async def list_users(
 async def get_user_by_id(
     user_id: UUID,
     get_user_use_case: Annotated[GetUserByIdUseCase, Depends(get_get_user_by_id_use_case)],
-    current_user: Annotated[User, Depends(get_instructor_or_admin_user)]
+    current_user: Annotated[Principal, Depends(get_instructor_or_admin_user)],
+    response: Response,
+    if_none_match: Annotated[Optional[str], Header()] = None
 ):
     """
     Obtener un usuario por su ID.
     Requiere permisos de ADMIN, ADMINISTRATIVE o INSTRUCTOR.
+    
+    Responde con ETag; con If-None-Match vigente devuelve 304 sin cargar el usuario.
     """
+    if if_none_match:
+        updated_at = await get_user_use_case.get_updated_at(user_id)
+        if updated_at is not None:
+            etag = user_etag(user_id, updated_at)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+    
     try:
         result = await get_user_use_case.execute(user_id)
+        response.headers["ETag"] = user_etag(result.id, result.updated_at)
         return result
         
     except Exception as e:
@@ -134,7 +160,7 @@ async def get_user_by_id(
 async def activate_user(
     user_id: UUID,
     activate_user_use_case: Annotated[ActivateUserUseCase, Depends(get_activate_user_use_case)],
-    current_user: Annotated[User, Depends(get_admin_user)]
+    current_user: Annotated[Principal, Depends(get_admin_user)]
 ):
     """
     Activar un usuario.
@@ -155,7 +181,7 @@ async def activate_user(
 async def deactivate_user(
     user_id: UUID,
     deactivate_user_use_case: Annotated[DeactivateUserUseCase, Depends(get_deactivate_user_use_case)],
-    current_user: Annotated[User, Depends(get_admin_user)]
+    current_user: Annotated[Principal, Depends(get_admin_user)]
 ):
     """
     Desactivar un usuario.
@@ -177,7 +203,7 @@ async def change_user_password(
     user_id: UUID,
     password_request: ChangePasswordRequest,
     change_password_use_case: Annotated[ChangePasswordUseCase, Depends(get_change_password_use_case)],
-    current_user: Annotated[User, Depends(get_any_authenticated_user)]
+    current_user: Annotated[Principal, Depends(get_any_authenticated_user)]
 ):
     """
     Cambiar la contraseña de un usuario.
@@ -200,7 +226,7 @@ async def change_user_password(
         await change_password_use_case.execute(user_id, password_dto)
         return MessageResponse(message="Password changed successfully")
         
-    except HTTPException:
+    except (HTTPException, PasswordHashingOverloadedError):
         raise
     except Exception as e:
         raise HTTPException(
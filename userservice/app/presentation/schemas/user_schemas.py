@@ -273,10 +273,12 @@ class UserListResponse(BaseModel):
     """Schema for paginated user list response."""
     
     users: List[UserResponse] = Field(..., description="List of users")
-    total: int = Field(..., description="Total number of users")
+    total: Optional[int] = Field(None, description="Total number of users (estimated when count_mode is 'estimate', null when 'none')")
     page: int = Field(..., description="Current page number")
     page_size: int = Field(..., description="Number of users per page")
-    total_pages: int = Field(..., description="Total number of pages")
+    total_pages: Optional[int] = Field(None, description="Total number of pages")
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page (keyset pagination)")
+    count_mode: str = Field("exact", description="How total was computed: exact, estimate or none")
     
     model_config = ConfigDict(
         json_schema_extra={
@@ -301,7 +303,9 @@ class UserListResponse(BaseModel):
                 "total": 100,
                 "page": 1,
                 "page_size": 10,
-                "total_pages": 10
+                "total_pages": 10,
+                "count_mode": "exact",
+                "next_cursor": "eyJjIjoiMjAyNC0wMS0wMVQxMDowMDowMCIsImkiOiIxMjNlNDU2Ny1lODliLTEyZDMtYTQ1Ni00MjY2MTQxNzQwMDAifQ"
             }
         }
     )
@@ -460,6 +464,8 @@ class BulkUploadResponse(BaseModel):
     failed: int = Field(..., description="Number of rows that failed")
     errors: List[dict] = Field(..., description="Detailed error information for failed rows")
     created_users: List[dict] = Field(..., description="Summary of successfully created users")
+    updated_users: List[dict] = Field(default_factory=list, description="Existing users whose fields were updated")
+    truncated: bool = Field(False, description="errors, created_users and updated_users list only their first rows; the counts cover every row")
     
     model_config = ConfigDict(
         json_schema_extra={
@@ -493,6 +499,46 @@ class BulkUploadResponse(BaseModel):
     )
 
 
+class BulkUploadJobResponse(BaseModel):
+    """Schema for the status of a background bulk upload job."""
+    
+    id: UUID = Field(..., description="Job ID")
+    filename: str = Field(..., description="Original filename")
+    status: str = Field(..., description="pending, running, completed or failed")
+    rows_processed: int = Field(..., description="CSV rows processed and committed so far")
+    successful: int = Field(..., description="Number of users created successfully")
+    failed: int = Field(..., description="Number of rows that failed")
+    errors: List[dict] = Field(..., description="Detailed error information for failed rows")
+    error_message: Optional[str] = Field(None, description="Why the job failed, if it did")
+    created_at: datetime = Field(..., description="When the upload was received")
+    updated_at: datetime = Field(..., description="Last progress update")
+    finished_at: Optional[datetime] = Field(None, description="When the job completed or failed")
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "id": "4f9c2b1e-8a7d-4c3b-9e6f-1a2b3c4d5e6f",
+                "filename": "usuarios.csv",
+                "status": "running",
+                "rows_processed": 1500,
+                "successful": 1497,
+                "failed": 3,
+                "errors": [
+                    {
+                        "row": 42,
+                        "error": "Email already exists: juan.perez@example.com",
+                        "data": {"email": "juan.perez@example.com", "document_number": "12345678"}
+                    }
+                ],
+                "error_message": None,
+                "created_at": "2024-01-01T16:00:00Z",
+                "updated_at": "2024-01-01T16:00:12Z",
+                "finished_at": None
+            }
+        }
+    )
+
+
 class DeleteUserResponse(BaseModel):
     """Schema for user deletion response."""
     
@@ -0,0 +1,53 @@
+"""Benchmark access token validation with and without the verified-token cache.
+
+Usage:
+    python benchmarks/bench_token_validate.py --tokens 100 --requests 200000
+
+Each simulated request validates a bearer token the way
+``ValidateTokenUseCase`` does (``is_token_valid``, ``is_token_revoked`` and
+``decode_token``), cycling over ``--tokens`` distinct tokens the way a
+gateway replays the same few tokens many times a minute.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.infrastructure.adapters.jwt_token_service import JWTTokenService  # noqa: E402
+
+
+async def validate(service: JWTTokenService, tokens: list, requests: int) -> float:
+    """Validations per second over ``requests`` simulated requests."""
+    started = time.perf_counter()
+    for i in range(requests):
+        token = tokens[i % len(tokens)]
+        if service.is_token_valid(token) and not await service.is_token_revoked(token):
+            service.decode_token(token)
+    return requests / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=100, help="distinct bearer tokens")
+    parser.add_argument("--requests", type=int, default=200000, help="validations to run")
+    args = parser.parse_args()
+
+    issuer = JWTTokenService(verified_cache_size=0)
+    tokens = [
+        issuer.create_access_token(uuid4(), "APPRENTICE", token_version=0)
+        for _ in range(args.tokens)
+    ]
+
+    for label, cache_size in (("no cache", 0), ("verified-token cache", 10000)):
+        service = JWTTokenService(verified_cache_size=cache_size)
+        rate = asyncio.run(validate(service, tokens, args.requests))
+        print(f"{label:>22}: {rate:>12,.0f} validations/s")
+
+
+if __name__ == "__main__":
+    main()
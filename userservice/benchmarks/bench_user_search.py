@@ -0,0 +1,106 @@
+"""Benchmark user search backends (LIKE scan vs indexed search).
+
+Usage:
+    python benchmarks/bench_user_search.py --users 100000
+    python benchmarks/bench_user_search.py --users 1000000 --database-url postgresql+asyncpg://...
+
+Without ``--database-url`` a temporary SQLite file is used. The table is
+seeded with synthetic users, then each search term is run through
+``SQLAlchemyUserRepository.list_users`` with every available backend.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.domain import UserRole  # noqa: E402
+from app.infrastructure.config.database import DatabaseConfig  # noqa: E402
+from app.infrastructure.models import UserModel  # noqa: E402
+from app.infrastructure.models.user_search import resolve_search_backend  # noqa: E402
+from app.infrastructure.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository  # noqa: E402
+
+FIRST_NAMES = ["Ana", "Carlos", "Lucia", "Mateo", "Sofia", "Juan", "Valentina", "Andres", "Camila", "Diego"]
+LAST_NAMES = ["Rojas", "Mendoza", "Garcia", "Lopez", "Martinez", "Gomez", "Diaz", "Torres", "Ramirez", "Vargas"]
+SEARCH_TERMS = ["rojas", "mendoza4", "user123456@", "10999", "zzz-no-match"]
+BATCH_SIZE = 10000
+
+
+async def seed(config: DatabaseConfig, total: int) -> None:
+    """Insert ``total`` synthetic users in batches."""
+    async with config.engine.begin() as conn:
+        for start in range(0, total, BATCH_SIZE):
+            rows = []
+            for i in range(start, min(start + BATCH_SIZE, total)):
+                rows.append({
+                    "id": uuid4(),
+                    "first_name": FIRST_NAMES[i % len(FIRST_NAMES)],
+                    "last_name": f"{LAST_NAMES[(i // 10) % len(LAST_NAMES)]}{i % 97}",
+                    "email": f"user{i}@example.com",
+                    "document_number": str(10000000 + i),
+                    "document_type": "CC",
+                    "hashed_password": "x",
+                    "role": UserRole.APPRENTICE,
+                })
+            await conn.execute(insert(UserModel), rows)
+
+
+async def time_search(config: DatabaseConfig, term: str, repeats: int) -> float:
+    """Median milliseconds for one search page plus its total."""
+    samples = []
+    for _ in range(repeats):
+        async with config.async_session_maker() as session:
+            repository = SQLAlchemyUserRepository(session)
+            started = time.perf_counter()
+            await repository.list_users_with_total(offset=0, limit=20, search_term=term)
+            samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    tmp_dir = None
+    database_url = args.database_url
+    if database_url is None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        database_url = f"sqlite+aiosqlite:///{os.path.join(tmp_dir.name, 'bench.db')}"
+
+    config = DatabaseConfig(database_url=database_url)
+    await config.drop_tables()
+    await config.create_tables()
+
+    started = time.perf_counter()
+    await seed(config, args.users)
+    print(f"seeded {args.users} users in {time.perf_counter() - started:.1f}s ({config.engine.dialect.name})")
+
+    indexed = resolve_search_backend(config.engine.dialect.name)
+    print(f"{'term':<16}{'like (ms)':>12}{indexed + ' (ms)':>16}")
+    for term in SEARCH_TERMS:
+        settings.USER_SEARCH_BACKEND = "like"
+        like_ms = await time_search(config, term, args.repeats)
+        settings.USER_SEARCH_BACKEND = "auto"
+        indexed_ms = await time_search(config, term, args.repeats)
+        print(f"{term:<16}{like_ms:>12.1f}{indexed_ms:>16.1f}")
+
+    await config.close()
+    if tmp_dir is not None:
+        tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,13 +1,29 @@
 """FastAPI application main module."""
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
+import math
 from datetime import datetime, timezone
 
-from app.infrastructure.config.database import engine, get_db_session, check_database_health
+from app.infrastructure.config.database import engine, database_config, get_db_session, check_database_health
+from app.infrastructure.config.routing import READ_YOUR_WRITES_COOKIE
+from app.dependencies import (
+    get_login_recorder,
+    get_principal_cache,
+    get_token_service,
+    get_revocation_store,
+    get_user_list_cache,
+    get_password_hash_pool,
+    get_breached_password_filter,
+    get_password_service,
+    get_bulk_upload_job_worker,
+)
+from app.config import settings
+from app.presentation.dependencies.auth import get_admin_user
 from app.presentation.routers import auth_router, user_router, admin_user_router
 from app.presentation.schemas.user_schemas import HealthCheckResponse, ErrorResponse
 from app.domain.exceptions.user_exceptions import (
@@ -17,7 +33,9 @@ from app.domain.exceptions.user_exceptions import (
     DocumentAlreadyExistsError,
     InvalidCredentialsError,
     InvalidTokenError,
-    WeakPasswordError
+    WeakPasswordError,
+    PasswordHashingOverloadedError,
+    BulkUploadJobNotFoundError,
 )
 
 logger = logging.getLogger(__name__)
@@ -28,9 +46,30 @@ async def lifespan(app: FastAPI):
     """Application lifespan context manager."""
     # Startup
     logger.info("Starting UserService application")
+    login_recorder = get_login_recorder()
+    if login_recorder is not None:
+        await login_recorder.start()
+    revocation_store = get_revocation_store()
+    await revocation_store.start()
+    password_hash_pool = get_password_hash_pool()
+    if password_hash_pool is not None:
+        await password_hash_pool.start()
+    if settings.PASSWORD_HASH_CALIBRATE:
+        # Calibrate before serving so no request waits on the measurement
+        await asyncio.to_thread(get_password_service)
+    bulk_upload_job_worker = get_bulk_upload_job_worker()
+    # Resumes bulk uploads interrupted by the previous shutdown
+    await bulk_upload_job_worker.start()
     yield
     # Shutdown
     logger.info("Shutting down UserService application")
+    await bulk_upload_job_worker.stop()
+    if password_hash_pool is not None:
+        await password_hash_pool.stop()
+    await revocation_store.stop()
+    if login_recorder is not None:
+        # Write buffered login timestamps before the engine goes away
+        await login_recorder.stop()
     await engine.dispose()
 
 
@@ -65,9 +104,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 
+@app.middleware("http")
+async def read_your_writes_cookie(request: Request, call_next):
+    """Hand clients that wrote the deadline until which their reads stay on the primary."""
+    response = await call_next(request)
+    primary_until = getattr(request.state, "db_primary_until", None)
+    if primary_until is not None:
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            f"{primary_until:.3f}",
+            max_age=math.ceil(database_config.read_your_writes.window_seconds),
+            httponly=True,
+            samesite="lax",
+        )
+    return response
+
+
 # Exception handlers
 @app.exception_handler(UserNotFoundError)
 async def user_not_found_handler(request: Request, exc: UserNotFoundError):
@@ -78,6 +134,15 @@ async def user_not_found_handler(request: Request, exc: UserNotFoundError):
     )
 
 
+@app.exception_handler(BulkUploadJobNotFoundError)
+async def bulk_upload_job_not_found_handler(request: Request, exc: BulkUploadJobNotFoundError):
+    """Handle bulk upload job not found exceptions."""
+    return JSONResponse(
+        status_code=404,
+        content={"detail": str(exc), "code": "BULK_UPLOAD_JOB_NOT_FOUND"}
+    )
+
+
 @app.exception_handler(EmailAlreadyExistsError)
 async def email_exists_handler(request: Request, exc: EmailAlreadyExistsError):
     """Handle email already exists exceptions."""
@@ -123,6 +188,16 @@ async def weak_password_handler(request: Request, exc: WeakPasswordError):
     )
 
 
+@app.exception_handler(PasswordHashingOverloadedError)
+async def password_hashing_overloaded_handler(request: Request, exc: PasswordHashingOverloadedError):
+    """Handle a full password hashing queue."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc), "code": "PASSWORD_HASHING_OVERLOADED"},
+        headers={"Retry-After": "1"}
+    )
+
+
 @app.exception_handler(UserDomainException)
 async def domain_exception_handler(request: Request, exc: UserDomainException):
     """Handle general domain exceptions."""
@@ -180,6 +255,49 @@ async def health_check():
         )
 
 
+@app.get("/health/pool", tags=["Health"], dependencies=[Depends(get_admin_user)])
+async def pool_stats():
+    """
+    Estadísticas en vivo del pool de conexiones a la base de datos (solo administradores).
+    """
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "pool": database_config.get_pool_stats(),
+    }
+
+
+@app.get("/health/cache", tags=["Health"], dependencies=[Depends(get_admin_user)])
+async def cache_stats():
+    """
+    Aciertos y fallos de las cachés usadas en la autenticación y el listado de usuarios
+    (solo administradores).
+    """
+    principal_cache = get_principal_cache()
+    user_list_cache = get_user_list_cache()
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "principal_cache": principal_cache.stats() if principal_cache is not None else {"backend": "none"},
+        "verified_tokens": get_token_service().get_verified_cache_stats(),
+        "revocations": get_revocation_store().stats(),
+        "user_list": user_list_cache.stats() if user_list_cache is not None else {"backend": "none"},
+    }
+
+
+@app.get("/health/hashing", tags=["Health"], dependencies=[Depends(get_admin_user)])
+async def hashing_stats():
+    """
+    Profundidad de la cola y tiempos de espera del pool de hashing de contraseñas,
+    y tamaño del filtro de contraseñas filtradas (solo administradores).
+    """
+    password_hash_pool = get_password_hash_pool()
+    breached_filter = get_breached_password_filter()
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "hashing": password_hash_pool.stats() if password_hash_pool is not None else {"backend": "threads"},
+        "breached_filter": breached_filter.stats() if breached_filter is not None else None,
+    }
+
+
 # Include routers
 app.include_router(auth_router, prefix="/api/v1")
 app.include_router(user_router, prefix="/api/v1")
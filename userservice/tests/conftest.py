@@ -4,9 +4,13 @@ Incluye fixtures para configuración de base de datos y autenticación.
 """
 
 import asyncio
+import os
 import pytest
 from fastapi.testclient import TestClient
 
+# Los tests usan el costo mínimo de bcrypt; el de producción viene del entorno
+os.environ.setdefault("PASSWORD_HASH_ROUNDS", "4")
+
 from main import app
 from app.infrastructure.config.database import database_config
 
@@ -56,3 +60,42 @@ async def db_tables_ready():
     except Exception as e:
         print(f"⚠️  Error al verificar/crear tablas: {e}")
     yield
+
+
+@pytest.fixture(scope="function")
+async def isolated_db_config(tmp_path):
+    """Configuración de base de datos SQLite aislada (archivo temporal) por test."""
+    from app.infrastructure.config.database import DatabaseConfig
+
+    config = DatabaseConfig(database_url=f"sqlite+aiosqlite:///{tmp_path / 'isolated.db'}")
+    await config.create_tables()
+    yield config
+    await config.close()
+
+
+@pytest.fixture
+def make_user():
+    """Fábrica de usuarios de prueba; los argumentos sobrescriben los valores por defecto."""
+    from app.domain.entities.user_entity import User
+    from app.domain.value_objects.document_number import DocumentNumber
+    from app.domain.value_objects.document_type import DocumentType
+    from app.domain.value_objects.email import Email
+    from app.domain.value_objects.user_role import UserRole
+
+    def factory(**overrides) -> User:
+        fields = {
+            "first_name": "Ana",
+            "last_name": "Rojas",
+            "email": "ana@example.com",
+            "document_number": "10203040",
+            "hashed_password": "hashed",
+            "role": UserRole.APPRENTICE,
+        }
+        fields.update(overrides)
+        if isinstance(fields["email"], str):
+            fields["email"] = Email(fields["email"])
+        if isinstance(fields["document_number"], str):
+            fields["document_number"] = DocumentNumber(fields["document_number"], DocumentType.CC)
+        return User(**fields)
+
+    return factory
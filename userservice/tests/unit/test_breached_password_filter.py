@@ -0,0 +1,67 @@
+"""Unit tests for password strength validation and the breached password filter."""
+
+import pytest
+
+from app.infrastructure.adapters.bcrypt_password_service import BcryptPasswordService
+from app.infrastructure.adapters.breached_password_filter import (
+    BreachedPasswordFilter,
+    build_breached_password_filter,
+)
+
+
+@pytest.fixture
+def breached_filter(tmp_path):
+    path = tmp_path / "breached.bloom"
+    words = ["Sena2024!", "Bogota#2023"] + [f"leaked-{i}" for i in range(5000)]
+    build_breached_password_filter(words, str(path), capacity=len(words))
+    bloom = BreachedPasswordFilter(str(path))
+    yield bloom
+    bloom.close()
+
+
+class TestValidatePasswordStrength:
+    """Test cases for the single-pass strength classifier."""
+
+    @pytest.mark.parametrize("password", ["Str0ng!Pass", "Ab1;xyzw", "Ñandú#2024X", "Xy9\\Plmo", "Password1!"])
+    def test_accepts_strong_passwords(self, password):
+        assert BcryptPasswordService(rounds=4).validate_password_strength(password)
+
+    @pytest.mark.parametrize("password", [
+        "",
+        "Ab1!xyz",        # Too short
+        "str0ng!pass",    # No uppercase
+        "STR0NG!PASS",    # No lowercase
+        "Strong!Pass",    # No digit
+        "Str0ngPass",     # No special character
+        "Str0ng!!!Pass",  # Repeated characters
+        "Ab!1234567",     # Sequential numbers
+        "Xy1!QWERTY",     # Keyboard row, case-insensitive
+    ])
+    def test_rejects_weak_passwords(self, password):
+        assert not BcryptPasswordService(rounds=4).validate_password_strength(password)
+
+
+class TestBreachedPasswordFilter:
+    """Test cases for the memory-mapped Bloom filter."""
+
+    def test_lookup_is_case_insensitive_and_bounded(self, breached_filter):
+        assert "Sena2024!" in breached_filter
+        assert "sena2024!" in breached_filter
+        assert all(f"leaked-{i}" in breached_filter for i in range(5000))
+
+        false_positives = sum(f"unseen-{i}" in breached_filter for i in range(5000))
+        assert false_positives < 50
+        assert breached_filter.stats()["entries"] == 5002
+
+    def test_service_rejects_breached_passwords(self, breached_filter):
+        service = BcryptPasswordService(rounds=4, breached_filter=breached_filter)
+
+        assert not service.validate_password_strength("Bogota#2023")
+        assert service.validate_password_strength("Bogota#2025x")
+
+    def test_rejects_files_that_are_not_filters(self, tmp_path):
+        path = tmp_path / "wordlist.txt"
+        path.write_text("password123\nletmein\n" * 10)
+
+        with pytest.raises(ValueError):
+            BreachedPasswordFilter(str(path))
@@ -0,0 +1,400 @@
+"""Unit tests for the chunked bulk upload pipeline."""
+
+import asyncio
+import base64
+import csv
+import io
+import os
+import uuid
+import pytest
+from unittest.mock import AsyncMock, Mock
+from sqlalchemy import delete, event, text
+from sqlalchemy.dialects import postgresql
+
+from app.application.interfaces import HashPriority
+from app.application.use_cases.csv_stream import MAX_RECORD_CHARS, iter_csv_records
+from app.application.use_cases.user_use_cases import BulkUploadUsersUseCase
+from app.domain import DEFERRED_PASSWORD_HASH, UserImportOutcome, UserImportResult
+from app.infrastructure.models import UserModel
+from app.infrastructure.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository, _import_merge_sql
+
+
+def _csv(rows: int) -> str:
+    lines = ["first_name,last_name,email,document_number,document_type,role"]
+    for i in range(rows):
+        lines.append(f"Ana,Rojas,user{i}@example.com,{10000000 + i},CC,apprentice")
+    return "\n".join(lines) + "\n"
+
+
+def _repository() -> AsyncMock:
+    user_repository = AsyncMock()
+    user_repository.find_existing_identities.return_value = (set(), set())
+    user_repository.import_many.side_effect = lambda users, update_fields=(): [
+        UserImportResult(UserImportOutcome.CREATED, user.id) for user in users
+    ]
+    return user_repository
+
+
+class ConcurrentHasher:
+    """Password service double recording how many hashes run at once."""
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.priorities = set()
+
+    async def hash_password_async(self, password, priority=HashPriority.INTERACTIVE):
+        self.priorities.add(priority)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.001)
+        self.running -= 1
+        return f"hashed-{password}"
+
+
+class TestBulkUploadPipeline:
+    """Test cases for validation, concurrent hashing and progress of bulk uploads."""
+
+    @pytest.mark.asyncio
+    async def test_hashes_each_chunk_concurrently_and_reports_progress(self):
+        user_repository = _repository()
+        hasher = ConcurrentHasher()
+        progress = AsyncMock()
+        use_case = BulkUploadUsersUseCase(user_repository, hasher, AsyncMock(), chunk_size=4)
+
+        result = await use_case.execute(_csv(10), progress=progress)
+
+        assert result.successful == 10
+        assert hasher.max_running == 4
+        assert hasher.priorities == {HashPriority.BATCH}
+        reports = [call.args[0] for call in progress.await_args_list]
+        assert [(report.processed, report.successful) for report in reports] == [(4, 4), (8, 8), (10, 10)]
+
+    @pytest.mark.asyncio
+    async def test_invalid_rows_are_not_hashed_and_errors_keep_row_order(self):
+        user_repository = _repository()
+        password_service = Mock()
+        password_service.hash_password_async = AsyncMock(side_effect=["h1", RuntimeError("worker died")])
+        use_case = BulkUploadUsersUseCase(user_repository, password_service, AsyncMock())
+        content = _csv(2) + "Luis,Mendoza,not-an-email,10203040,CC,apprentice\n"
+
+        result = await use_case.execute(content)
+
+        assert password_service.hash_password_async.await_count == 2
+        assert (result.successful, result.failed) == (1, 2)
+        assert [error["row"] for error in result.errors] == [3, 4]
+        assert result.errors[0]["error"] == "worker died"
+
+    @pytest.mark.asyncio
+    async def test_duplicates_of_earlier_chunks_name_their_row(self):
+        use_case = BulkUploadUsersUseCase(_repository(), ConcurrentHasher(), AsyncMock(), chunk_size=2)
+        content = _csv(4) + "Luis,Mendoza,USER1@example.com,20000000,CC,apprentice\n"
+        content += "Luis,Mendoza,luis@example.com,10000000,CC,apprentice\n"
+
+        result = await use_case.execute(content)
+        resumed = await use_case.execute(content, skip_rows=4)
+
+        expected = [
+            (6, "Email already exists in row 3: user1@example.com"),
+            (7, "Document number already exists in row 2: 10000000"),
+        ]
+        assert [(error["row"], error["error"]) for error in result.errors] == expected
+        assert [(error["row"], error["error"]) for error in resumed.errors] == expected
+
+    @pytest.mark.asyncio
+    async def test_result_lists_are_capped_but_counts_are_not(self):
+        use_case = BulkUploadUsersUseCase(
+            _repository(), ConcurrentHasher(), AsyncMock(), chunk_size=2, max_reported_rows=2
+        )
+        content = _csv(3) + "Luis,Mendoza,not-an-email,1,CC,apprentice\n" * 3
+
+        result = await use_case.execute(content)
+
+        assert (result.successful, result.failed) == (3, 3)
+        assert len(result.created_users) == 2
+        assert [error["row"] for error in result.errors] == [5, 6]
+        assert result.truncated
+        assert result.message == "Bulk upload completed: 3/6 users created successfully"
+
+    @pytest.mark.asyncio
+    async def test_every_row_error_is_listed_by_default(self):
+        use_case = BulkUploadUsersUseCase(_repository(), ConcurrentHasher(), AsyncMock())
+        content = _csv(0) + "Luis,Mendoza,not-an-email,1,CC,apprentice\n" * 1500
+
+        result = await use_case.execute(content)
+
+        assert result.failed == len(result.errors) == 1500
+        assert not result.truncated
+
+
+class TestBulkUploadStreaming:
+    """Test cases for reading uploads as a stream."""
+
+    @pytest.mark.asyncio
+    async def test_chunks_are_saved_while_the_upload_is_still_being_read(self):
+        user_repository = _repository()
+        content = _csv(6).replace("Ana", "Ñusta").encode()
+        chunks_read = []
+        saved_after_chunks = []
+
+        async def upload():
+            for start in range(0, len(content), 7):  # Splits multi-byte characters
+                chunks_read.append(start)
+                yield content[start:start + 7]
+
+        async def progress(report):
+            saved_after_chunks.append(len(chunks_read))
+
+        use_case = BulkUploadUsersUseCase(user_repository, ConcurrentHasher(), AsyncMock(), chunk_size=2)
+        result = await use_case.execute_stream(upload(), progress=progress)
+
+        assert result.successful == 6
+        assert all(user.first_name == "Ñusta" for user in user_repository.import_many.await_args.args[0])
+        assert saved_after_chunks[0] < len(chunks_read) / 2
+
+    @pytest.mark.asyncio
+    async def test_base64_content_and_quoted_newlines(self):
+        content = _csv(1) + '"Luis\nAlberto",Mendoza,luis@example.com,10203040,CC,apprentice\n'
+        use_case = BulkUploadUsersUseCase(_repository(), ConcurrentHasher(), AsyncMock())
+
+        result = await use_case.execute(base64.encodebytes(content.encode()).decode())
+
+        assert result.successful == 2
+        assert result.total_processed == 2
+
+
+    @pytest.mark.asyncio
+    async def test_records_split_across_chunks_parse_as_with_dict_reader(self):
+        content = _csv(1) + '"Luis ""Lucho""",Mendoza,"a,b",1,"x\r\ny"\r\nEva,Pa"z,,2\n' + '"Ana","Rojas"'
+
+        async def chunks():
+            for start in range(0, len(content), 3):
+                yield content[start:start + 3]
+
+        rows = [row async for row in iter_csv_records(chunks())]
+
+        assert rows == list(csv.DictReader(io.StringIO(content, newline="")))
+
+    @pytest.mark.asyncio
+    async def test_unterminated_quote_is_one_row_error_not_the_rest_of_the_file(self):
+        use_case = BulkUploadUsersUseCase(_repository(), ConcurrentHasher(), AsyncMock())
+        content = _csv(2) + 'Luis,"Mendoza,luis@example.com,10203040,CC,apprentice\n' + _csv(2000).split("\n", 1)[1]
+        assert len(content) > MAX_RECORD_CHARS
+
+        result = await use_case.execute(content)
+
+        assert (result.total_processed, result.successful, result.failed) == (3, 2, 1)
+        assert [(error["row"], error["data"]) for error in result.errors] == [(4, {})]
+        assert result.errors[0]["error"].startswith("Record longer than")
+
+
+class TestBulkUploadPersistence:
+    """Test cases for set-based duplicate checks and multi-row inserts on SQLite."""
+
+    @staticmethod
+    async def _seed_existing(session, make_user):
+        repository = SQLAlchemyUserRepository(session)
+        await repository.create(
+            make_user(first_name="Eva", last_name="Paz", email="user0@example.com", document_number="90000000")
+        )
+        await session.commit()
+
+    @pytest.mark.asyncio
+    async def test_duplicates_are_reported_per_row_and_valid_rows_inserted_together(self, isolated_db_config, make_user):
+        content = _csv(4) + "Luis,Mendoza,luis@example.com,10000002,CC,apprentice\n"
+        statements = []
+        event.listen(
+            isolated_db_config.engine.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement.split()[0].upper()),
+        )
+
+        async with isolated_db_config.async_session_maker() as session:
+            await self._seed_existing(session, make_user)
+            statements.clear()
+            use_case = BulkUploadUsersUseCase(
+                SQLAlchemyUserRepository(session), ConcurrentHasher(), AsyncMock(), chunk_size=100
+            )
+            result = await use_case.execute(content)
+            await session.commit()
+
+        assert (result.successful, result.failed) == (3, 2)
+        assert [(error["row"], error["error"]) for error in result.errors] == [
+            (2, "Email already exists: user0@example.com"),
+            (6, "Document number already exists in row 4: 10000002"),
+        ]
+        assert statements.count("SELECT") == 1
+        assert statements.count("INSERT") == 1
+
+    @pytest.mark.asyncio
+    async def test_conflicts_missed_by_the_check_are_skipped_by_the_import(self, isolated_db_config, make_user):
+        async with isolated_db_config.async_session_maker() as session:
+            await self._seed_existing(session, make_user)
+            repository = SQLAlchemyUserRepository(session)
+            # As if another upload created user0 between the check and the insert
+            repository.find_existing_identities = AsyncMock(return_value=(set(), set()))
+            use_case = BulkUploadUsersUseCase(repository, ConcurrentHasher(), AsyncMock())
+
+            result = await use_case.execute(_csv(3))
+            await session.commit()
+            total = await repository.count_users()
+
+        assert (result.successful, result.failed) == (2, 1)
+        assert result.errors[0]["row"] == 2
+        assert total == 3
+
+
+class TestBulkUploadImport:
+    """Test cases for set-based imports that skip or update existing users."""
+
+    @pytest.mark.asyncio
+    async def test_import_reports_the_outcome_of_each_user(self, isolated_db_config, make_user):
+        async with isolated_db_config.async_session_maker() as session:
+            repository = SQLAlchemyUserRepository(session)
+            eva = await repository.create(make_user(email="eva@example.com", document_number="90000000"))
+            await repository.create(make_user(email="leo@example.com", document_number="90000001"))
+            await session.commit()
+
+            results = await repository.import_many([
+                make_user(first_name="Eva", email="eva.new@example.com", document_number="90000000"),  # Same document
+                make_user(email="leo@example.com", document_number="90000000"),  # Email of another user
+                make_user(email="leo@example.com", document_number="10000000"),  # Email taken, document free
+                make_user(email="new@example.com", document_number="10000001"),
+            ], update_fields=["first_name"])
+            await session.commit()
+            updated = await repository.get_by_document_number("90000000")
+
+        assert [result.outcome for result in results] == [
+            UserImportOutcome.UPDATED,
+            UserImportOutcome.SKIPPED,
+            UserImportOutcome.SKIPPED,
+            UserImportOutcome.CREATED,
+        ]
+        assert [result.user_id for result in results[:3]] == [eva.id, None, None]
+        assert (updated.first_name, updated.email.value, updated.hashed_password) == ("Eva", "eva@example.com", "hashed")
+
+    @pytest.mark.asyncio
+    async def test_import_without_update_fields_skips_existing_users(self, isolated_db_config, make_user):
+        async with isolated_db_config.async_session_maker() as session:
+            repository = SQLAlchemyUserRepository(session)
+            await repository.create(make_user(email="eva@example.com", document_number="90000000"))
+            await session.commit()
+
+            results = await repository.import_many([
+                make_user(first_name="Eva", email="other@example.com", document_number="90000000"),
+                make_user(email="new@example.com", document_number="10000001"),
+            ])
+
+        assert [result.outcome for result in results] == [UserImportOutcome.SKIPPED, UserImportOutcome.CREATED]
+
+    @pytest.mark.asyncio
+    async def test_upload_updates_selected_fields_without_hashing(self, isolated_db_config, make_user):
+        async with isolated_db_config.async_session_maker() as session:
+            await TestBulkUploadPersistence._seed_existing(session, make_user)
+            repository = SQLAlchemyUserRepository(session)
+            existing = await repository.get_by_document_number("90000000")
+            hasher = ConcurrentHasher()
+            principal_cache = AsyncMock()
+            use_case = BulkUploadUsersUseCase(
+                repository, hasher, AsyncMock(), principal_cache=principal_cache, update_existing_fields=["first_name"]
+            )
+
+            result = await use_case.execute(_csv(2).replace("10000000", "90000000"))
+            await session.commit()
+
+        assert (result.successful, result.failed) == (2, 0)
+        assert [user["row"] for user in result.updated_users] == [2]
+        assert len(result.created_users) == 1
+        assert hasher.max_running == 1  # Only the new user's password was hashed
+        principal_cache.invalidate.assert_awaited_once_with(existing.id)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("defer_password_hash", [False, True])
+    async def test_user_gone_before_its_update_is_created_with_the_configured_hash(self, defer_password_hash):
+        user_repository = _repository()
+        # The user with this document number is deleted between the check and the import
+        user_repository.find_existing_identities.return_value = (set(), {"10000000"})
+        use_case = BulkUploadUsersUseCase(
+            user_repository,
+            ConcurrentHasher(),
+            AsyncMock(),
+            defer_password_hash=defer_password_hash,
+            update_existing_fields=["first_name"],
+        )
+
+        result = await use_case.execute(_csv(1))
+
+        assert result.successful == 1
+        created = user_repository.import_many.await_args.args[0][0]
+        if defer_password_hash:
+            assert created.hashed_password == DEFERRED_PASSWORD_HASH
+            user_repository.update.assert_not_awaited()
+        else:
+            assert created.hashed_password == "hashed-10000000"
+            user_repository.update.assert_awaited_once_with(created)
+
+    def test_only_profile_fields_can_be_updated(self):
+        with pytest.raises(ValueError):
+            BulkUploadUsersUseCase(_repository(), ConcurrentHasher(), AsyncMock(), update_existing_fields=["role"])
+
+
+class TestBulkUploadCopyImport:
+    """Test cases for the COPY-staged import used with asyncpg."""
+
+    def test_merge_statement_updates_matched_users_and_inserts_the_rest(self):
+        sql = _import_merge_sql(["id", "email", "document_number", "first_name"], ["first_name", "updated_at"])
+
+        compiled = str(text(sql).compile(dialect=postgresql.asyncpg.dialect()))
+
+        assert compiled.startswith("WITH matched AS (")
+        assert "UPDATE users SET first_name = s.first_name, updated_at = s.updated_at " in compiled
+        assert "RETURNING m.row_index, m.user_id)" in compiled
+        assert "INSERT INTO users (id, email, document_number, first_name) SELECT s.id, s.email," in compiled
+        assert "ON CONFLICT DO NOTHING RETURNING id)" in compiled
+        assert compiled.endswith(
+            "SELECT s.row_index, 'created', i.id FROM inserted i JOIN user_import_staging s ON s.id = i.id "
+            "UNION ALL SELECT row_index, 'updated', user_id FROM updated"
+        )
+
+    def test_merge_statement_without_update_columns_only_inserts(self):
+        sql = _import_merge_sql(["id", "email", "document_number"], [])
+
+        assert sql.startswith("WITH inserted AS (INSERT INTO users")
+        assert "updated" not in sql
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(
+        not os.environ.get("TEST_POSTGRES_URL"),
+        reason="Set TEST_POSTGRES_URL to a disposable PostgreSQL database (postgresql+asyncpg://...) to run",
+    )
+    async def test_import_with_copy_on_postgresql(self, make_user):
+        from app.infrastructure.config.database import DatabaseConfig
+
+        config = DatabaseConfig(database_url=os.environ["TEST_POSTGRES_URL"])
+        await config.create_tables()
+        suffix = uuid.uuid4().hex[:8]
+        document = str(int(suffix, 16) % 10**9 + 10**9)
+        users = [
+            make_user(first_name="Eva", email=f"eva.new.{suffix}@example.com", document_number=document),
+            make_user(email=f"new.{suffix}@example.com", document_number=str(int(document) + 1)),
+        ]
+        try:
+            async with config.async_session_maker() as session:
+                repository = SQLAlchemyUserRepository(session)
+                existing = await repository.create(make_user(email=f"eva.{suffix}@example.com", document_number=document))
+                await session.commit()
+
+                results = await repository.import_many(users, update_fields=["first_name"])
+                await session.commit()
+                updated = await repository.get_by_id(existing.id)
+
+            assert results == [
+                UserImportResult(UserImportOutcome.UPDATED, existing.id),
+                UserImportResult(UserImportOutcome.CREATED, users[1].id),
+            ]
+            assert (updated.first_name, updated.email.value) == ("Eva", f"eva.{suffix}@example.com")
+        finally:
+            async with config.async_session_maker() as session:
+                await session.execute(delete(UserModel).where(UserModel.email.like(f"%.{suffix}@example.com")))
+                await session.commit()
+            await config.close()
@@ -0,0 +1,168 @@
+"""Unit tests for background bulk upload jobs."""
+
+import asyncio
+import os
+import uuid
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+
+from app.application.use_cases.user_use_cases import BulkUploadUsersUseCase, GetBulkUploadJobUseCase
+from app.domain import BulkUploadJobStatus
+from app.domain.exceptions import BulkUploadJobNotFoundError
+from app.infrastructure.adapters import bulk_upload_job_worker
+from app.infrastructure.adapters.bulk_upload_job_worker import BulkUploadJobWorker
+from app.infrastructure.repositories.sqlalchemy_bulk_upload_job_repository import SQLAlchemyBulkUploadJobRepository
+from app.infrastructure.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+from tests.unit.test_bulk_upload import ConcurrentHasher, _csv
+
+
+async def _upload(content):
+    yield content.encode() if isinstance(content, str) else content
+
+
+def _worker(config, spool_dir, email_service=None) -> BulkUploadJobWorker:
+    def use_case_factory(session):
+        return BulkUploadUsersUseCase(
+            SQLAlchemyUserRepository(session), ConcurrentHasher(), email_service or AsyncMock(), chunk_size=2
+        )
+
+    return BulkUploadJobWorker(config.async_session_maker, use_case_factory, str(spool_dir))
+
+
+async def _get_job(config, job_id):
+    async with config.async_session_maker() as session:
+        return await SQLAlchemyBulkUploadJobRepository(session).get_by_id(job_id)
+
+
+async def _count_users(config) -> int:
+    async with config.async_session_maker() as session:
+        return await SQLAlchemyUserRepository(session).count_users()
+
+
+class TestBulkUploadJobWorker:
+    """Test cases for running, tracking and resuming background uploads."""
+
+    @pytest.mark.asyncio
+    async def test_job_runs_in_the_background_and_records_errors(self, isolated_db_config, tmp_path):
+        worker = _worker(isolated_db_config, tmp_path)
+        await worker.start()
+        content = _csv(4) + "Luis,Mendoza,not-an-email,10203040,CC,apprentice\n"
+
+        job = await worker.submit(_upload(content), "usuarios.csv", uuid.uuid4())
+        assert job.status == BulkUploadJobStatus.PENDING
+        await worker.join()
+        await worker.stop()
+
+        job = await _get_job(isolated_db_config, job.id)
+        assert job.status == BulkUploadJobStatus.COMPLETED
+        assert (job.rows_processed, job.successful, job.failed) == (5, 4, 1)
+        assert [error["row"] for error in job.errors] == [6]
+        assert job.finished_at is not None
+        assert os.listdir(tmp_path) == ["isolated.db"]
+
+    @pytest.mark.asyncio
+    async def test_interrupted_job_resumes_after_its_last_committed_chunk(self, isolated_db_config, tmp_path):
+        spool_dir = tmp_path / "jobs"
+        sent = []
+
+        async def send_welcome_email(**kwargs):
+            sent.append(kwargs["to_email"])
+            if len(sent) == 5:
+                raise asyncio.CancelledError()  # Shutdown while welcoming the third chunk
+
+        email_service = AsyncMock()
+        email_service.send_welcome_email.side_effect = send_welcome_email
+        worker = _worker(isolated_db_config, spool_dir, email_service)
+        await worker.start()
+        job = await worker.submit(_upload(_csv(7)), "usuarios.csv", uuid.uuid4())
+        await worker.join()
+        await worker.stop()
+
+        interrupted = await _get_job(isolated_db_config, job.id)
+        assert interrupted.status == BulkUploadJobStatus.RUNNING
+        assert (interrupted.rows_processed, interrupted.successful) == (6, 6)
+        assert await _count_users(isolated_db_config) == 6
+
+        sent.clear()
+        worker = _worker(isolated_db_config, spool_dir, email_service)
+        await worker.start()
+        await worker.join()
+        await worker.stop()
+
+        resumed = await _get_job(isolated_db_config, job.id)
+        assert resumed.status == BulkUploadJobStatus.COMPLETED
+        assert (resumed.rows_processed, resumed.successful, resumed.failed) == (7, 7, 0)
+        assert await _count_users(isolated_db_config) == 7
+        assert sent == ["user6@example.com"]  # Only the row committed by the resumed run
+
+    @pytest.mark.asyncio
+    async def test_unreadable_file_fails_the_job_after_saving_the_rows_before_the_error(
+        self, isolated_db_config, tmp_path, monkeypatch
+    ):
+        readable = _csv(4).encode()
+        monkeypatch.setattr(bulk_upload_job_worker, "_READ_CHUNK_BYTES", len(readable))
+        worker = _worker(isolated_db_config, tmp_path)
+        await worker.start()
+        content = readable + b"\xff\xfe\n" + _csv(1).split("\n", 1)[1].encode()
+
+        job = await worker.submit(_upload(content), "usuarios.csv", uuid.uuid4())
+        await worker.join()
+        await worker.stop()
+
+        job = await _get_job(isolated_db_config, job.id)
+        assert job.status == BulkUploadJobStatus.FAILED
+        assert job.error_message.startswith("CSV parsing error")
+        assert (job.rows_processed, job.successful, job.failed) == (4, 4, 1)
+        assert [error["row"] for error in job.errors] == [6]
+        assert await _count_users(isolated_db_config) == 4
+        assert os.listdir(tmp_path) == ["isolated.db"]
+
+    @pytest.mark.asyncio
+    async def test_workers_of_two_processes_run_a_job_once(self, isolated_db_config, tmp_path):
+        email_service = AsyncMock()
+        first = _worker(isolated_db_config, tmp_path, email_service)
+        second = _worker(isolated_db_config, tmp_path, email_service)
+        job = await first.submit(_upload(_csv(5)), "usuarios.csv", uuid.uuid4())
+
+        # The second process starts while the first one has the job queued
+        await asyncio.gather(first.start(), second.start())
+        await asyncio.gather(first.join(), second.join())
+        await asyncio.gather(first.stop(), second.stop())
+
+        job = await _get_job(isolated_db_config, job.id)
+        assert job.status == BulkUploadJobStatus.COMPLETED
+        assert (job.rows_processed, job.successful, job.failed) == (5, 5, 0)
+        assert await _count_users(isolated_db_config) == 5
+        assert email_service.send_welcome_email.await_count == 5
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("lease_expired", [False, True])
+    async def test_running_job_is_only_claimed_once_its_lease_expires(self, isolated_db_config, tmp_path, lease_expired):
+        job = await _worker(isolated_db_config, tmp_path).submit(_upload(_csv(3)), "usuarios.csv", uuid.uuid4())
+        async with isolated_db_config.async_session_maker() as session:
+            lease_until = datetime.utcnow() + timedelta(minutes=-1 if lease_expired else 5)
+            assert await SQLAlchemyBulkUploadJobRepository(session).claim(job.id, "other-process", lease_until)
+            await session.commit()
+
+        worker = _worker(isolated_db_config, tmp_path)
+        await worker.start()
+        await worker.join()
+        await worker.stop()
+
+        job = await _get_job(isolated_db_config, job.id)
+        if lease_expired:
+            assert job.status == BulkUploadJobStatus.COMPLETED
+            assert await _count_users(isolated_db_config) == 3
+        else:
+            assert (job.status, job.owner) == (BulkUploadJobStatus.RUNNING, "other-process")
+            assert await _count_users(isolated_db_config) == 0
+            assert os.path.exists(tmp_path / f"{job.id}.csv")  # Still needed by its owner
+
+    @pytest.mark.asyncio
+    async def test_unknown_job_is_not_found(self, isolated_db_config):
+        async with isolated_db_config.async_session_maker() as session:
+            use_case = GetBulkUploadJobUseCase(SQLAlchemyBulkUploadJobRepository(session))
+
+            with pytest.raises(BulkUploadJobNotFoundError):
+                await use_case.execute(uuid.uuid4())
@@ -0,0 +1,137 @@
+"""Unit tests for claims-only authorization with the token version watermark."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.config import settings
+from app.domain.entities.user_entity import User
+from app.domain.value_objects.user_role import UserRole
+from app.infrastructure.adapters.principal_cache import InMemoryPrincipalCache
+from app.infrastructure.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+from app.presentation.dependencies.auth import get_current_principal
+
+
+@pytest.fixture
+def claims_only(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_CLAIMS_ONLY", True)
+
+
+def _token_service(user: User, **claims) -> Mock:
+    token_service = Mock()
+    token_service.decode_token.return_value = {"sub": str(user.id), "role": user.role.value, **claims}
+    token_service.is_token_revoked = AsyncMock(return_value=False)
+    token_service.is_user_token_revoked = AsyncMock(return_value=False)
+    return token_service
+
+
+def _repository(user: User, token_version: int = 0) -> AsyncMock:
+    user_repository = AsyncMock()
+    user_repository.get_by_id.return_value = user
+    user_repository.get_token_version.return_value = token_version
+    return user_repository
+
+
+_CREDENTIALS = HTTPAuthorizationCredentials(scheme="Bearer", credentials="token")
+
+
+class TestTokenVersionBumps:
+    """Test cases for the User entity watermark."""
+
+    def test_role_change_deactivation_and_password_change_bump(self, make_user):
+        user = make_user()
+
+        user.change_role(UserRole.ADMIN)
+        user.change_role(UserRole.ADMIN)
+        user.deactivate()
+        user.activate()
+        user.change_password("new-hash")
+
+        assert user.token_version == 3
+
+    @pytest.mark.asyncio
+    async def test_repository_reads_persisted_version(self, isolated_db_config, make_user):
+        async with isolated_db_config.async_session_maker() as session:
+            repository = SQLAlchemyUserRepository(session)
+            user = await repository.create(make_user())
+            user.deactivate()
+            await repository.update(user)
+            await session.commit()
+
+            assert await repository.get_token_version(user.id) == 1
+            assert await repository.get_token_version(make_user().id) is None
+
+    @pytest.mark.asyncio
+    async def test_bumps_are_sql_increments(self, isolated_db_config, make_user):
+        async with isolated_db_config.async_session_maker() as session:
+            repository = SQLAlchemyUserRepository(session)
+            user = await repository.create(make_user())
+            stale = await repository.get_by_id(user.id)
+
+            assert await repository.bump_token_version(user.id) == 1
+            assert await repository.bump_token_version(make_user().id) is None
+
+            # Loaded before the bump: its own bump must add to it, not overwrite it
+            stale.deactivate()
+            updated = await repository.update(stale)
+            assert updated.token_version == 2
+
+            updated.activate()
+            await repository.update(updated)
+            assert await repository.get_token_version(user.id) == 2
+
+
+class TestClaimsOnlyPrincipal:
+    """Test cases for get_current_principal with AUTH_CLAIMS_ONLY."""
+
+    @pytest.mark.asyncio
+    async def test_authorizes_from_claims_without_loading_user(self, claims_only, make_user):
+        user = make_user(role=UserRole.INSTRUCTOR)
+        user_repository = _repository(user)
+        token_service = _token_service(user, active=True, must_change_password=False, token_version=0)
+        cache = InMemoryPrincipalCache()
+
+        for _ in range(3):
+            principal = await get_current_principal(_CREDENTIALS, token_service, user_repository, cache)
+
+        assert (principal.id, principal.role) == (user.id, UserRole.INSTRUCTOR)
+        user_repository.get_by_id.assert_not_awaited()
+        assert user_repository.get_token_version.await_count == 1
+        assert (await principal.get_user()) is user
+
+    @pytest.mark.asyncio
+    async def test_stale_token_version_is_rejected_after_invalidation(self, claims_only, make_user):
+        user = make_user()
+        user_repository = _repository(user)
+        token_service = _token_service(user, active=True, must_change_password=False, token_version=0)
+        cache = InMemoryPrincipalCache()
+        await get_current_principal(_CREDENTIALS, token_service, user_repository, cache)
+
+        # Role changed: the watermark moves on and the use case invalidates the entry
+        user_repository.get_token_version.return_value = 1
+        await cache.invalidate(user.id)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_principal(_CREDENTIALS, token_service, user_repository, cache)
+        assert exc_info.value.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_inactive_claim_is_forbidden(self, claims_only, make_user):
+        user = make_user()
+        token_service = _token_service(user, active=False, must_change_password=False, token_version=0)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_principal(_CREDENTIALS, token_service, _repository(user), InMemoryPrincipalCache())
+        assert exc_info.value.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_tokens_without_claims_load_the_user(self, claims_only, make_user):
+        user = make_user()
+        user_repository = _repository(user)
+
+        principal = await get_current_principal(_CREDENTIALS, _token_service(user), user_repository, None)
+
+        assert principal.id == user.id
+        user_repository.get_by_id.assert_awaited_once_with(user.id)
+        user_repository.get_token_version.assert_not_awaited()
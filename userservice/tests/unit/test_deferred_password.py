@@ -0,0 +1,70 @@
+"""Unit tests for bulk-uploaded users whose initial password is hashed on first login."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from app.application.dtos.user_dtos import LoginDTO
+from app.application.use_cases.auth_use_cases import LoginUseCase
+from app.application.use_cases.user_use_cases import BulkUploadUsersUseCase
+from app.domain import UserImportOutcome, UserImportResult
+from app.domain.entities.user_entity import DEFERRED_PASSWORD_HASH, User
+from app.domain.exceptions import AuthenticationError
+
+_CSV = (
+    "first_name,last_name,email,document_number,document_type,role\n"
+    "Ana,Rojas,ana@example.com,10203040,CC,apprentice\n"
+    "Luis,Mendoza,luis@example.com,10203041,CC,apprentice\n"
+)
+
+
+def _login_use_case(user: User):
+    user_repository = AsyncMock()
+    user_repository.get_by_email.return_value = user
+    password_service = Mock()
+    password_service.verify_password_async = AsyncMock()
+    password_service.hash_password_async = AsyncMock(return_value="$2b$12$" + "a" * 53)
+    use_case = LoginUseCase(user_repository, AsyncMock(), password_service, Mock(), AsyncMock())
+    return use_case, user_repository, password_service
+
+
+class TestDeferredPasswordHash:
+    """Test cases for deferring the initial password hash of bulk users."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_upload_skips_hashing(self):
+        user_repository = AsyncMock()
+        user_repository.find_existing_identities.return_value = (set(), set())
+        user_repository.import_many.return_value = [UserImportResult(UserImportOutcome.CREATED)] * 2
+        password_service = Mock()
+        password_service.hash_password_async = AsyncMock()
+        use_case = BulkUploadUsersUseCase(user_repository, password_service, AsyncMock(), defer_password_hash=True)
+
+        result = await use_case.execute(_CSV)
+
+        assert result.successful == 2
+        password_service.hash_password_async.assert_not_awaited()
+        created = user_repository.import_many.await_args.args[0]
+        assert all(user.has_deferred_password and user.must_change_password for user in created)
+
+    @pytest.mark.asyncio
+    async def test_first_login_hashes_the_document_number(self, make_user):
+        user = make_user(hashed_password=DEFERRED_PASSWORD_HASH)
+        user.mark_clean()
+        use_case, user_repository, password_service = _login_use_case(user)
+
+        await use_case.execute(LoginDTO(email="ana@example.com", password="10203040"))
+
+        password_service.verify_password_async.assert_not_awaited()
+        password_service.hash_password_async.assert_awaited_once_with("10203040")
+        assert not user.has_deferred_password
+        assert "hashed_password" in user_repository.update.await_args.args[0].changed_fields
+
+    @pytest.mark.asyncio
+    async def test_wrong_password_is_rejected_without_hashing(self, make_user):
+        use_case, user_repository, password_service = _login_use_case(make_user(hashed_password=DEFERRED_PASSWORD_HASH))
+
+        with pytest.raises(AuthenticationError):
+            await use_case.execute(LoginDTO(email="ana@example.com", password="10203041"))
+
+        password_service.hash_password_async.assert_not_awaited()
+        user_repository.update.assert_not_awaited()
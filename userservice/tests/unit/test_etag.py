@@ -0,0 +1,74 @@
+"""Unit tests for ETags and conditional GETs on user resources."""
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock
+from fastapi import Response
+
+from app.application.use_cases.user_use_cases import GetUserByIdUseCase
+from app.infrastructure.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+from app.presentation.etag import user_etag, etag_matches
+from app.presentation.routers.auth_router import get_current_user_profile
+from app.presentation.routers.user_router import get_user_by_id
+
+
+class TestUserEtag:
+    """Test cases for building and matching ETags."""
+
+    def test_etag_changes_with_updated_at(self, make_user):
+        user = make_user()
+
+        etag = user_etag(user.id, user.updated_at)
+
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag == user_etag(user.id, user.updated_at)
+        assert etag != user_etag(user.id, user.updated_at + timedelta(microseconds=1))
+
+    def test_if_none_match_lists_and_weak_tags(self, make_user):
+        etag = user_etag(make_user().id, datetime(2024, 1, 1))
+
+        assert etag_matches(f'"other", W/{etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
+
+
+class TestConditionalGet:
+    """Test cases for the conditional GET fast path."""
+
+    @pytest.mark.asyncio
+    async def test_matching_etag_skips_loading_the_user(self, isolated_db_config, make_user):
+        async with isolated_db_config.async_session_maker() as session:
+            repository = SQLAlchemyUserRepository(session)
+            user = await repository.create(make_user())
+            await session.commit()
+            repository.get_by_id = AsyncMock(wraps=repository.get_by_id)
+            use_case = GetUserByIdUseCase(repository)
+
+            response = Response()
+            await get_user_by_id(user.id, use_case, Mock(), response)
+            etag = response.headers["ETag"]
+            not_modified = await get_user_by_id(user.id, use_case, Mock(), Response(), if_none_match=etag)
+
+            assert not_modified.status_code == 304
+            assert not_modified.headers["ETag"] == etag
+            assert not_modified.body == b""
+            assert repository.get_by_id.await_count == 1
+
+            user.update_profile(first_name="Anabel")
+            await repository.update(user)
+            await session.commit()
+            response = Response()
+            result = await get_user_by_id(user.id, use_case, Mock(), response, if_none_match=etag)
+
+            assert result.first_name == "Anabel"
+            assert response.headers["ETag"] != etag
+
+    @pytest.mark.asyncio
+    async def test_me_returns_304_for_current_etag(self, make_user):
+        user = make_user()
+        etag = user_etag(user.id, user.updated_at)
+
+        result = await get_current_user_profile(user, Response(), if_none_match=etag)
+
+        assert result.status_code == 304
@@ -0,0 +1,49 @@
+"""Unit tests for access to the diagnostic health endpoints."""
+
+import pytest
+from unittest.mock import AsyncMock
+from uuid import uuid4
+from fastapi.testclient import TestClient
+
+from app.domain.value_objects.user_role import UserRole
+from app.presentation.dependencies import auth
+from main import app
+
+DIAGNOSTIC_PATHS = ["/health/pool", "/health/cache", "/health/hashing"]
+
+
+@pytest.fixture
+def client_as():
+    """Test client whose requests authenticate as a principal with the given role."""
+    def build(role: UserRole) -> TestClient:
+        principal = auth.Principal(uuid4(), role, True, False, AsyncMock())
+        app.dependency_overrides[auth.get_current_principal] = lambda: principal
+        return TestClient(app)
+
+    yield build
+    app.dependency_overrides.clear()
+
+
+class TestDiagnosticHealthEndpoints:
+    """Test cases for the admin-only pool, cache and hashing statistics."""
+
+    @pytest.mark.parametrize("path", DIAGNOSTIC_PATHS)
+    def test_anonymous_requests_are_rejected(self, path):
+        response = TestClient(app).get(path)
+
+        assert response.status_code in (401, 403)
+        assert "pool" not in response.json()
+
+    @pytest.mark.parametrize("path", DIAGNOSTIC_PATHS)
+    def test_non_admin_requests_are_forbidden(self, client_as, path):
+        assert client_as(UserRole.INSTRUCTOR).get(path).status_code == 403
+
+    @pytest.mark.parametrize("path", DIAGNOSTIC_PATHS)
+    def test_admin_requests_get_the_statistics(self, client_as, path):
+        response = client_as(UserRole.ADMIN).get(path)
+
+        assert response.status_code == 200
+        assert "timestamp" in response.json()
+
+    def test_plain_health_check_stays_public(self):
+        assert TestClient(app).get("/health").status_code in (200, 503)
@@ -0,0 +1,61 @@
+"""Unit tests for the verified-token cache of JWTTokenService."""
+
+import pytest
+from unittest.mock import Mock
+from uuid import uuid4
+from jwt.exceptions import InvalidTokenError
+
+from app.infrastructure.adapters import jwt_token_service
+from app.infrastructure.adapters.jwt_token_service import JWTTokenService
+
+
+@pytest.fixture
+def service():
+    return JWTTokenService(verified_cache_size=2)
+
+
+class TestVerifiedTokenCache:
+    """Test cases for caching verified claims."""
+
+    def test_repeated_decode_is_served_from_cache(self, service):
+        token = service.create_access_token(uuid4(), "ADMIN")
+
+        first = service.decode_token(token)
+        first["role"] = "APPRENTICE"
+        second = service.decode_token(token)
+
+        assert second["role"] == "ADMIN"
+        assert service.get_verified_cache_stats()["hits"] == 1
+        assert service.get_verified_cache_stats()["misses"] == 1
+
+    def test_entries_expire_at_token_exp(self, service, monkeypatch):
+        token = service.create_access_token(uuid4(), "ADMIN")
+        exp = service.decode_token(token)["exp"]
+
+        monkeypatch.setattr(jwt_token_service, "time", Mock(time=Mock(return_value=exp + 1)))
+        service.decode_token(token)
+
+        assert service.get_verified_cache_stats()["misses"] == 2
+
+    def test_cache_is_bounded(self, service):
+        for _ in range(3):
+            service.decode_token(service.create_access_token(uuid4(), "ADMIN"))
+
+        assert service.get_verified_cache_stats()["size"] == 2
+
+    @pytest.mark.asyncio
+    async def test_revoked_token_is_evicted(self, service):
+        token = service.create_access_token(uuid4(), "ADMIN")
+        service.decode_token(token)
+
+        await service.revoke_token(token)
+
+        assert service.get_verified_cache_stats()["size"] == 0
+        assert await service.is_token_revoked(token)
+
+    def test_tampered_token_is_still_rejected(self, service):
+        token = service.create_access_token(uuid4(), "ADMIN")
+        service.decode_token(token)
+
+        with pytest.raises(InvalidTokenError):
+            service.decode_token(token[:-2] + ("AA" if not token.endswith("AA") else "BB"))
@@ -0,0 +1,117 @@
+"""Unit tests for the write-behind login recorder."""
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock
+from sqlalchemy import event
+
+from app.application.dtos.user_dtos import LoginDTO
+from app.application.use_cases.auth_use_cases import LoginUseCase
+from app.infrastructure.adapters.write_behind_login_recorder import WriteBehindLoginRecorder
+from app.infrastructure.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+
+
+@pytest.fixture
+async def user_ids(isolated_db_config, make_user):
+    """Ids of five users stored in the isolated database."""
+    async with isolated_db_config.async_session_maker() as session:
+        repository = SQLAlchemyUserRepository(session)
+        users = [await repository.create(make_user(email=f"aprendiz{i}@example.com", document_number=f"{10000000 + i}")) for i in range(5)]
+        await session.commit()
+    return [user.id for user in users]
+
+
+@pytest.fixture
+def updates(isolated_db_config):
+    """Record the UPDATE statements sent to the isolated database."""
+    executed = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE"):
+            executed.append(statement)
+
+    event.listen(isolated_db_config.engine.sync_engine, "before_cursor_execute", _record)
+    yield executed
+    event.remove(isolated_db_config.engine.sync_engine, "before_cursor_execute", _record)
+
+
+async def _last_logins(config, user_ids):
+    async with config.async_session_maker() as session:
+        repository = SQLAlchemyUserRepository(session)
+        return [(await repository.get_by_id(user_id)).last_login_at for user_id in user_ids]
+
+
+class TestWriteBehindLoginRecorder:
+    """Test cases for batching login timestamps."""
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_all_users_in_one_update(self, isolated_db_config, user_ids, updates):
+        recorder = WriteBehindLoginRecorder(isolated_db_config.async_session_maker)
+        logged_in_at = datetime(2025, 3, 3, 7, 0, 0)
+        for offset, user_id in enumerate(user_ids):
+            await recorder.record_login(user_id, logged_in_at + timedelta(seconds=offset))
+
+        written = await recorder.flush()
+
+        assert written == 5
+        assert len(updates) == 1
+        assert recorder.pending == 0
+        assert await _last_logins(isolated_db_config, user_ids) == [
+            logged_in_at + timedelta(seconds=offset) for offset in range(5)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_repeated_logins_collapse_and_batches_are_bounded(self, isolated_db_config, user_ids, updates):
+        recorder = WriteBehindLoginRecorder(isolated_db_config.async_session_maker, max_batch=2)
+        first, latest = datetime(2025, 3, 3, 7, 0, 0), datetime(2025, 3, 3, 7, 5, 0)
+        await recorder.record_login(user_ids[0], first)
+        for user_id in user_ids:
+            await recorder.record_login(user_id, latest)
+
+        await recorder.flush()
+
+        assert len(updates) == 3
+        assert await _last_logins(isolated_db_config, user_ids) == [latest] * 5
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_buffered_logins(self, isolated_db_config, user_ids):
+        recorder = WriteBehindLoginRecorder(isolated_db_config.async_session_maker, flush_interval_ms=60000)
+        await recorder.start()
+        logged_in_at = datetime(2025, 3, 3, 7, 0, 0)
+        await recorder.record_login(user_ids[0], logged_in_at)
+
+        await recorder.stop()
+
+        assert recorder.pending == 0
+        assert (await _last_logins(isolated_db_config, user_ids[:1])) == [logged_in_at]
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_timestamps(self, user_ids):
+        failing_session_maker = Mock(side_effect=RuntimeError("database unavailable"))
+        recorder = WriteBehindLoginRecorder(failing_session_maker)
+        await recorder.record_login(user_ids[0], datetime(2025, 3, 3, 7, 0, 0))
+
+        assert await recorder.flush() == 0
+        assert recorder.pending == 1
+
+
+class TestLoginUseCaseWithRecorder:
+    """Test cases for LoginUseCase using the write-behind recorder."""
+
+    @pytest.mark.asyncio
+    async def test_login_queues_timestamp_instead_of_updating_user(self, make_user):
+        user = make_user()
+        user_repository = AsyncMock()
+        user_repository.get_by_email.return_value = user
+        password_service = Mock()
+        password_service.verify_password_async = AsyncMock(return_value=True)
+        password_service.needs_rehash.return_value = False
+        token_service = Mock()
+        token_service.create_access_token.return_value = "access-token"
+        login_recorder = AsyncMock()
+        use_case = LoginUseCase(user_repository, AsyncMock(), password_service, token_service, login_recorder)
+
+        await use_case.execute(LoginDTO(email="ana@example.com", password="Secret123!"))
+
+        user_repository.update.assert_not_called()
+        login_recorder.record_login.assert_awaited_once_with(user.id, user.last_login_at)
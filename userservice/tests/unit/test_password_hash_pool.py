@@ -0,0 +1,166 @@
+"""Unit tests for the prioritized password hashing pool."""
+
+import asyncio
+import threading
+import uuid
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, Mock
+from fastapi.testclient import TestClient
+
+from app import dependencies
+from app.application.interfaces import HashPriority
+from app.domain.exceptions import PasswordHashingOverloadedError
+from app.domain.value_objects.user_role import UserRole
+from app.infrastructure.adapters.password_hash_pool import PasswordHashPool
+from app.presentation.dependencies import auth
+from main import app
+
+
+@pytest.fixture
+def gate():
+    """Event that holds the single worker busy until the test sets it."""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+async def _wait_queued(pool: PasswordHashPool, depth: int) -> None:
+    while pool.queue_depth < depth:
+        await asyncio.sleep(0.001)
+
+
+class TestPasswordHashPool:
+    """Test cases for scheduling, bounds and metrics."""
+
+    @pytest.mark.asyncio
+    async def test_interactive_jobs_run_before_queued_batch_jobs(self, gate):
+        pool = PasswordHashPool(workers=1, executor=ThreadPoolExecutor(1))
+        order = []
+        blocker = asyncio.create_task(pool.run(gate.wait, priority=HashPriority.BATCH))
+        await asyncio.sleep(0.01)
+
+        batch = [asyncio.create_task(pool.run(order.append, f"batch-{i}", priority=HashPriority.BATCH)) for i in range(3)]
+        await _wait_queued(pool, 3)
+        login = asyncio.create_task(pool.run(order.append, "login"))
+        await _wait_queued(pool, 4)
+        gate.set()
+        await asyncio.gather(blocker, login, *batch)
+        await pool.stop()
+
+        assert order == ["login", "batch-0", "batch-1", "batch-2"]
+        stats = pool.stats()["priorities"]
+        assert stats["interactive"]["completed"] == 1
+        assert stats["batch"]["completed"] == 4
+        assert stats["batch"]["wait_seconds_max"] > 0
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects_interactive_and_holds_batch(self, gate):
+        pool = PasswordHashPool(workers=1, max_queue=4, executor=ThreadPoolExecutor(1))
+        blocker = asyncio.create_task(pool.run(gate.wait))
+        await asyncio.sleep(0.01)
+
+        batch = [asyncio.create_task(pool.run(abs, -i, priority=HashPriority.BATCH)) for i in range(3)]
+        await asyncio.sleep(0.01)
+        assert pool.queue_depth == 2  # Batch jobs may fill only half the queue
+
+        interactive = [asyncio.create_task(pool.run(abs, -i)) for i in range(2)]
+        await _wait_queued(pool, 4)
+        with pytest.raises(PasswordHashingOverloadedError):
+            await pool.run(abs, -1)
+
+        gate.set()
+        results = await asyncio.gather(*batch, *interactive)
+        await blocker
+        await pool.stop()
+
+        assert results == [0, 1, 2, 0, 1]
+        assert pool.stats()["priorities"]["interactive"]["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_jobs_run_in_worker_processes(self):
+        pool = PasswordHashPool(workers=1)
+        try:
+            assert await pool.run(pow, 2, 10) == 1024
+        finally:
+            await pool.stop()
+
+
+    @pytest.mark.parametrize("web_concurrency,expected", [(1, 8), (3, 2), (16, 1)])
+    def test_default_workers_split_the_cores_between_server_processes(self, monkeypatch, web_concurrency, expected):
+        monkeypatch.setattr(dependencies.os, "cpu_count", lambda: 8)
+        monkeypatch.setattr(dependencies.settings, "PASSWORD_HASH_WORKERS", None)
+        monkeypatch.setattr(dependencies.settings, "WEB_CONCURRENCY", web_concurrency)
+        dependencies.get_password_hash_pool.cache_clear()
+        try:
+            assert dependencies.get_password_hash_pool().stats()["workers"] == expected
+        finally:
+            dependencies.get_password_hash_pool.cache_clear()
+
+
+@pytest.fixture
+def overloaded_client():
+    """Client whose password-hashing use cases all report a full queue."""
+    user_id = uuid.uuid4()
+    principal = auth.Principal(user_id, UserRole.ADMIN, True, False, AsyncMock())
+    overloaded = AsyncMock()
+    overloaded.execute.side_effect = PasswordHashingOverloadedError()
+    app.dependency_overrides.update({
+        auth.get_administrative_or_admin_user: lambda: principal,
+        auth.get_any_authenticated_user: lambda: principal,
+        auth.get_current_user: lambda: Mock(id=user_id),
+        dependencies.get_create_user_use_case: lambda: overloaded,
+        dependencies.get_change_password_use_case: lambda: overloaded,
+        dependencies.get_reset_password_use_case: lambda: overloaded,
+        dependencies.get_force_change_password_use_case: lambda: overloaded,
+    })
+    try:
+        yield TestClient(app), user_id
+    finally:
+        app.dependency_overrides.clear()
+
+
+def _assert_overloaded(response):
+    assert response.status_code == 503
+    assert response.json()["code"] == "PASSWORD_HASHING_OVERLOADED"
+    assert response.headers["Retry-After"] == "1"
+
+
+class TestOverloadedEndpoints:
+    """Test cases for endpoints that hash passwords answering 503 when the pool is full."""
+
+    def test_create_user(self, overloaded_client):
+        client, _ = overloaded_client
+
+        _assert_overloaded(client.post("/api/v1/users/", json={
+            "first_name": "Ana",
+            "last_name": "Rojas",
+            "email": "ana@example.com",
+            "document_number": "10203040",
+            "document_type": "CC",
+            "password": "Secret123!",
+            "role": "instructor",
+        }))
+
+    def test_change_user_password(self, overloaded_client):
+        client, user_id = overloaded_client
+
+        _assert_overloaded(client.patch(f"/api/v1/users/{user_id}/change-password", json={
+            "current_password": "Secret123!",
+            "new_password": "NewSecret456!",
+        }))
+
+    def test_reset_password(self, overloaded_client):
+        client, _ = overloaded_client
+
+        _assert_overloaded(client.post("/api/v1/auth/reset-password", json={
+            "token": "reset-token",
+            "new_password": "NewSecret456!",
+        }))
+
+    def test_force_change_password(self, overloaded_client):
+        client, _ = overloaded_client
+
+        _assert_overloaded(client.post("/api/v1/auth/force-change-password", json={
+            "new_password": "NewSecret456!",
+        }))
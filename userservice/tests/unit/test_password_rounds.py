@@ -0,0 +1,77 @@
+"""Unit tests for the configurable bcrypt cost and rehash on login."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from app.application.dtos.user_dtos import LoginDTO
+from app.application.use_cases.auth_use_cases import LoginUseCase
+from app.infrastructure.adapters import bcrypt_password_service
+from app.infrastructure.adapters.bcrypt_password_service import BcryptPasswordService, calibrate_bcrypt_rounds
+
+# bcrypt.hashpw(b"x", bcrypt.gensalt(10)) and bcrypt.hashpw(b"x", bcrypt.gensalt(12))
+_COST_10 = "$2b$10$5MY/AKeW..J65qRv6xLCxO5.ZM4IAiyN3H18gaqTA8n2idQsiWwQK"
+_COST_12 = "$2b$12$mNYWDhFJ1n.lGQqDE8sGzuKdG64Np1EGz10wH0h69rnWSPgKVwRlC"
+
+
+class TestBcryptCost:
+    """Test cases for the cost policy of BcryptPasswordService."""
+
+    def test_hashes_of_another_cost_need_rehash(self):
+        service = BcryptPasswordService(rounds=12)
+
+        assert service.rounds == 12
+        assert not service.needs_rehash(_COST_12)
+        assert service.needs_rehash(_COST_10)
+        assert BcryptPasswordService(rounds=10).needs_rehash(_COST_12)
+
+    def test_calibrated_cost_only_rehashes_weaker_hashes(self):
+        service = BcryptPasswordService(rounds=11, allow_higher_rounds=True)
+
+        assert not service.needs_rehash(_COST_12)
+        assert service.needs_rehash(_COST_10)
+
+
+class TestCalibration:
+    """Test cases for picking the cost from a target latency."""
+
+    @pytest.mark.parametrize("target_ms,expected", [(50, 10), (250, 12), (390, 12), (10000, 16)])
+    def test_highest_cost_within_target(self, monkeypatch, target_ms, expected):
+        # Fake host where cost 10 takes 50 ms and each step up doubles it
+        clock = Mock(now=0.0)
+        monkeypatch.setattr(bcrypt_password_service, "time", Mock(perf_counter=lambda: clock.now))
+
+        def fake_hash(password, rounds):
+            clock.now += 0.05 * 2 ** (rounds - 10)
+
+        monkeypatch.setattr(bcrypt_password_service, "_hash_password", fake_hash)
+
+        assert calibrate_bcrypt_rounds(target_ms) == expected
+
+
+class TestRehashOnLogin:
+    """Test cases for LoginUseCase upgrading stored hashes."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("needs_rehash", [True, False])
+    async def test_login_rehashes_only_outdated_hashes(self, needs_rehash, make_user):
+        user = make_user(hashed_password=_COST_10)
+        user.mark_clean()
+        user_repository = AsyncMock()
+        user_repository.get_by_email.return_value = user
+        password_service = Mock()
+        password_service.verify_password_async = AsyncMock(return_value=True)
+        password_service.needs_rehash.return_value = needs_rehash
+        password_service.hash_password_async = AsyncMock(return_value=_COST_12)
+        login_recorder = AsyncMock()
+        use_case = LoginUseCase(user_repository, AsyncMock(), password_service, Mock(), login_recorder)
+
+        await use_case.execute(LoginDTO(email="ana@example.com", password="Secret123!"))
+
+        if needs_rehash:
+            password_service.hash_password_async.assert_awaited_once_with("Secret123!")
+            user_repository.update.assert_awaited_once()
+            assert "hashed_password" in user_repository.update.await_args.args[0].changed_fields
+        else:
+            password_service.hash_password_async.assert_not_awaited()
+            user_repository.update.assert_not_awaited()
+        assert user.token_version == 0
@@ -0,0 +1,195 @@
+"""Unit tests for the principal cache used by get_current_user."""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.application.use_cases.user_use_cases import DeactivateUserUseCase
+from app.domain.entities.user_entity import User
+from app.domain.value_objects.user_role import UserRole
+from app.infrastructure.adapters.principal_cache import InMemoryPrincipalCache, RedisPrincipalCache
+from app.presentation.dependencies.auth import get_current_user
+
+
+class FakeRedis:
+    """The subset of redis.asyncio.Redis the cache uses, kept in a dict."""
+
+    def __init__(self):
+        self.data = {}
+        self.fail = False
+
+    async def get(self, key):
+        if self.fail:
+            raise ConnectionError("redis unavailable")
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None):
+        if self.fail:
+            raise ConnectionError("redis unavailable")
+        self.data[key] = value.encode()
+
+    async def delete(self, *keys):
+        if self.fail:
+            raise ConnectionError("redis unavailable")
+        for key in keys:
+            self.data.pop(key, None)
+
+
+def _loader(*users: User, delay: float = 0):
+    by_id = {user.id: user for user in users}
+
+    async def load(user_id):
+        await asyncio.sleep(delay)
+        return by_id.get(user_id)
+
+    return AsyncMock(side_effect=load)
+
+
+class TestInMemoryPrincipalCache:
+    """Test cases for the per-process backend."""
+
+    @pytest.mark.asyncio
+    async def test_second_lookup_is_a_hit(self, make_user):
+        user = make_user()
+        loader = _loader(user)
+        cache = InMemoryPrincipalCache()
+
+        await cache.get_or_load(user.id, loader)
+        cached = await cache.get_or_load(user.id, loader)
+
+        assert loader.await_count == 1
+        assert (cached.id, cached.email, cached.role, cached.is_active) == (user.id, user.email, user.role, True)
+        assert cached.changed_fields == frozenset()
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_load_once(self, make_user):
+        user = make_user()
+        loader = _loader(user, delay=0.01)
+        cache = InMemoryPrincipalCache()
+
+        results = await asyncio.gather(*(cache.get_or_load(user.id, loader) for _ in range(10)))
+
+        assert loader.await_count == 1
+        assert {result.id for result in results} == {user.id}
+        assert cache.stats()["coalesced"] == 9
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_and_size_is_bounded(self, make_user):
+        users = [make_user(email=f"ana{i}@example.com", document_number=f"{10203040 + i}") for i in range(3)]
+        loader = _loader(*users)
+        cache = InMemoryPrincipalCache(ttl_seconds=0.05, max_entries=2)
+
+        for user in users:
+            await cache.get_or_load(user.id, loader)
+        assert cache.stats()["size"] == 2
+
+        await asyncio.sleep(0.06)
+        await cache.get_or_load(users[2].id, loader)
+
+        assert loader.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_unknown_users_are_not_cached(self, make_user):
+        loader = _loader()
+        cache = InMemoryPrincipalCache()
+        user_id = make_user().id
+
+        assert await cache.get_or_load(user_id, loader) is None
+        assert await cache.get_or_load(user_id, loader) is None
+        assert loader.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidation_during_load_is_not_overwritten(self, make_user):
+        user = make_user()
+        loader = _loader(user, delay=0.02)
+        cache = InMemoryPrincipalCache()
+
+        load = asyncio.create_task(cache.get_or_load(user.id, loader))
+        await asyncio.sleep(0.005)
+        await cache.invalidate(user.id)
+        await load
+        await cache.get_or_load(user.id, loader)
+
+        assert loader.await_count == 2
+
+
+class TestRedisPrincipalCache:
+    """Test cases for the Redis backend."""
+
+    @pytest.mark.asyncio
+    async def test_workers_share_entries_and_invalidations(self, make_user):
+        redis = FakeRedis()
+        user = make_user()
+        loader = _loader(user)
+        worker_a, worker_b = RedisPrincipalCache(redis), RedisPrincipalCache(redis)
+
+        await worker_a.get_or_load(user.id, loader)
+        await worker_b.get_or_load(user.id, loader)
+        assert loader.await_count == 1
+
+        await worker_a.invalidate(user.id)
+        await worker_b.get_or_load(user.id, loader)
+        assert loader.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_password_hash_is_not_stored(self, make_user):
+        redis = FakeRedis()
+        user = make_user(role=UserRole.INSTRUCTOR)
+        await RedisPrincipalCache(redis).get_or_load(user.id, _loader(user))
+
+        stored = json.loads(next(iter(redis.data.values())))
+        assert "hashed_password" not in stored
+        assert stored["role"] == UserRole.INSTRUCTOR.value
+
+    @pytest.mark.asyncio
+    async def test_unreachable_redis_falls_back_to_loader(self, make_user):
+        redis = FakeRedis()
+        redis.fail = True
+        user = make_user()
+        cache = RedisPrincipalCache(redis)
+
+        assert (await cache.get_or_load(user.id, _loader(user))).id == user.id
+        assert cache.stats()["errors"] == 2
+
+
+class TestPrincipalCacheIntegration:
+    """Test cases for get_current_user and use case invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_get_current_user_skips_repository_on_hit(self, make_user):
+        user = make_user()
+        token_service = Mock()
+        token_service.decode_token.return_value = {"sub": str(user.id)}
+        token_service.is_token_revoked = AsyncMock(return_value=False)
+        token_service.is_user_token_revoked = AsyncMock(return_value=False)
+        user_repository = AsyncMock()
+        user_repository.get_by_id.return_value = user
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="token")
+        cache = InMemoryPrincipalCache()
+
+        for _ in range(3):
+            current = await get_current_user(credentials, token_service, user_repository, cache)
+
+        assert current.id == user.id
+        assert user_repository.get_by_id.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_deactivation_commits_then_invalidates(self, make_user):
+        user = make_user()
+        user_repository = AsyncMock()
+        user_repository.get_by_id.return_value = user
+        user_repository.update.side_effect = lambda updated: updated
+        calls = Mock()
+        unit_of_work, principal_cache = AsyncMock(), AsyncMock()
+        calls.attach_mock(unit_of_work.commit, "commit")
+        calls.attach_mock(principal_cache.invalidate, "invalidate")
+        use_case = DeactivateUserUseCase(user_repository, AsyncMock(), principal_cache, unit_of_work)
+
+        await use_case.execute(user.id)
+
+        assert [call[0] for call in calls.mock_calls] == ["commit", "invalidate"]
+        principal_cache.invalidate.assert_awaited_once_with(user.id)
@@ -0,0 +1,132 @@
+"""Unit tests for primary/replica read routing."""
+
+import time
+import pytest
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.infrastructure.config.database import DatabaseConfig
+from app.infrastructure.config.routing import READ_YOUR_WRITES_COOKIE, ReadYourWritesTracker, get_routing_key
+from app.infrastructure.repositories.sqlalchemy_unit_of_work import SQLAlchemyUnitOfWork
+from app.infrastructure.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+from main import read_your_writes_cookie
+
+
+def _make_request(headers=None) -> Request:
+    raw_headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "headers": raw_headers, "client": ("10.0.0.7", 5000)})
+
+
+class TestReadYourWritesTracker:
+    """Test cases for read-your-writes stickiness."""
+
+    def test_client_is_sticky_inside_window(self):
+        tracker = ReadYourWritesTracker(window_seconds=60)
+
+        tracker.mark_write("client-a")
+
+        assert tracker.is_sticky("client-a") is True
+        assert tracker.is_sticky("client-b") is False
+
+    def test_stickiness_expires(self):
+        tracker = ReadYourWritesTracker(window_seconds=-1)
+
+        tracker.mark_write("client-a")
+
+        assert tracker.is_sticky("client-a") is False
+
+    def test_tracker_is_bounded(self):
+        tracker = ReadYourWritesTracker(window_seconds=60, max_entries=2)
+
+        for key in ("a", "b", "c"):
+            tracker.mark_write(key)
+
+        assert tracker.is_sticky("a") is False
+        assert tracker.is_sticky("c") is True
+
+    def test_cookie_keeps_client_sticky_in_other_processes(self):
+        deadline = ReadYourWritesTracker(window_seconds=60).mark_write("client-a")
+        other_process = ReadYourWritesTracker(window_seconds=60)
+
+        assert other_process.is_sticky("client-a") is False
+        assert other_process.is_sticky("client-a", f"{deadline:.3f}") is True
+        assert other_process.is_sticky(None, f"{time.time() - 1:.3f}") is False
+        assert other_process.is_sticky(None, f"{time.time() + 3600:.3f}") is False  # Beyond the window
+        assert other_process.is_sticky(None, "garbage") is False
+
+    @pytest.mark.asyncio
+    async def test_write_hands_out_the_cookie(self):
+        request = _make_request()
+        request.state.db_primary_until = time.time() + 5
+
+        async def call_next(request):
+            return Response()
+
+        response = await read_your_writes_cookie(request, call_next)
+
+        assert response.headers["set-cookie"].startswith(f"{READ_YOUR_WRITES_COOKIE}=")
+        unchanged = await read_your_writes_cookie(_make_request(), call_next)
+        assert "set-cookie" not in unchanged.headers
+
+    def test_routing_key_prefers_authorization_header(self):
+        with_token = get_routing_key(_make_request({"Authorization": "Bearer abc"}))
+        without_token = get_routing_key(_make_request())
+
+        assert with_token != without_token
+        assert without_token == "host:10.0.0.7"
+        assert get_routing_key(None) is None
+
+
+class TestReplicaRouting:
+    """Test cases for repository reads against two SQLite files."""
+
+    @pytest.fixture
+    async def databases(self, tmp_path):
+        config = DatabaseConfig(
+            database_url=f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}",
+            replica_url=f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}",
+        )
+        await config.create_tables()
+        from app.infrastructure.models import Base
+        async with config.replica_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        yield config
+        await config.close()
+
+    @pytest.mark.asyncio
+    async def test_reads_use_replica_until_request_writes(self, databases, make_user):
+        replica_only = make_user(email="replica@example.com", document_number="11111111")
+        async with databases.replica_session_maker() as replica_session:
+            await SQLAlchemyUserRepository(replica_session).create(replica_only)
+            await replica_session.commit()
+
+        async with databases.async_session_maker() as session, databases.replica_session_maker() as read_session:
+            repository = SQLAlchemyUserRepository(session, read_session)
+
+            assert await repository.get_by_id(replica_only.id) is not None
+
+            primary_user = await repository.create(make_user(email="primary@example.com", document_number="22222222"))
+
+            # After writing, reads must see the primary (read-your-writes)
+            assert await repository.get_by_id(primary_user.id) is not None
+            assert await repository.get_by_id(replica_only.id) is None
+
+    @pytest.mark.asyncio
+    async def test_unit_of_work_pins_reads_to_primary(self, databases, make_user):
+        replica_only = make_user(email="replica@example.com", document_number="11111111")
+        async with databases.replica_session_maker() as replica_session:
+            await SQLAlchemyUserRepository(replica_session).create(replica_only)
+            await replica_session.commit()
+
+        async with databases.async_session_maker() as session, databases.replica_session_maker() as read_session:
+            repository = SQLAlchemyUserRepository(session, read_session)
+            SQLAlchemyUnitOfWork(session)
+
+            # Loaded before any write, yet from the primary the use case will write to
+            assert await repository.get_by_id(replica_only.id) is None
+
+    def test_has_replica_is_false_without_replica_url(self, tmp_path):
+        config = DatabaseConfig(database_url=f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+
+        assert config.has_replica is False
+        assert "replica" not in config.get_pool_stats()
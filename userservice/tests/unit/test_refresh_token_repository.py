@@ -63,8 +63,9 @@ class TestSQLAlchemyRefreshTokenRepository:
         assert result.user_id == sample_refresh_token.user_id
         
         mock_session.add.assert_called_once()
-        mock_session.commit.assert_called_once()
-        mock_session.refresh.assert_called_once()
+        mock_session.flush.assert_called_once()
+        mock_session.commit.assert_not_called()
+        mock_session.refresh.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_get_by_token_found(self, repository, mock_session, sample_refresh_token_model):
@@ -165,7 +166,7 @@ class TestSQLAlchemyRefreshTokenRepository:
         # Assert
         assert result is True
         mock_session.execute.assert_called_once()
-        mock_session.commit.assert_called_once()
+        mock_session.commit.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_revoke_token_not_found(self, repository, mock_session):
@@ -183,7 +184,7 @@ class TestSQLAlchemyRefreshTokenRepository:
         # Assert
         assert result is False
         mock_session.execute.assert_called_once()
-        mock_session.commit.assert_called_once()
+        mock_session.commit.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_revoke_all_user_tokens(self, repository, mock_session):
@@ -201,7 +202,7 @@ class TestSQLAlchemyRefreshTokenRepository:
         # Assert
         assert result == 3
         mock_session.execute.assert_called_once()
-        mock_session.commit.assert_called_once()
+        mock_session.commit.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_delete_expired_tokens(self, repository, mock_session):
@@ -218,7 +219,7 @@ class TestSQLAlchemyRefreshTokenRepository:
         # Assert
         assert result == 5
         mock_session.execute.assert_called_once()
-        mock_session.commit.assert_called_once()
+        mock_session.commit.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_update_refresh_token(self, repository, mock_session, sample_refresh_token, sample_refresh_token_model):
@@ -236,9 +237,10 @@ class TestSQLAlchemyRefreshTokenRepository:
         
         # Assert
         assert isinstance(result, RefreshToken)
+        assert result.last_used_at == sample_refresh_token.last_used_at
         mock_session.execute.assert_called_once()
-        mock_session.commit.assert_called_once()
-        mock_session.get.assert_called_once_with(RefreshTokenModel, sample_refresh_token.id)
+        mock_session.commit.assert_not_called()
+        mock_session.get.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_delete_refresh_token_success(self, repository, mock_session):
@@ -256,7 +258,7 @@ class TestSQLAlchemyRefreshTokenRepository:
         # Assert
         assert result is True
         mock_session.execute.assert_called_once()
-        mock_session.commit.assert_called_once()
+        mock_session.commit.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_delete_refresh_token_not_found(self, repository, mock_session):
@@ -274,7 +276,7 @@ class TestSQLAlchemyRefreshTokenRepository:
         # Assert
         assert result is False
         mock_session.execute.assert_called_once()
-        mock_session.commit.assert_called_once()
+        mock_session.commit.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_count_active_tokens_for_user(self, repository, mock_session):
@@ -0,0 +1,134 @@
+"""Unit tests for atomic refresh token rotation and reuse detection."""
+
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+from sqlalchemy.dialects import postgresql
+
+from app.application.dtos.user_dtos import RefreshTokenDTO
+from app.application.use_cases.auth_use_cases import RefreshTokenUseCase
+from app.domain.entities.refresh_token_entity import RefreshToken
+from app.domain.exceptions.user_exceptions import InvalidTokenError
+from app.infrastructure.repositories.sqlalchemy_refresh_token_repository import SQLAlchemyRefreshTokenRepository
+from app.infrastructure.repositories.sqlalchemy_unit_of_work import SQLAlchemyUnitOfWork
+from app.infrastructure.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+
+
+@pytest.fixture
+async def login_token(isolated_db_config, make_user):
+    """Refresh token issued at login for a stored user."""
+    async with isolated_db_config.async_session_maker() as session:
+        user = await SQLAlchemyUserRepository(session).create(make_user())
+        token = await SQLAlchemyRefreshTokenRepository(session).save(RefreshToken.create_for_user(user.id))
+        await session.commit()
+    return token
+
+
+async def _rotate(config, token: str):
+    async with config.async_session_maker() as session:
+        rotated = await SQLAlchemyRefreshTokenRepository(session).rotate(
+            token, RefreshToken.generate_token(), RefreshToken.default_expires_at()
+        )
+        await session.commit()
+        return rotated
+
+
+async def _get(config, token: str):
+    async with config.async_session_maker() as session:
+        return await SQLAlchemyRefreshTokenRepository(session).get_by_token(token)
+
+
+async def _refresh(config, token: str):
+    """Run RefreshTokenUseCase in its own session, as a separate request would."""
+    async with config.async_session_maker() as session:
+        token_service = Mock()
+        token_service.create_access_token.return_value = "access-token"
+        use_case = RefreshTokenUseCase(
+            SQLAlchemyUserRepository(session),
+            SQLAlchemyRefreshTokenRepository(session),
+            token_service,
+            SQLAlchemyUnitOfWork(session),
+        )
+        return await use_case.execute(RefreshTokenDTO(refresh_token=token))
+
+
+class TestRefreshTokenRotation:
+    """Test cases for SQLAlchemyRefreshTokenRepository.rotate."""
+
+    @pytest.mark.asyncio
+    async def test_rotation_revokes_old_token_and_keeps_family(self, isolated_db_config, login_token):
+        rotated = await _rotate(isolated_db_config, login_token.token)
+
+        old = await _get(isolated_db_config, login_token.token)
+        new = await _get(isolated_db_config, rotated.token)
+        assert old.is_active is False
+        assert old.last_used_at is not None
+        assert new.is_active is True
+        assert new.family_id == login_token.family_id == login_token.id
+        assert new.user_id == login_token.user_id
+
+    @pytest.mark.asyncio
+    async def test_rotated_token_cannot_rotate_again(self, isolated_db_config, login_token):
+        assert await _rotate(isolated_db_config, login_token.token) is not None
+        assert await _rotate(isolated_db_config, login_token.token) is None
+
+    @pytest.mark.asyncio
+    async def test_expired_token_does_not_rotate(self, isolated_db_config, make_user):
+        async with isolated_db_config.async_session_maker() as session:
+            user = await SQLAlchemyUserRepository(session).create(
+                make_user(first_name="Luis", last_name="Mora", email="luis@example.com", document_number="50607080")
+            )
+            expired = await SQLAlchemyRefreshTokenRepository(session).save(RefreshToken(
+                token="expired-token",
+                user_id=user.id,
+                expires_at=datetime.now(timezone.utc) - timedelta(minutes=1),
+            ))
+            await session.commit()
+
+        assert await _rotate(isolated_db_config, expired.token) is None
+
+    def test_postgres_rotation_is_one_statement(self):
+        repository = SQLAlchemyRefreshTokenRepository(Mock())
+        replacement = {
+            "id": RefreshToken.create_for_user(Mock()).id,
+            "token": "new-token",
+            "expires_at": RefreshToken.default_expires_at(),
+            "created_at": datetime.now(timezone.utc),
+        }
+
+        sql = str(repository._rotation_statement("old-token", replacement, datetime.now(timezone.utc))
+                  .compile(dialect=postgresql.dialect()))
+
+        assert sql.startswith("WITH revoked AS \n(UPDATE refresh_tokens SET is_active=")
+        assert "refresh_tokens.is_active = true" in sql
+        assert "INSERT INTO refresh_tokens" in sql
+        assert "FROM revoked" in sql
+
+
+class TestRefreshTokenReuse:
+    """Test cases for reuse detection and concurrent refreshes."""
+
+    @pytest.mark.asyncio
+    async def test_reusing_rotated_token_revokes_family(self, isolated_db_config, login_token):
+        refreshed = await _refresh(isolated_db_config, login_token.token)
+
+        with pytest.raises(InvalidTokenError, match="revoked"):
+            await _refresh(isolated_db_config, login_token.token)
+
+        assert (await _get(isolated_db_config, refreshed.refresh_token)).is_active is False
+
+    @pytest.mark.asyncio
+    async def test_parallel_refreshes_of_one_token_succeed_once(self, isolated_db_config, login_token):
+        results = await asyncio.gather(
+            *(_refresh(isolated_db_config, login_token.token) for _ in range(5)),
+            return_exceptions=True,
+        )
+
+        successes = [result for result in results if not isinstance(result, Exception)]
+        failures = [result for result in results if isinstance(result, Exception)]
+        assert len(successes) == 1
+        assert all(isinstance(failure, InvalidTokenError) for failure in failures)
+
+        # The losers replayed a rotated token, so the winner's token is revoked too
+        assert (await _get(isolated_db_config, successes[0].refresh_token)).is_active is False
@@ -67,6 +67,11 @@ class TestRefreshTokenUseCase:
             device_info="Test Device"
         )
     
+    @pytest.fixture
+    def rotated_refresh_token(self, sample_refresh_token):
+        """Replacement token returned by an atomic rotation."""
+        return sample_refresh_token.rotate()
+    
     @pytest.mark.asyncio
     async def test_execute_with_valid_token_success(
         self,
@@ -75,19 +80,17 @@ class TestRefreshTokenUseCase:
         mock_refresh_token_repository,
         mock_token_service,
         sample_user,
-        sample_refresh_token
+        sample_refresh_token,
+        rotated_refresh_token
     ):
         """Test successful token refresh with valid token."""
         # Arrange
         refresh_dto = RefreshTokenDTO(refresh_token=sample_refresh_token.token)
         new_access_token = "new_access_token_123"
-        new_refresh_token = sample_refresh_token.rotate()
         
-        mock_refresh_token_repository.get_by_token.return_value = sample_refresh_token
+        mock_refresh_token_repository.rotate.return_value = rotated_refresh_token
         mock_user_repository.get_by_id.return_value = sample_user
         mock_token_service.create_access_token.return_value = new_access_token
-        mock_refresh_token_repository.save.return_value = new_refresh_token
-        mock_refresh_token_repository.update.return_value = sample_refresh_token
         
         # Act
         result = await use_case.execute(refresh_dto)
@@ -95,20 +98,19 @@ class TestRefreshTokenUseCase:
         # Assert
         assert isinstance(result, RefreshTokenResponseDTO)
         assert result.access_token == new_access_token
-        assert result.refresh_token == new_refresh_token.token
+        assert result.refresh_token == rotated_refresh_token.token
         assert result.token_type == "bearer"
         assert result.expires_in == 3600
         
-        # Verify repository calls
-        mock_refresh_token_repository.get_by_token.assert_called_once_with(sample_refresh_token.token)
-        mock_user_repository.get_by_id.assert_called_once_with(sample_refresh_token.user_id)
-        mock_token_service.create_access_token.assert_called_once_with(
-            user_id=sample_user.id,
-            role=sample_user.role.value,
-            expires_delta=3600
-        )
-        mock_refresh_token_repository.save.assert_called_once()
-        mock_refresh_token_repository.update.assert_called_once()
+        # Verify repository calls: one rotation, no separate read/save/update
+        token, new_token, new_expires_at = mock_refresh_token_repository.rotate.call_args.args
+        assert token == sample_refresh_token.token
+        assert new_token != sample_refresh_token.token
+        assert new_expires_at > datetime.now(timezone.utc)
+        mock_user_repository.get_by_id.assert_called_once_with(rotated_refresh_token.user_id)
+        mock_refresh_token_repository.get_by_token.assert_not_called()
+        mock_refresh_token_repository.save.assert_not_called()
+        mock_refresh_token_repository.update.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_execute_with_nonexistent_token(
@@ -119,6 +121,7 @@ class TestRefreshTokenUseCase:
         """Test refresh with non-existent token raises InvalidTokenError."""
         # Arrange
         refresh_dto = RefreshTokenDTO(refresh_token="nonexistent_token")
+        mock_refresh_token_repository.rotate.return_value = None
         mock_refresh_token_repository.get_by_token.return_value = None
         
         # Act & Assert
@@ -134,19 +137,21 @@ class TestRefreshTokenUseCase:
         mock_refresh_token_repository,
         sample_refresh_token
     ):
-        """Test refresh with revoked token raises InvalidTokenError and cleans up."""
+        """Test reusing a revoked (rotated) token revokes its whole family."""
         # Arrange
         sample_refresh_token.revoke()  # Revoke the token
         refresh_dto = RefreshTokenDTO(refresh_token=sample_refresh_token.token)
         
+        mock_refresh_token_repository.rotate.return_value = None
         mock_refresh_token_repository.get_by_token.return_value = sample_refresh_token
         
         # Act & Assert
-        with pytest.raises(InvalidTokenError):
+        with pytest.raises(InvalidTokenError, match="revoked"):
             await use_case.execute(refresh_dto)
         
-        # Verify cleanup was called
-        mock_refresh_token_repository.delete.assert_called_once_with(sample_refresh_token.id)
+        # Verify the family was revoked
+        mock_refresh_token_repository.revoke_family.assert_called_once_with(sample_refresh_token.family_id)
+        mock_refresh_token_repository.delete.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_execute_with_expired_token(
@@ -164,14 +169,16 @@ class TestRefreshTokenUseCase:
         )
         refresh_dto = RefreshTokenDTO(refresh_token=expired_token.token)
         
+        mock_refresh_token_repository.rotate.return_value = None
         mock_refresh_token_repository.get_by_token.return_value = expired_token
         
         # Act & Assert
-        with pytest.raises(InvalidTokenError):
+        with pytest.raises(InvalidTokenError, match="expired"):
             await use_case.execute(refresh_dto)
         
         # Verify cleanup was called
         mock_refresh_token_repository.delete.assert_called_once_with(expired_token.id)
+        mock_refresh_token_repository.revoke_family.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_execute_with_nonexistent_user(
@@ -179,17 +186,17 @@ class TestRefreshTokenUseCase:
         use_case,
         mock_user_repository,
         mock_refresh_token_repository,
-        sample_refresh_token
+        rotated_refresh_token
     ):
         """Test refresh with token for non-existent user raises UserNotFoundError."""
         # Arrange
-        refresh_dto = RefreshTokenDTO(refresh_token=sample_refresh_token.token)
+        refresh_dto = RefreshTokenDTO(refresh_token="some_token")
         
-        mock_refresh_token_repository.get_by_token.return_value = sample_refresh_token
+        mock_refresh_token_repository.rotate.return_value = rotated_refresh_token
         mock_user_repository.get_by_id.return_value = None
         
         # Act & Assert
-        with pytest.raises(UserNotFoundError, match=f"User not found: {sample_refresh_token.user_id}"):
+        with pytest.raises(UserNotFoundError, match=f"User not found: {rotated_refresh_token.user_id}"):
             await use_case.execute(refresh_dto)
     
     @pytest.mark.asyncio
@@ -200,14 +207,15 @@ class TestRefreshTokenUseCase:
         mock_refresh_token_repository,
         mock_token_service,
         sample_user,
-        sample_refresh_token
+        sample_refresh_token,
+        rotated_refresh_token
     ):
         """Test refresh with token for inactive user raises UserInactiveError and revokes tokens."""
         # Arrange
         sample_user.deactivate()  # Deactivate the user
         refresh_dto = RefreshTokenDTO(refresh_token=sample_refresh_token.token)
         
-        mock_refresh_token_repository.get_by_token.return_value = sample_refresh_token
+        mock_refresh_token_repository.rotate.return_value = rotated_refresh_token
         mock_user_repository.get_by_id.return_value = sample_user
         
         # Act & Assert
@@ -216,32 +224,33 @@ class TestRefreshTokenUseCase:
         
         # Verify all user tokens were revoked
         mock_refresh_token_repository.revoke_all_user_tokens.assert_called_once_with(sample_user.id)
+        mock_token_service.create_access_token.assert_not_called()
     
     @pytest.mark.asyncio
-    async def test_execute_marks_token_as_used(
+    async def test_execute_keeps_rotated_token_in_family(
         self,
         use_case,
         mock_user_repository,
         mock_refresh_token_repository,
         mock_token_service,
         sample_user,
-        sample_refresh_token
+        sample_refresh_token,
+        rotated_refresh_token
     ):
-        """Test that token is marked as used during refresh process."""
+        """Test that the rotated token stays in the family of the original login."""
         # Arrange
         refresh_dto = RefreshTokenDTO(refresh_token=sample_refresh_token.token)
-        original_last_used = sample_refresh_token.last_used_at
         
-        mock_refresh_token_repository.get_by_token.return_value = sample_refresh_token
+        mock_refresh_token_repository.rotate.return_value = rotated_refresh_token
         mock_user_repository.get_by_id.return_value = sample_user
         mock_token_service.create_access_token.return_value = "new_token"
         
         # Act
-        await use_case.execute(refresh_dto)
+        result = await use_case.execute(refresh_dto)
         
         # Assert
-        assert sample_refresh_token.last_used_at != original_last_used
-        assert sample_refresh_token.last_used_at is not None
+        assert rotated_refresh_token.family_id == sample_refresh_token.family_id
+        assert result.refresh_token == rotated_refresh_token.token
     
     @pytest.mark.asyncio
     async def test_execute_creates_rotated_token(
@@ -251,33 +260,25 @@ class TestRefreshTokenUseCase:
         mock_refresh_token_repository,
         mock_token_service,
         sample_user,
-        sample_refresh_token
+        sample_refresh_token,
+        rotated_refresh_token
     ):
-        """Test that a new rotated token is created and saved."""
+        """Test that a new rotated token is returned."""
         # Arrange
         refresh_dto = RefreshTokenDTO(refresh_token=sample_refresh_token.token)
         original_token_value = sample_refresh_token.token
         
-        mock_refresh_token_repository.get_by_token.return_value = sample_refresh_token
+        mock_refresh_token_repository.rotate.return_value = rotated_refresh_token
         mock_user_repository.get_by_id.return_value = sample_user
         mock_token_service.create_access_token.return_value = "new_access_token"
         
-        # Mock the rotate method to return a new token
-        new_refresh_token = RefreshToken.create_for_user(sample_user.id)
-        sample_refresh_token.rotate = Mock(return_value=new_refresh_token)
-        
         # Act
         result = await use_case.execute(refresh_dto)
         
         # Assert
-        assert result.refresh_token == new_refresh_token.token
+        assert result.refresh_token == rotated_refresh_token.token
         assert result.refresh_token != original_token_value
-        
-        # Verify new token was saved
-        mock_refresh_token_repository.save.assert_called_once()
-        
-        # Verify old token was updated (marked as used)
-        mock_refresh_token_repository.update.assert_called_once_with(sample_refresh_token)
+        mock_refresh_token_repository.rotate.assert_called_once()
     
     @pytest.mark.asyncio
     async def test_execute_with_correct_token_service_parameters(
@@ -287,13 +288,14 @@ class TestRefreshTokenUseCase:
         mock_refresh_token_repository,
         mock_token_service,
         sample_user,
-        sample_refresh_token
+        sample_refresh_token,
+        rotated_refresh_token
     ):
         """Test that token service is called with correct parameters."""
         # Arrange
         refresh_dto = RefreshTokenDTO(refresh_token=sample_refresh_token.token)
         
-        mock_refresh_token_repository.get_by_token.return_value = sample_refresh_token
+        mock_refresh_token_repository.rotate.return_value = rotated_refresh_token
         mock_user_repository.get_by_id.return_value = sample_user
         mock_token_service.create_access_token.return_value = "new_access_token"
         
@@ -304,5 +306,8 @@ class TestRefreshTokenUseCase:
         mock_token_service.create_access_token.assert_called_once_with(
             user_id=sample_user.id,
             role=sample_user.role.value,
-            expires_delta=3600
+            expires_delta=3600,
+            is_active=sample_user.is_active,
+            must_change_password=sample_user.must_change_password,
+            token_version=sample_user.token_version,
         )
@@ -0,0 +1,92 @@
+"""Unit tests for the lazy, read-only-aware request session dependency."""
+
+import time
+import pytest
+from sqlalchemy import event, select
+from starlette.requests import Request
+
+from app.domain.value_objects.user_role import UserRole
+from app.infrastructure.config import database
+from app.infrastructure.config.database import DatabaseConfig, get_db_session
+from app.infrastructure.models import UserModel
+from app.infrastructure.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+
+
+@pytest.fixture
+async def isolated_database(tmp_path, monkeypatch):
+    """Point the session dependency at a throwaway SQLite database."""
+    config = DatabaseConfig(database_url=f"sqlite+aiosqlite:///{tmp_path / 'session.db'}")
+    await config.create_tables()
+    monkeypatch.setattr(database, "database_config", config)
+
+    commits = []
+    event.listen(config.engine.sync_engine, "commit", lambda conn: commits.append(conn))
+    yield config, commits
+    await config.close()
+
+
+def _make_request() -> Request:
+    return Request({"type": "http", "headers": [], "client": ("127.0.0.1", 5000)})
+
+
+async def _run_request(request, body):
+    """Drive the dependency generator the way FastAPI does."""
+    dependency = get_db_session(request)
+    session = await dependency.__anext__()
+    await body(session)
+    with pytest.raises(StopAsyncIteration):
+        await dependency.__anext__()
+
+
+class TestRequestSession:
+    """Test cases for get_db_session."""
+
+    @pytest.mark.asyncio
+    async def test_unused_session_never_touches_the_database(self, isolated_database):
+        config, commits = isolated_database
+        request = _make_request()
+
+        async def body(session):
+            pass
+
+        await _run_request(request, body)
+
+        assert request.state.db_transaction == "none"
+        assert commits == []
+        assert config.session_usage.as_dict()["none"] == 1
+
+    @pytest.mark.asyncio
+    async def test_read_only_session_skips_commit(self, isolated_database):
+        config, commits = isolated_database
+        request = _make_request()
+
+        async def body(session):
+            await session.execute(select(UserModel))
+
+        await _run_request(request, body)
+
+        assert request.state.db_transaction == "read"
+        assert commits == []
+
+    @pytest.mark.asyncio
+    async def test_writing_session_commits_once(self, isolated_database, make_user):
+        config, commits = isolated_database
+        request = _make_request()
+        user = make_user(
+            first_name="Luis",
+            last_name="Mora",
+            email="luis.mora@example.com",
+            document_number="33333333",
+            role=UserRole.INSTRUCTOR,
+        )
+
+        async def body(session):
+            await SQLAlchemyUserRepository(session).create(user)
+
+        await _run_request(request, body)
+
+        assert request.state.db_transaction == "write"
+        assert request.state.db_primary_until > time.time()
+        assert len(commits) == 1
+        async with config.async_session_maker() as session:
+            assert await SQLAlchemyUserRepository(session).get_by_id(user.id) is not None
@@ -0,0 +1,201 @@
+"""Unit tests for the token revocation stores."""
+
+import asyncio
+import time
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+from uuid import uuid4
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.infrastructure.adapters.jwt_token_service import JWTTokenService
+from app.infrastructure.adapters.revocation_store import (
+    BloomFilter,
+    InMemoryRevocationStore,
+    RedisRevocationStore,
+)
+from app.presentation.dependencies.auth import get_current_user
+
+
+class FakePubSub:
+    """Subscription side of FakeRedis."""
+
+    def __init__(self, redis):
+        self._redis = redis
+        self._queue = asyncio.Queue()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        for subscribers in self._redis.subscribers.values():
+            subscribers.discard(self._queue)
+
+    async def subscribe(self, channel):
+        self._redis.subscribers.setdefault(channel, set()).add(self._queue)
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=1.0):
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout=min(timeout, 0.01))
+        except asyncio.TimeoutError:
+            return None
+
+
+class FakeRedis:
+    """The subset of redis.asyncio.Redis the revocation store uses."""
+
+    def __init__(self):
+        self.data = {}
+        self.subscribers = {}
+        self.gets = 0
+
+    async def set(self, key, value, px=None):
+        self.data[key] = (str(value).encode(), time.time() + px / 1000)
+
+    async def get(self, key):
+        self.gets += 1
+        entry = self.data.get(key)
+        if entry is None or entry[1] <= time.time():
+            return None
+        return entry[0]
+
+    async def publish(self, channel, message):
+        for queue in self.subscribers.get(channel, ()):
+            queue.put_nowait({"type": "message", "data": message.encode()})
+
+    async def scan_iter(self, match=None, count=None):
+        prefix = match.rstrip("*")
+        for key in list(self.data):
+            if key.startswith(prefix):
+                yield key.encode()
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+
+async def _wait_until(condition, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.005)
+
+
+class TestInMemoryRevocationStore:
+    """Test cases for the per-process backend."""
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_and_are_swept(self):
+        store = InMemoryRevocationStore()
+        await store.revoke("token:a", 1.0, ttl_seconds=0.02)
+        await store.revoke("token:b", 2.0, ttl_seconds=60)
+
+        assert await store.get("token:a") == 1.0
+        await asyncio.sleep(0.03)
+
+        assert await store.get("token:a") is None
+        assert store.sweep() == 0
+        assert len(store) == 1
+
+
+class TestRedisRevocationStore:
+    """Test cases for the Redis backend and its Bloom filter."""
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        bloom = BloomFilter(capacity=1000)
+        keys = [f"token:{i}" for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+
+        assert all(key in bloom for key in keys)
+        false_positives = sum(f"other:{i}" in bloom for i in range(10000))
+        assert false_positives < 300
+
+    @pytest.mark.asyncio
+    async def test_revocations_reach_other_workers_and_misses_skip_redis(self):
+        redis = FakeRedis()
+        await redis.set("userservice:revoked:user:old", 5.0, px=60000)
+        worker_a, worker_b = RedisRevocationStore(redis), RedisRevocationStore(redis)
+        await worker_a.start()
+        await worker_b.start()
+        try:
+            await _wait_until(lambda: worker_a.stats()["ready"] and worker_b.stats()["ready"])
+            assert await worker_b.get("user:old") == 5.0
+
+            await worker_a.revoke("token:abc", 1.0, ttl_seconds=60)
+            await _wait_until(lambda: worker_b.stats()["bloom_keys"] == 2)
+            assert await worker_b.get("token:abc") == 1.0
+
+            redis.gets = 0
+            for i in range(100):
+                assert await worker_b.get(f"token:never-revoked-{i}") is None
+            assert redis.gets < 10
+        finally:
+            await worker_a.stop()
+            await worker_b.stop()
+
+    @pytest.mark.asyncio
+    async def test_lookups_go_to_redis_until_seeded(self):
+        redis = FakeRedis()
+        await redis.set("userservice:revoked:token:abc", 1.0, px=60000)
+        store = RedisRevocationStore(redis)
+
+        assert await store.get("token:abc") == 1.0
+        assert redis.gets == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("fail_open", [True, False])
+    async def test_unreachable_redis_fails_open_or_closed(self, fail_open):
+        redis = FakeRedis()
+        redis.get = AsyncMock(side_effect=ConnectionError("redis down"))
+        store = RedisRevocationStore(redis, fail_open=fail_open)
+
+        if fail_open:
+            assert await store.get("token:abc") is None
+        else:
+            with pytest.raises(ConnectionError):
+                await store.get("token:abc")
+        assert store.stats()["errors"] == 1
+
+
+class TestJWTRevocation:
+    """Test cases for JWTTokenService revocation on top of the store."""
+
+    @pytest.mark.asyncio
+    async def test_logout_revokes_only_that_token(self):
+        service = JWTTokenService(revocation_store=InMemoryRevocationStore())
+        token = service.create_access_token(uuid4(), "ADMIN")
+        other = service.create_access_token(uuid4(), "ADMIN")
+
+        await service.revoke_token(token)
+
+        assert await service.is_token_revoked(token)
+        assert not await service.is_token_revoked(other)
+
+    @pytest.mark.asyncio
+    async def test_user_revocation_covers_tokens_issued_before(self):
+        service = JWTTokenService(revocation_store=InMemoryRevocationStore())
+        user_id = uuid4()
+        now = datetime.now(timezone.utc)
+
+        await service.revoke_all_user_tokens(user_id)
+
+        assert await service.is_user_token_revoked(user_id, now - timedelta(seconds=5))
+        assert not await service.is_user_token_revoked(user_id, now + timedelta(seconds=1))
+        assert not await service.is_user_token_revoked(uuid4(), now - timedelta(seconds=5))
+
+    @pytest.mark.asyncio
+    async def test_get_current_user_rejects_logged_out_token(self):
+        service = JWTTokenService(revocation_store=InMemoryRevocationStore())
+        user_id = uuid4()
+        token = service.create_access_token(user_id, "ADMIN")
+        user_repository = AsyncMock()
+        await service.revoke_token(token)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_user(
+                HTTPAuthorizationCredentials(scheme="Bearer", credentials=token), service, user_repository, None
+            )
+
+        assert exc_info.value.status_code == 401
+        user_repository.get_by_id.assert_not_awaited()
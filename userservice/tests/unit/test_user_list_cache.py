@@ -0,0 +1,147 @@
+"""Unit tests for the generation-versioned user list cache."""
+
+import asyncio
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+from app.application.dtos.user_dtos import UserFilterDTO, UserListDTO, UserResponseDTO
+from app.application.use_cases.user_use_cases import ActivateUserUseCase, ListUsersUseCase
+from app.domain.entities.user_entity import User
+from app.domain.value_objects.user_role import UserRole
+from app.infrastructure.adapters.user_list_cache import InMemoryUserListCache, RedisUserListCache
+
+
+class FakeRedis:
+    """The subset of redis.asyncio.Redis the cache uses, kept in a dict."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    async def set(self, key, value, px=None):
+        self.data[key] = value.encode()
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, b"0")) + 1).encode()
+
+
+def _page(user: User) -> UserListDTO:
+    return UserListDTO(
+        users=[UserResponseDTO(
+            id=user.id,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            email=user.email.value,
+            document_number=user.document_number.value,
+            document_type=user.document_number.document_type.value,
+            role=user.role.value,
+            is_active=user.is_active,
+            must_change_password=user.must_change_password,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+            last_login_at=datetime(2025, 1, 1, 8, 30),
+        )],
+        total=1,
+        page=1,
+        page_size=10,
+        total_pages=1,
+    )
+
+
+class TestInMemoryUserListCache:
+    """Test cases for the per-process backend."""
+
+    @pytest.mark.asyncio
+    async def test_bump_invalidates_only_its_scope(self, make_user):
+        cache = InMemoryUserListCache()
+        loader = AsyncMock(return_value=_page(make_user()))
+
+        await cache.get_or_load(("role:apprentice",), "page-1", loader)
+        await cache.get_or_load(("role:apprentice",), "page-1", loader)
+        await cache.bump("all", "role:instructor")
+        await cache.get_or_load(("role:apprentice",), "page-1", loader)
+        assert loader.await_count == 1
+
+        await cache.bump("all", "role:apprentice")
+        await cache.get_or_load(("role:apprentice",), "page-1", loader)
+        assert loader.await_count == 2
+        assert cache.stats()["hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_size_is_bounded(self, make_user):
+        cache = InMemoryUserListCache(max_entries=2)
+        loader = AsyncMock(return_value=_page(make_user()))
+
+        for page in range(3):
+            await cache.get_or_load(("all",), f"page-{page}", loader)
+        await cache.get_or_load(("all",), "page-0", loader)
+
+        assert cache.stats()["size"] == 2
+        assert loader.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_bump_repeats_after_the_replica_lag(self, make_user):
+        cache = InMemoryUserListCache(rebump_after_seconds=0.05)
+        stale, fresh = _page(make_user()), _page(make_user())
+        loader = AsyncMock(side_effect=[stale, fresh])
+
+        await cache.bump("all")
+        await asyncio.sleep(0.03)
+        await cache.bump("all")  # Pushes the repeat back
+        # Loaded right after the bump, from a replica that may still lag
+        assert await cache.get_or_load(("all",), "page-1", loader) is stale
+        await asyncio.sleep(0.03)
+        assert await cache.get_or_load(("all",), "page-1", loader) is stale
+
+        await asyncio.sleep(0.05)
+        assert await cache.get_or_load(("all",), "page-1", loader) is fresh
+        assert cache.stats()["bumps"] == 2
+
+
+class TestRedisUserListCache:
+    """Test cases for the Redis backend."""
+
+    @pytest.mark.asyncio
+    async def test_workers_share_pages_and_generations(self, make_user):
+        redis = FakeRedis()
+        page = _page(make_user())
+        loader = AsyncMock(return_value=page)
+        worker_a, worker_b = RedisUserListCache(redis), RedisUserListCache(redis)
+
+        await worker_a.get_or_load(("all",), "page-1", loader)
+        cached = await worker_b.get_or_load(("all",), "page-1", loader)
+        assert loader.await_count == 1
+        assert cached == page
+
+        await worker_a.bump("all")
+        await worker_b.get_or_load(("all",), "page-1", loader)
+        assert loader.await_count == 2
+
+
+class TestListUsersCaching:
+    """Test cases for ListUsersUseCase with a list cache."""
+
+    @pytest.mark.asyncio
+    async def test_activation_bumps_the_role_generation(self, make_user):
+        user = make_user()
+        user_repository = AsyncMock()
+        user_repository.list_users_with_total.return_value = ([user], 1)
+        user_repository.get_by_id.return_value = user
+        user_repository.update.side_effect = lambda updated: updated
+        cache = InMemoryUserListCache()
+        list_users = ListUsersUseCase(user_repository, cache)
+        filters = UserFilterDTO(role=UserRole.APPRENTICE, search_term="ANA")
+
+        await list_users.execute(1, 10, filters)
+        await list_users.execute(1, 10, UserFilterDTO(role="apprentice", search_term="ana"))
+        assert user_repository.list_users_with_total.await_count == 1
+
+        await ActivateUserUseCase(user_repository, list_cache=cache).execute(user.id)
+        await list_users.execute(1, 10, filters)
+        assert user_repository.list_users_with_total.await_count == 2
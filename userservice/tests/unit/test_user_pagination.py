@@ -0,0 +1,152 @@
+"""Unit tests for offset and keyset (cursor) pagination of user listings."""
+
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql
+
+from app.application.dtos.user_dtos import UserFilterDTO
+from app.application.use_cases.user_use_cases import ListUsersUseCase
+from app.domain.repositories.user_repository_interface import CountMode
+from app.domain.exceptions.user_exceptions import InvalidCursorError
+from app.domain.value_objects.user_role import UserRole
+from app.infrastructure.models import UserModel
+from app.infrastructure.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository, _ExplainJSON
+
+
+@pytest.fixture
+async def seeded_session(isolated_db_config, make_user):
+    """Session over a database with 23 users, several sharing created_at."""
+    base = datetime(2025, 1, 1, 8, 0, 0)
+    async with isolated_db_config.async_session_maker() as session:
+        repository = SQLAlchemyUserRepository(session)
+        for i in range(23):
+            await repository.create(make_user(
+                first_name=f"Aprendiz{i}",
+                last_name="Prueba",
+                email=f"aprendiz{i}@example.com",
+                document_number=f"{10000000 + i}",
+                role=UserRole.APPRENTICE if i % 2 else UserRole.INSTRUCTOR,
+                # Groups of three users share a timestamp to exercise the id tie-breaker
+                created_at=base + timedelta(minutes=i // 3),
+            ))
+        await session.commit()
+        yield session
+
+
+@pytest.fixture
+def statements(isolated_db_config):
+    """Record the SQL statements sent to the isolated database."""
+    executed = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(isolated_db_config.engine.sync_engine, "before_cursor_execute", _record)
+    yield executed
+    event.remove(isolated_db_config.engine.sync_engine, "before_cursor_execute", _record)
+
+
+class TestCursorPagination:
+    """Test cases for ListUsersUseCase pagination modes."""
+
+    @pytest.mark.asyncio
+    async def test_cursor_pages_cover_all_users_in_offset_order(self, seeded_session):
+        use_case = ListUsersUseCase(SQLAlchemyUserRepository(seeded_session))
+
+        offset_ids = []
+        for page in range(1, 4):
+            result = await use_case.execute(page=page, page_size=10)
+            offset_ids.extend(user.id for user in result.users)
+
+        cursor_ids = []
+        result = await use_case.execute(page_size=10)
+        cursor_ids.extend(user.id for user in result.users)
+        while result.next_cursor:
+            result = await use_case.execute(page_size=10, cursor=result.next_cursor)
+            cursor_ids.extend(user.id for user in result.users)
+
+        assert len(cursor_ids) == 23
+        assert len(set(cursor_ids)) == 23
+        assert cursor_ids == offset_ids
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_next_cursor(self, seeded_session):
+        use_case = ListUsersUseCase(SQLAlchemyUserRepository(seeded_session))
+
+        result = await use_case.execute(page=3, page_size=10)
+
+        assert len(result.users) == 3
+        assert result.next_cursor is None
+        assert result.total == 23
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_is_rejected(self, seeded_session):
+        use_case = ListUsersUseCase(SQLAlchemyUserRepository(seeded_session))
+
+        with pytest.raises(InvalidCursorError):
+            await use_case.execute(cursor="not-a-cursor")
+
+
+class TestListWithTotal:
+    """Test cases for the single-round-trip list + count path."""
+
+    @pytest.mark.asyncio
+    async def test_page_and_exact_total_use_one_statement(self, seeded_session, statements):
+        use_case = ListUsersUseCase(SQLAlchemyUserRepository(seeded_session))
+
+        result = await use_case.execute(page=2, page_size=5)
+
+        assert len(statements) == 1
+        assert result.total == 23
+        assert result.total_pages == 5
+        assert result.count_mode == "exact"
+
+    @pytest.mark.asyncio
+    async def test_exact_total_with_filters_and_cursor(self, seeded_session, statements):
+        use_case = ListUsersUseCase(SQLAlchemyUserRepository(seeded_session))
+        filters = UserFilterDTO(role=UserRole.APPRENTICE)
+
+        first = await use_case.execute(page_size=5, filters=filters)
+        second = await use_case.execute(page_size=5, filters=filters, cursor=first.next_cursor)
+
+        assert first.total == second.total == 11
+        assert len(statements) == 2
+
+    @pytest.mark.asyncio
+    async def test_count_none_skips_total(self, seeded_session, statements):
+        use_case = ListUsersUseCase(SQLAlchemyUserRepository(seeded_session))
+
+        result = await use_case.execute(page_size=5, count_mode=CountMode.NONE)
+
+        assert result.total is None
+        assert result.total_pages is None
+        assert result.next_cursor is not None
+        assert len(statements) == 1
+        assert "count" not in statements[0].lower()
+
+    @pytest.mark.asyncio
+    async def test_estimate_falls_back_to_exact_on_sqlite(self, seeded_session):
+        use_case = ListUsersUseCase(SQLAlchemyUserRepository(seeded_session))
+
+        result = await use_case.execute(page_size=5, count_mode=CountMode.ESTIMATE)
+
+        assert result.total == 23
+        assert result.count_mode == "estimate"
+
+    @pytest.mark.asyncio
+    async def test_page_past_the_end_still_reports_total(self, seeded_session):
+        use_case = ListUsersUseCase(SQLAlchemyUserRepository(seeded_session))
+
+        result = await use_case.execute(page=9, page_size=5)
+
+        assert result.users == []
+        assert result.total == 23
+
+    def test_explain_keeps_bind_parameters_on_postgres(self):
+        query = select(UserModel).where(UserModel.role == UserRole.APPRENTICE)
+
+        compiled = _ExplainJSON(query).compile(dialect=postgresql.asyncpg.dialect())
+
+        assert str(compiled).startswith("EXPLAIN (FORMAT JSON) SELECT")
+        assert list(compiled.params.values()) == [UserRole.APPRENTICE]
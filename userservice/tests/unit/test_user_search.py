@@ -0,0 +1,106 @@
+"""Unit tests for the indexed user search backends."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.config import settings
+from app.infrastructure.models.user_search import (
+    SEARCH_DOCUMENT_SQL,
+    build_search_condition,
+    install_search_index,
+    resolve_search_backend,
+)
+from app.infrastructure.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+
+
+@pytest.fixture
+async def search_session(isolated_db_config, make_user):
+    """Session over a database with a few users to search."""
+    async with isolated_db_config.async_session_maker() as session:
+        repository = SQLAlchemyUserRepository(session)
+        for user in (
+            make_user(email="ana.rojas@example.com"),
+            make_user(first_name="Carlos", last_name="Mendoza", email="cmendoza@example.com", document_number="55667788"),
+            make_user(first_name="Lucia", last_name="Rojas_Diaz", email="lucia@example.com", document_number="99887766"),
+        ):
+            await repository.create(user)
+        await session.commit()
+        yield session
+
+
+async def _search(session, term):
+    users = await SQLAlchemyUserRepository(session).list_users(limit=50, search_term=term)
+    return sorted(user.email.value for user in users)
+
+
+class TestSearchBackendSelection:
+    """Test cases for choosing the search backend by dialect."""
+
+    def test_auto_selects_by_dialect(self, monkeypatch):
+        monkeypatch.setattr(settings, "USER_SEARCH_BACKEND", "auto")
+
+        assert resolve_search_backend("postgresql") == "trigram"
+        assert resolve_search_backend("sqlite") == "fts5"
+        assert resolve_search_backend("mysql") == "like"
+
+    def test_setting_overrides_dialect(self, monkeypatch):
+        monkeypatch.setattr(settings, "USER_SEARCH_BACKEND", "like")
+
+        assert resolve_search_backend("postgresql") == "like"
+
+    def test_postgres_condition_uses_indexed_expression(self, monkeypatch):
+        monkeypatch.setattr(settings, "USER_SEARCH_BACKEND", "auto")
+
+        compiled = str(build_search_condition("Rojas", "postgresql").compile(dialect=postgresql.dialect()))
+
+        assert compiled.startswith(SEARCH_DOCUMENT_SQL + " LIKE ")
+
+
+class TestFTS5Search:
+    """Test cases for the SQLite FTS5 trigram search."""
+
+    @pytest.mark.asyncio
+    async def test_matches_any_field_case_insensitively(self, search_session):
+        assert await _search(search_session, "ROJAS") == ["ana.rojas@example.com", "lucia@example.com"]
+        assert await _search(search_session, "mendoza@") == ["cmendoza@example.com"]
+        assert await _search(search_session, "6677") == ["cmendoza@example.com"]
+
+    @pytest.mark.asyncio
+    async def test_short_terms_and_wildcards_are_literal(self, search_session):
+        assert await _search(search_session, "lu") == ["lucia@example.com"]
+        assert await _search(search_session, "s_d") == ["lucia@example.com"]
+        assert await _search(search_session, "%") == []
+
+    @pytest.mark.asyncio
+    async def test_index_follows_updates_and_deletes(self, search_session):
+        repository = SQLAlchemyUserRepository(search_session)
+        user = await repository.get_by_email("cmendoza@example.com")
+
+        user.first_name = "Camilo"
+        await repository.update(user)
+        assert await _search(search_session, "camilo") == ["cmendoza@example.com"]
+        assert await _search(search_session, "carlos") == []
+
+        await repository.delete(user.id)
+        assert await _search(search_session, "mendoza") == []
+
+    @pytest.mark.asyncio
+    async def test_matches_like_backend(self, search_session, monkeypatch):
+        fts5_results = [await _search(search_session, term) for term in ("ro", "example", "zzz")]
+
+        monkeypatch.setattr(settings, "USER_SEARCH_BACKEND", "like")
+        like_results = [await _search(search_session, term) for term in ("ro", "example", "zzz")]
+
+        assert fts5_results == like_results
+
+    @pytest.mark.asyncio
+    async def test_install_backfills_existing_users(self, search_session):
+        await search_session.execute(text("DELETE FROM users_search"))
+        await search_session.execute(text("DELETE FROM users_search_ids"))
+        assert await _search(search_session, "rojas") == []
+
+        connection = await search_session.connection()
+        await connection.run_sync(install_search_index)
+
+        assert await _search(search_session, "rojas") == ["ana.rojas@example.com", "lucia@example.com"]
@@ -0,0 +1,113 @@
+"""Unit tests for dirty-field tracking and the single-statement user update."""
+
+import pytest
+from sqlalchemy import event
+
+from app.domain.exceptions.user_exceptions import UserNotFoundError
+from app.infrastructure.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+
+
+@pytest.fixture
+async def session(isolated_db_config, make_user):
+    """Session over a database holding one user."""
+    async with isolated_db_config.async_session_maker() as session:
+        await SQLAlchemyUserRepository(session).create(make_user())
+        await session.commit()
+        yield session
+
+
+@pytest.fixture
+def statements(isolated_db_config):
+    """Record the SQL statements sent to the isolated database."""
+    executed = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(isolated_db_config.engine.sync_engine, "before_cursor_execute", _record)
+    yield executed
+    event.remove(isolated_db_config.engine.sync_engine, "before_cursor_execute", _record)
+
+
+def _set_clause(statement: str) -> str:
+    return statement.split(" SET ", 1)[1].split(" WHERE ", 1)[0]
+
+
+class TestUserChangeTracking:
+    """Test cases for User.changed_fields."""
+
+    def test_new_entity_has_unknown_changes(self, make_user):
+        assert make_user().changed_fields is None
+
+    def test_records_only_fields_that_change(self, make_user):
+        user = make_user()
+        user.mark_clean()
+
+        user.first_name = "Ana"
+        user.record_login()
+
+        assert user.changed_fields == {"last_login_at", "updated_at"}
+
+
+class TestUserUpdate:
+    """Test cases for SQLAlchemyUserRepository.update."""
+
+    @pytest.mark.asyncio
+    async def test_login_updates_only_login_columns_in_one_statement(self, session, statements):
+        repository = SQLAlchemyUserRepository(session)
+        user = await repository.get_by_email("ana@example.com")
+        statements.clear()
+
+        user.record_login()
+        updated = await repository.update(user)
+
+        assert len(statements) == 1
+        assert statements[0].startswith("UPDATE users SET")
+        assert "RETURNING" in statements[0]
+        assert _set_clause(statements[0]) == "updated_at=?, last_login_at=?"
+        assert updated.last_login_at == user.last_login_at
+        assert updated.changed_fields == frozenset()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_select_without_returning(self, session, statements, isolated_db_config, monkeypatch):
+        monkeypatch.setattr(isolated_db_config.engine.sync_engine.dialect, "update_returning", False)
+        repository = SQLAlchemyUserRepository(session)
+        user = await repository.get_by_email("ana@example.com")
+        statements.clear()
+
+        user.deactivate()
+        updated = await repository.update(user)
+
+        assert [statement.split(" ", 1)[0] for statement in statements] == ["UPDATE", "SELECT"]
+        assert "RETURNING" not in statements[0]
+        assert updated.is_active is False
+
+    @pytest.mark.asyncio
+    async def test_unchanged_entity_is_not_written(self, session, statements):
+        repository = SQLAlchemyUserRepository(session)
+        user = await repository.get_by_email("ana@example.com")
+        statements.clear()
+
+        await repository.update(user)
+
+        assert statements == []
+
+    @pytest.mark.asyncio
+    async def test_entity_not_loaded_by_repository_writes_every_column(self, session, statements, make_user):
+        repository = SQLAlchemyUserRepository(session)
+        loaded = await repository.get_by_email("ana@example.com")
+        user = make_user()
+        user.id = loaded.id
+        user.phone = "3001234567"
+        statements.clear()
+
+        updated = await repository.update(user)
+
+        assert "email=?" in _set_clause(statements[0])
+        assert "document_type=?" in _set_clause(statements[0])
+        assert updated.phone == "3001234567"
+
+    @pytest.mark.asyncio
+    async def test_missing_user_raises_not_found(self, session, make_user):
+        with pytest.raises(UserNotFoundError):
+            await SQLAlchemyUserRepository(session).update(make_user(email="ghost@example.com"))